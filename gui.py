@@ -0,0 +1,693 @@
+# -*- coding: utf-8 -*-
+"""
+رابط گرافیکی تحلیل استراتژی‌های معاملاتی
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, CancelledError
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from strategies.registry import STRATEGY_REGISTRY, create_strategies
+from strategies.engine import run_strategies_parallel
+from utils.data_loader import load_csv_data
+from utils.catalog import DatasetCatalog
+from utils.visualizer import plot_strategy_results
+from utils.risk_management import calculate_risk_reward
+from utils.indicators import indicator_cache
+from utils.signal_table import SignalTable
+from utils.shared_data import read_only_view
+
+class BackgroundJob:
+    """
+    یک کار پس‌زمینه رابط گرافیکی
+    
+    تابع کار در رشته پس‌زمینه اجرا می‌شود و نباید به ویجت‌های Tk دسترسی داشته باشد؛
+    پیشرفت را با report() اعلام می‌کند و cancel_event را بین مراحل بررسی می‌کند.
+    """
+    
+    def __init__(self, title):
+        self.title = title
+        self.cancel_event = threading.Event()
+        self.started = time.perf_counter()
+        self.stage = title
+        self.done = 0
+        self.total = 0
+        self.future = None
+    
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+    
+    def report(self, done, total, stage=None):
+        """اعلام پیشرفت (فراخوانی از رشته پس‌زمینه)"""
+        self.done = done
+        self.total = total
+        if stage is not None:
+            self.stage = stage
+    
+    def set_stage(self, stage):
+        """شروع مرحله جدید بدون پیشرفت قابل اندازه‌گیری"""
+        self.report(0, 0, stage)
+    
+    def check_cancelled(self):
+        """توقف کار در صورت درخواست لغو"""
+        if self.cancelled:
+            raise CancelledError()
+    
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+class TradingApp:
+    # فاصله به‌روزرسانی وضعیت کار پس‌زمینه (میلی‌ثانیه)
+    POLL_INTERVAL = 100
+    
+    # ستون‌های جدول نتایج: (عنوان، ستون جدول سیگنال‌ها)
+    RESULT_COLUMNS = (
+        ('استراتژی', 'Strategy'),
+        ('تاریخ', 'Date'),
+        ('قیمت', 'Price'),
+        ('نوع سیگنال', 'SignalType'),
+        ('حد ضرر', 'StopLoss'),
+        ('حد سود', 'TakeProfit'),
+        ('نسبت ریسک/ریوارد', 'RiskReward')
+    )
+    
+    # عنوان گزینه جستجو در همه ستون‌ها
+    ALL_COLUMNS = 'همه ستون‌ها'
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("سیستم تحلیل استراتژی‌های معاملاتی")
+        self.root.geometry("1000x700")
+        
+        # تنظیم فونت برای نمایش متون فارسی
+        self.font = ('Tahoma', 10)
+        
+        self.create_widgets()
+        
+        # لیست استراتژی‌ها
+        self.strategies = create_strategies()
+        
+        # داده‌های فعلی
+        self.data = None
+        self.symbol = None
+        self.timeframe = None
+        
+        # کار پس‌زمینه فعلی (بارگذاری یا اجرای استراتژی)
+        self.job = None
+        
+        # به‌روزرسانی کاتالوگ هنگام شروع؛ جدا از کار پس‌زمینه اصلی اجرا می‌شود تا
+        # بارگذاری و اجرای استراتژی‌ها منتظر آن نمانند
+        self.catalog_job = None
+        
+        # کاتالوگ فایل‌های پوشه csv: {عنوان نمایشی: نام فایل}
+        self.catalog = DatasetCatalog('csv')
+        self.datasets = {}
+        self._update_datasets()
+        self.refresh_catalog(exclusive=False)
+        
+    def create_widgets(self):
+        # ایجاد فریم اصلی
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # فریم بالایی برای انتخاب فایل و استراتژی
+        top_frame = ttk.Frame(main_frame, padding="5")
+        top_frame.pack(fill=tk.X, pady=5)
+        
+        # دکمه انتخاب فایل CSV
+        ttk.Button(top_frame, text="انتخاب فایل CSV", command=self.load_csv).pack(side=tk.LEFT, padx=5)
+        
+        # نمایش فایل انتخاب شده
+        self.file_label = ttk.Label(top_frame, text="فایلی انتخاب نشده است", font=self.font)
+        self.file_label.pack(side=tk.LEFT, padx=5)
+        
+        # انتخاب داده‌ها از کاتالوگ پوشه csv با بازه زمانی اختیاری
+        dataset_frame = ttk.Frame(main_frame, padding="5")
+        dataset_frame.pack(fill=tk.X)
+        
+        ttk.Label(dataset_frame, text="داده‌ها:", font=self.font).pack(side=tk.LEFT, padx=5)
+        self.dataset_var = tk.StringVar()
+        self.dataset_combo = ttk.Combobox(dataset_frame, textvariable=self.dataset_var, state='readonly',
+                                          font=self.font, width=50)
+        self.dataset_combo.pack(side=tk.LEFT, padx=5)
+        
+        ttk.Label(dataset_frame, text="از:", font=self.font).pack(side=tk.LEFT, padx=5)
+        self.start_var = tk.StringVar()
+        ttk.Entry(dataset_frame, textvariable=self.start_var, font=self.font, width=12).pack(side=tk.LEFT)
+        ttk.Label(dataset_frame, text="تا:", font=self.font).pack(side=tk.LEFT, padx=5)
+        self.end_var = tk.StringVar()
+        ttk.Entry(dataset_frame, textvariable=self.end_var, font=self.font, width=12).pack(side=tk.LEFT)
+        
+        ttk.Button(dataset_frame, text="بارگذاری", command=self.load_dataset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(dataset_frame, text="به‌روزرسانی فهرست", command=self.refresh_catalog).pack(side=tk.LEFT, padx=5)
+        
+        # فریم استراتژی‌ها
+        strategy_frame = ttk.LabelFrame(main_frame, text="انتخاب استراتژی", padding="10")
+        strategy_frame.pack(fill=tk.X, pady=5)
+        
+        # لیست استراتژی‌ها
+        self.strategy_var = tk.StringVar()
+        strategies = [entry.display_name for entry in STRATEGY_REGISTRY.values()]
+        
+        self.strategy_combo = ttk.Combobox(strategy_frame, textvariable=self.strategy_var, 
+                                          values=strategies, font=self.font, width=30)
+        self.strategy_combo.current(0)
+        self.strategy_combo.pack(side=tk.LEFT, padx=5)
+        
+        # دکمه اجرای استراتژی
+        ttk.Button(strategy_frame, text="اجرای استراتژی", 
+                  command=self.run_strategy).pack(side=tk.LEFT, padx=5)
+        
+        # دکمه اجرای همه استراتژی‌ها به صورت موازی
+        ttk.Button(strategy_frame, text="اجرای همه استراتژی‌ها", 
+                  command=self.run_all_strategies).pack(side=tk.LEFT, padx=5)
+        
+        # دکمه نمایش نتایج
+        ttk.Button(strategy_frame, text="نمایش نمودار", 
+                  command=self.show_chart).pack(side=tk.LEFT, padx=5)
+        
+        # فریم پارامترهای استراتژی
+        self.params_frame = ttk.LabelFrame(main_frame, text="پارامترهای استراتژی", padding="10")
+        self.params_frame.pack(fill=tk.X, pady=5)
+        
+        # فریم نتایج
+        results_frame = ttk.LabelFrame(main_frame, text="نتایج", padding="10")
+        results_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        # فیلتر نتایج
+        filter_frame = ttk.Frame(results_frame)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        ttk.Label(filter_frame, text="فیلتر:", font=self.font).pack(side=tk.LEFT, padx=5)
+        self.filter_column_var = tk.StringVar(value=self.ALL_COLUMNS)
+        ttk.Combobox(filter_frame, textvariable=self.filter_column_var, state='readonly', font=self.font, width=18,
+                     values=[self.ALL_COLUMNS] + [heading for heading, _ in self.RESULT_COLUMNS]).pack(side=tk.LEFT, padx=5)
+        
+        self.filter_var = tk.StringVar()
+        filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_var, font=self.font, width=30)
+        filter_entry.pack(side=tk.LEFT, padx=5)
+        filter_entry.bind('<Return>', lambda event: self.apply_filter())
+        
+        ttk.Button(filter_frame, text="اعمال فیلتر", command=self.apply_filter).pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="حذف فیلتر", command=self.clear_filter).pack(side=tk.LEFT, padx=5)
+        
+        # جدول نتایج: فقط سطرهای قابل مشاهده در Treeview ساخته می‌شوند
+        columns = [heading for heading, _ in self.RESULT_COLUMNS]
+        self.results_tree = ttk.Treeview(results_frame, columns=columns, show='headings')
+        
+        # تنظیم عناوین ستون‌ها (کلیک روی عنوان برای مرتب‌سازی)
+        for heading, column in self.RESULT_COLUMNS:
+            self.results_tree.heading(heading, text=heading, command=lambda column=column: self.sort_results(column))
+            self.results_tree.column(heading, width=100, anchor='center')
+        
+        # اضافه کردن اسکرول‌بار (جابجایی در جدول سیگنال‌ها به جای سطرهای Treeview)
+        self.results_scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.scroll_results)
+        self.results_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.results_tree.pack(fill=tk.BOTH, expand=True)
+        
+        self.results_tree.bind('<Configure>', self._resize_results)
+        self.results_tree.bind('<MouseWheel>', lambda event: self.scroll_results('scroll', -event.delta // 120, 'units'))
+        self.results_tree.bind('<Button-4>', lambda event: self.scroll_results('scroll', -3, 'units'))
+        self.results_tree.bind('<Button-5>', lambda event: self.scroll_results('scroll', 3, 'units'))
+        
+        # جدول ستونی سیگنال‌ها، شماره اولین سطر نمایش داده شده و تعداد سطرهای قابل مشاهده
+        self.results_table = None
+        self.results_offset = 0
+        self.results_page = 25
+        
+        # وضعیت
+        self.status_var = tk.StringVar()
+        self.status_var.set("آماده برای کار")
+        status_bar = ttk.Label(main_frame, textvariable=self.status_var, font=self.font, relief=tk.SUNKEN, anchor=tk.W)
+        status_bar.pack(fill=tk.X, side=tk.BOTTOM, pady=5)
+        
+        # نوار پیشرفت، زمان سپری شده و دکمه لغو کار پس‌زمینه
+        progress_frame = ttk.Frame(main_frame, padding="5")
+        progress_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=100)
+        self.progress_bar.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
+        self.elapsed_var = tk.StringVar()
+        ttk.Label(progress_frame, textvariable=self.elapsed_var, font=self.font, width=12).pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_button = ttk.Button(progress_frame, text="لغو", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+    
+    def start_job(self, title, work, on_success):
+        """
+        اجرای یک کار در پس‌زمینه
+        
+        پارامترها:
+            title (str): عنوان کار برای نوار وضعیت
+            work (callable): تابع work(job) که در رشته پس‌زمینه اجرا می‌شود
+            on_success (callable): تابع on_success(نتیجه) که در رشته رابط گرافیکی اجرا می‌شود
+        
+        خروجی:
+            bool: شروع شدن کار
+        """
+        if self.job is not None:
+            messagebox.showwarning("هشدار", "لطفاً تا پایان کار فعلی صبر کنید یا آن را لغو کنید.")
+            return False
+        
+        job = self._spawn(BackgroundJob(title), work)
+        self.job = job
+        
+        self.status_var.set(f"{title}...")
+        self.cancel_button.config(state=tk.NORMAL)
+        self.progress_bar.config(mode='indeterminate')
+        self.progress_bar.start(10)
+        self.root.after(self.POLL_INTERVAL, self._poll_job, job, on_success)
+        return True
+    
+    def _spawn(self, job, work):
+        """اجرای work(job) در یک رشته پس‌زمینه و قرار دادن نتیجه در job.future"""
+        job.future = Future()
+        
+        def runner():
+            job.future.set_running_or_notify_cancel()
+            try:
+                job.future.set_result(work(job))
+            except BaseException as e:
+                job.future.set_exception(e)
+        
+        # رشته daemon: بستن پنجره منتظر پایان کار لغو شده نمی‌ماند
+        threading.Thread(target=runner, name=job.title, daemon=True).start()
+        return job
+    
+    def _poll_job(self, job, on_success):
+        """به‌روزرسانی وضعیت کار پس‌زمینه و دریافت نتیجه آن (در رشته رابط گرافیکی)"""
+        if job is not self.job:
+            # کار لغو شده است؛ نتیجه آن نادیده گرفته می‌شود
+            return
+        
+        self.elapsed_var.set(f"{job.elapsed:.1f} ثانیه")
+        if job.total:
+            if str(self.progress_bar.cget('mode')) != 'determinate':
+                self.progress_bar.stop()
+                self.progress_bar.config(mode='determinate')
+            self.progress_bar['value'] = 100 * job.done / job.total
+            self.status_var.set(f"{job.stage}... ({job.done}/{job.total})")
+        else:
+            if str(self.progress_bar.cget('mode')) != 'indeterminate':
+                self.progress_bar.config(mode='indeterminate')
+                self.progress_bar.start(10)
+            self.status_var.set(f"{job.stage}...")
+        
+        if not job.future.done():
+            self.root.after(self.POLL_INTERVAL, self._poll_job, job, on_success)
+            return
+        
+        self._finish_job()
+        self.elapsed_var.set(f"{job.elapsed:.1f} ثانیه")
+        try:
+            result = job.future.result()
+        except CancelledError:
+            self.status_var.set(f"{job.title} لغو شد.")
+            return
+        except Exception as e:
+            self.status_var.set(f"خطا در {job.title}: {str(e)}")
+            messagebox.showerror("خطا", f"خطا در {job.title}:\n{str(e)}")
+            return
+        on_success(result)
+    
+    def _finish_job(self):
+        """بازگرداندن نوار پیشرفت و دکمه لغو به حالت آماده"""
+        self.job = None
+        self.progress_bar.stop()
+        self.progress_bar.config(mode='determinate')
+        self.progress_bar['value'] = 0
+        self.cancel_button.config(state=tk.DISABLED)
+    
+    def cancel_job(self):
+        """
+        لغو کار پس‌زمینه فعلی
+        
+        رابط گرافیکی بلافاصله آزاد می‌شود؛ مراحل باقیمانده کار اجرا نمی‌شوند و نتیجه
+        مرحله در حال اجرا پس از پایان نادیده گرفته می‌شود.
+        """
+        job = self.job
+        if job is None:
+            return
+        job.cancel_event.set()
+        self._finish_job()
+        self.status_var.set(f"{job.title} لغو شد.")
+        self.elapsed_var.set(f"{job.elapsed:.1f} ثانیه")
+    
+    def load_csv(self):
+        """بارگذاری فایل CSV"""
+        file_path = filedialog.askopenfilename(
+            title="انتخاب فایل CSV",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        
+        if file_path:
+            file_name = os.path.basename(file_path)
+            
+            def work(job):
+                job.set_stage(f"در حال بارگذاری فایل {file_name}")
+                return load_csv_data(file_path)
+            
+            def done(result):
+                self.data, self.symbol, self.timeframe = result
+                self.file_label.config(text=f"فایل انتخاب شده: {file_name}")
+                self.status_var.set(f"فایل {file_name} با موفقیت بارگذاری شد.")
+                
+                # نمایش چند ردیف اول داده‌ها
+                print(f"اطلاعات فایل {file_name}:")
+                print(self.data.head())
+                
+                messagebox.showinfo("بارگذاری موفق", f"فایل {file_name} با موفقیت بارگذاری شد.\n"
+                                   f"تعداد رکوردها: {len(self.data)}")
+            
+            self.start_job("بارگذاری فایل", work, done)
+    
+    def _update_datasets(self):
+        """پر کردن فهرست داده‌ها از کاتالوگ"""
+        self.datasets = {
+            f"{entry['symbol']} {entry['timeframe']}  ({entry['first'][:10]} تا {entry['last'][:10]}، "
+            f"{entry['bars']} کندل)  {entry['file']}": entry['file']
+            for entry in self.catalog.find()
+        }
+        self.dataset_combo.config(values=list(self.datasets))
+    
+    def refresh_catalog(self, exclusive=True):
+        """
+        به‌روزرسانی کاتالوگ در پس‌زمینه (فقط فایل‌های جدید یا تغییر یافته خوانده می‌شوند)
+        
+        پارامترها:
+            exclusive (bool): اجرا به عنوان کار پس‌زمینه اصلی با نوار پیشرفت و دکمه لغو؛
+                در غیر این صورت (به‌روزرسانی هنگام شروع) در رشته جداگانه اجرا می‌شود و
+                بارگذاری فایل و اجرای استراتژی‌ها را متوقف نمی‌کند
+        """
+        directory = self.catalog.directory
+        title = "به‌روزرسانی فهرست داده‌ها"
+        
+        def work(job):
+            job.set_stage("در حال به‌روزرسانی فهرست داده‌ها")
+            catalog = DatasetCatalog(directory)
+            
+            def progress(done, total, name):
+                job.check_cancelled()
+                job.report(done, total, f"در حال بررسی {name}")
+            
+            catalog.refresh(progress=progress)
+            return catalog
+        
+        def done(catalog):
+            self.catalog = catalog
+            self._update_datasets()
+            if self.job is None:
+                self.status_var.set(f"{len(self.datasets)} فایل داده در فهرست.")
+        
+        if exclusive:
+            if self.start_job(title, work, done):
+                # به‌روزرسانی هنگام شروع (در صورت اجرا) دیگر لازم نیست
+                self._cancel_catalog_job()
+            return
+        
+        self._cancel_catalog_job()
+        self.catalog_job = self._spawn(BackgroundJob(title), work)
+        if self.job is None:
+            self.status_var.set(f"{title}...")
+        self.root.after(self.POLL_INTERVAL, self._poll_catalog_job, self.catalog_job, done)
+    
+    def _cancel_catalog_job(self):
+        """لغو به‌روزرسانی غیرانحصاری کاتالوگ (در صورت اجرا)"""
+        if self.catalog_job is not None:
+            self.catalog_job.cancel_event.set()
+            self.catalog_job = None
+    
+    def _poll_catalog_job(self, job, on_success):
+        """دریافت نتیجه به‌روزرسانی غیرانحصاری کاتالوگ (در رشته رابط گرافیکی)"""
+        if job is not self.catalog_job:
+            return
+        if not job.future.done():
+            self.root.after(self.POLL_INTERVAL, self._poll_catalog_job, job, on_success)
+            return
+        
+        self.catalog_job = None
+        try:
+            result = job.future.result()
+        except CancelledError:
+            return
+        except Exception as e:
+            if self.job is None:
+                self.status_var.set(f"خطا در {job.title}: {str(e)}")
+            return
+        on_success(result)
+    
+    def load_dataset(self):
+        """بارگذاری داده انتخاب شده از کاتالوگ و برش بازه زمانی"""
+        name = self.datasets.get(self.dataset_var.get())
+        if name is None:
+            messagebox.showwarning("هشدار", "لطفاً ابتدا یک فایل از فهرست داده‌ها انتخاب کنید.")
+            return
+        catalog = self.catalog
+        start = self.start_var.get().strip() or None
+        end = self.end_var.get().strip() or None
+        
+        def work(job):
+            job.set_stage(f"در حال بارگذاری فایل {name}")
+            return catalog.load(name, start, end)
+        
+        def done(result):
+            self.data, self.symbol, self.timeframe = result
+            self.file_label.config(text=f"فایل انتخاب شده: {name}")
+            self.status_var.set(f"فایل {name} با {len(self.data)} کندل بارگذاری شد.")
+        
+        self.start_job("بارگذاری فایل", work, done)
+    
+    def show_signals(self, signals, title):
+        """نمایش سیگنال‌ها در جدول نتایج"""
+        # جدول ستونی برای نمایش صفحه‌ای؛ متن نوع سیگنال به صورت برداری ساخته می‌شود
+        frame = signals.reindex(columns=['Date', 'Price', 'StopLoss', 'TakeProfit', 'RiskReward'])
+        frame.insert(0, 'Strategy', signals['Strategy'] if 'Strategy' in signals.columns else title)
+        frame.insert(3, 'SignalType', np.where(signals['Signal'].to_numpy() == 1, "خرید", "فروش").astype(object))
+        self.results_table = SignalTable(frame)
+        self.results_offset = 0
+        self.filter_var.set('')
+        self._update_headings()
+        self.render_results()
+        
+        self.signals = signals  # ذخیره سیگنال‌ها برای نمایش نمودار
+        self.signals_title = title
+    
+    def _format_value(self, value):
+        """متن نمایشی یک مقدار جدول نتایج"""
+        if isinstance(value, np.datetime64):
+            return str(pd.Timestamp(value))
+        return value
+    
+    def render_results(self):
+        """ساخت سطرهای قابل مشاهده جدول نتایج و به‌روزرسانی اسکرول‌بار"""
+        self.results_tree.delete(*self.results_tree.get_children())
+        table = self.results_table
+        if table is None:
+            self.results_scrollbar.set(0, 1)
+            return
+        
+        total = len(table)
+        self.results_offset = max(0, min(self.results_offset, total - self.results_page))
+        stop = self.results_offset + self.results_page
+        columns = [column for _, column in self.RESULT_COLUMNS]
+        for row in table.rows(self.results_offset, stop, columns):
+            self.results_tree.insert('', 'end', values=[self._format_value(value) for value in row])
+        
+        if total:
+            self.results_scrollbar.set(self.results_offset / total, min(stop, total) / total)
+        else:
+            self.results_scrollbar.set(0, 1)
+    
+    def scroll_results(self, action, amount, unit=None):
+        """
+        جابجایی در جدول نتایج (فرمان اسکرول‌بار)
+        
+        پارامترها:
+            action (str): 'moveto' (رفتن به کسری از جدول) یا 'scroll'
+            amount (str | int): کسر موقعیت یا تعداد واحد جابجایی
+            unit (str): 'units' (سطر) یا 'pages' (صفحه) برای 'scroll'
+        """
+        if self.results_table is None:
+            return
+        if action == 'moveto':
+            offset = int(float(amount) * len(self.results_table))
+        else:
+            step = self.results_page if unit == 'pages' else 1
+            offset = self.results_offset + int(amount) * step
+        if offset != self.results_offset:
+            self.results_offset = offset
+            self.render_results()
+    
+    def _resize_results(self, event):
+        """تنظیم تعداد سطرهای قابل مشاهده با تغییر اندازه جدول"""
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        page = max(1, (event.height - row_height) // row_height)
+        if page != self.results_page:
+            self.results_page = page
+            self.render_results()
+    
+    def _update_headings(self):
+        """نمایش جهت مرتب‌سازی در عنوان ستون"""
+        table = self.results_table
+        for heading, column in self.RESULT_COLUMNS:
+            text = heading
+            if table is not None and table.sort_column == column:
+                text += ' ▲' if table.ascending else ' ▼'
+            self.results_tree.heading(heading, text=text)
+    
+    def _report_results(self):
+        """نمایش تعداد سطرهای جدول نتایج در نوار وضعیت"""
+        table = self.results_table
+        if len(table) == table.total:
+            self.status_var.set(f"{table.total} سیگنال")
+        else:
+            self.status_var.set(f"نمایش {len(table)} از {table.total} سیگنال")
+    
+    def sort_results(self, column):
+        """مرتب‌سازی جدول نتایج بر اساس ستون (کلیک دوباره: نزولی)"""
+        if self.results_table is None:
+            return
+        self.results_table.toggle_sort(column)
+        self.results_offset = 0
+        self._update_headings()
+        self.render_results()
+    
+    def apply_filter(self):
+        """اعمال فیلتر روی جدول نتایج"""
+        if self.results_table is None:
+            return
+        heading = self.filter_column_var.get()
+        column = dict(self.RESULT_COLUMNS).get(heading)
+        self.results_table.filter(column, self.filter_var.get().strip())
+        self.results_offset = 0
+        self.render_results()
+        self._report_results()
+    
+    def clear_filter(self):
+        """حذف فیلتر جدول نتایج"""
+        self.filter_var.set('')
+        self.apply_filter()
+    
+    def run_strategy(self):
+        """اجرای استراتژی انتخاب شده در پس‌زمینه"""
+        if self.data is None:
+            messagebox.showwarning("هشدار", "لطفاً ابتدا یک فایل CSV انتخاب کنید.")
+            return
+        
+        strategy_name = self.strategy_var.get()
+        strategy = self.strategies[strategy_name]
+        data = self.data
+        
+        def work(job):
+            # اجرای استراتژی انتخاب شده
+            job.set_stage(f"در حال اجرای استراتژی {strategy_name}")
+            signals = strategy.run(read_only_view(data))
+            job.check_cancelled()
+            
+            if signals.empty:
+                return signals
+            
+            # محاسبه مدیریت ریسک
+            job.set_stage("در حال محاسبه مدیریت ریسک")
+            return calculate_risk_reward(signals, data)
+        
+        def done(signals):
+            if signals.empty:
+                self.status_var.set(f"هیچ سیگنالی برای استراتژی {strategy_name} یافت نشد.")
+                messagebox.showinfo("اطلاعات", "هیچ سیگنالی یافت نشد.")
+                return
+            
+            self.show_signals(signals, strategy_name)
+            self.status_var.set(f"استراتژی {strategy_name} با موفقیت اجرا شد. {len(signals)} سیگنال یافت شد.")
+            
+            # گزارش وضعیت کش اندیکاتورها
+            stats = indicator_cache.stats()
+            print(f"کش اندیکاتورها: {stats['hits']} hit، {stats['misses']} miss "
+                  f"({stats['hit_rate']:.1f}%)، حافظه: {stats['bytes'] / 1024 / 1024:.1f} MB")
+        
+        self.start_job(f"اجرای استراتژی {strategy_name}", work, done)
+    
+    def run_all_strategies(self):
+        """اجرای همزمان همه استراتژی‌ها روی همه هسته‌های پردازنده در پس‌زمینه"""
+        if self.data is None:
+            messagebox.showwarning("هشدار", "لطفاً ابتدا یک فایل CSV انتخاب کنید.")
+            return
+        
+        data = self.data
+        strategies = dict(self.strategies)
+        
+        def work(job):
+            job.set_stage("در حال اجرای همه استراتژی‌ها")
+            signals, timings = run_strategies_parallel(
+                data, strategies,
+                progress=lambda done, total: job.report(done, total),
+                cancel_event=job.cancel_event
+            )
+            job.check_cancelled()
+            
+            if not signals.empty:
+                # محاسبه مدیریت ریسک
+                job.set_stage("در حال محاسبه مدیریت ریسک")
+                signals = calculate_risk_reward(signals, data)
+            return signals, timings
+        
+        def done(result):
+            signals, timings = result
+            
+            # گزارش زمان اجرای هر استراتژی
+            for _, row in timings.iterrows():
+                if row['Error'] is None:
+                    print(f"{row['Strategy']}: {row['Signals']} سیگنال در {row['Seconds']:.2f} ثانیه")
+                else:
+                    print(f"{row['Strategy']}: خطا - {row['Error']}")
+            
+            failed = timings[timings['Error'].notna()]
+            if signals.empty:
+                self.status_var.set("هیچ سیگنالی برای استراتژی‌ها یافت نشد.")
+                messagebox.showinfo("اطلاعات", "هیچ سیگنالی یافت نشد.")
+                return
+            
+            self.show_signals(signals, "همه استراتژی‌ها")
+            status = (f"{len(timings) - len(failed)} استراتژی در {timings.attrs['total_seconds']:.2f} ثانیه اجرا شد. "
+                      f"{len(signals)} سیگنال یافت شد.")
+            if not failed.empty:
+                status += f" خطا در: {', '.join(failed['Strategy'])}"
+            self.status_var.set(status)
+        
+        self.start_job("اجرای همه استراتژی‌ها", work, done)
+    
+    def show_chart(self):
+        """نمایش نمودار نتایج"""
+        if not hasattr(self, 'signals') or self.signals is None or self.data is None:
+            messagebox.showwarning("هشدار", "لطفاً ابتدا یک استراتژی را اجرا کنید.")
+            return
+        
+        try:
+            strategy_name = getattr(self, 'signals_title', self.strategy_var.get())
+            plot_strategy_results(self.data, self.signals, strategy_name, self.symbol, self.timeframe)
+            self.status_var.set(f"نمودار استراتژی {strategy_name} با موفقیت نمایش داده شد.")
+        except Exception as e:
+            self.status_var.set(f"خطا در نمایش نمودار: {str(e)}")
+            messagebox.showerror("خطا", f"خطا در نمایش نمودار:\n{str(e)}")
+
+def start_gui():
+    """شروع رابط گرافیکی"""
+    # ایجاد پوشه‌های مورد نیاز
+    os.makedirs('csv', exist_ok=True)
+    
+    # تنظیم برای نمایش صحیح متن فارسی در پایتون
+    plt.rcParams['font.family'] = 'Tahoma'
+    
+    # شروع برنامه
+    root = tk.Tk()
+    app = TradingApp(root)
+    root.mainloop()
\ No newline at end of file
@@ -2,219 +2,290 @@
 """
 برنامه اصلی تحلیل استراتژی‌های معاملاتی
 نوشته شده برای ویندوز 11 و پایتون 3.11.9
+
+بدون آرگومان رابط گرافیکی اجرا می‌شود. دستورات خط فرمان (بدون نیاز به نمایشگر):
+    python main.py list
+    python main.py run --file csv/EURUSD_H1.csv --strategy rsi_ema --out signals.csv
+    python main.py run --file csv/EURUSD_M1.csv --strategy all --timeframe H1 --out signals.csv
+    python main.py run --file csv/EURUSD_ticks.csv --strategy all --ticks tick:500 --out signals.csv
+    python main.py run --file csv/EURUSD_M1.csv --strategy all --chunk-rows 500000 --out signals.csv
+    python main.py run --file csv/EURUSD_M1.csv --strategy all --follow 60 --out signals.csv
+    python main.py scan --source csv --strategy all --out report.csv
+    python main.py run --file csv/EURUSD_H1.csv --strategy all --stop swing --swing-lookback 20 --risk-ratio 3
+    python main.py scan --source csv --symbol EURUSD --timeframe H1 --start 2023-01-01 --strategy all --out report.csv
+    python main.py catalog --source csv
+
+حالت خط فرمان tkinter، matplotlib و mplcursors را وارد نمی‌کند و pandas و
+استراتژی‌ها فقط در صورت نیاز وارد می‌شوند تا زمان شروع کوتاه بماند.
 """
 
-import os
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import ast
+import contextlib
 import sys
-import pandas as pd
-import matplotlib.pyplot as plt
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-
-# وارد کردن ماژول‌های استراتژی
-from strategies.rsi_ema import RSI_EMA_Strategy
-from strategies.bollinger_rsi import Bollinger_RSI_Strategy
-from strategies.trend_pullback import Trend_Pullback_Strategy
-from strategies.time_breakout import Time_Breakout_Strategy
-from strategies.ichimoku import Ichimoku_Strategy
-from strategies.harmonic_patterns import Harmonic_Patterns_Strategy
-from strategies.divergence import Divergence_Strategy
-from strategies.ma_crossover import MA_Crossover_Strategy
-
-from utils.data_loader import load_csv_data
-from utils.visualizer import plot_strategy_results
-from utils.risk_management import calculate_risk_reward
-
-class TradingApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("سیستم تحلیل استراتژی‌های معاملاتی")
-        self.root.geometry("1000x700")
-        
-        # تنظیم فونت برای نمایش متون فارسی
-        self.font = ('Tahoma', 10)
-        
-        self.create_widgets()
-        
-        # لیست استراتژی‌ها
-        self.strategies = {
-            "RSI + EMA": RSI_EMA_Strategy(),
-            "بولینگر باند + RSI": Bollinger_RSI_Strategy(),
-            "استراتژی پولبک روند": Trend_Pullback_Strategy(),
-            "شکست بر اساس زمان": Time_Breakout_Strategy(),
-            "ایچیموکو": Ichimoku_Strategy(),
-            "الگوهای هارمونیک": Harmonic_Patterns_Strategy(),
-            "واگرایی": Divergence_Strategy(),
-            "کراس مووینگ اوریج": MA_Crossover_Strategy()
-        }
-        
-        # داده‌های فعلی
-        self.data = None
-        self.symbol = None
-        self.timeframe = None
-        
-    def create_widgets(self):
-        # ایجاد فریم اصلی
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        
-        # فریم بالایی برای انتخاب فایل و استراتژی
-        top_frame = ttk.Frame(main_frame, padding="5")
-        top_frame.pack(fill=tk.X, pady=5)
-        
-        # دکمه انتخاب فایل CSV
-        ttk.Button(top_frame, text="انتخاب فایل CSV", command=self.load_csv).pack(side=tk.LEFT, padx=5)
-        
-        # نمایش فایل انتخاب شده
-        self.file_label = ttk.Label(top_frame, text="فایلی انتخاب نشده است", font=self.font)
-        self.file_label.pack(side=tk.LEFT, padx=5)
-        
-        # فریم استراتژی‌ها
-        strategy_frame = ttk.LabelFrame(main_frame, text="انتخاب استراتژی", padding="10")
-        strategy_frame.pack(fill=tk.X, pady=5)
-        
-        # لیست استراتژی‌ها
-        self.strategy_var = tk.StringVar()
-        strategies = ["RSI + EMA", "بولینگر باند + RSI", "استراتژی پولبک روند", 
-                     "شکست بر اساس زمان", "ایچیموکو", "الگوهای هارمونیک",
-                     "واگرایی", "کراس مووینگ اوریج"]
-        
-        self.strategy_combo = ttk.Combobox(strategy_frame, textvariable=self.strategy_var, 
-                                          values=strategies, font=self.font, width=30)
-        self.strategy_combo.current(0)
-        self.strategy_combo.pack(side=tk.LEFT, padx=5)
-        
-        # دکمه اجرای استراتژی
-        ttk.Button(strategy_frame, text="اجرای استراتژی", 
-                  command=self.run_strategy).pack(side=tk.LEFT, padx=5)
-        
-        # دکمه نمایش نتایج
-        ttk.Button(strategy_frame, text="نمایش نمودار", 
-                  command=self.show_chart).pack(side=tk.LEFT, padx=5)
-        
-        # فریم پارامترهای استراتژی
-        self.params_frame = ttk.LabelFrame(main_frame, text="پارامترهای استراتژی", padding="10")
-        self.params_frame.pack(fill=tk.X, pady=5)
-        
-        # فریم نتایج
-        results_frame = ttk.LabelFrame(main_frame, text="نتایج", padding="10")
-        results_frame.pack(fill=tk.BOTH, expand=True, pady=5)
-        
-        # جدول نتایج
-        columns = ('تاریخ', 'قیمت', 'نوع سیگنال', 'حد ضرر', 'حد سود', 'نسبت ریسک/ریوارد')
-        self.results_tree = ttk.Treeview(results_frame, columns=columns, show='headings')
-        
-        # تنظیم عناوین ستون‌ها
-        for col in columns:
-            self.results_tree.heading(col, text=col)
-            self.results_tree.column(col, width=100, anchor='center')
-        
-        # اضافه کردن اسکرول‌بار
-        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
-        self.results_tree.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.results_tree.pack(fill=tk.BOTH, expand=True)
-        
-        # وضعیت
-        self.status_var = tk.StringVar()
-        self.status_var.set("آماده برای کار")
-        status_bar = ttk.Label(main_frame, textvariable=self.status_var, font=self.font, relief=tk.SUNKEN, anchor=tk.W)
-        status_bar.pack(fill=tk.X, side=tk.BOTTOM, pady=5)
-    
-    def load_csv(self):
-        """بارگذاری فایل CSV"""
-        file_path = filedialog.askopenfilename(
-            title="انتخاب فایل CSV",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
-        )
-        
-        if file_path:
-            try:
-                self.data, self.symbol, self.timeframe = load_csv_data(file_path)
-                file_name = os.path.basename(file_path)
-                self.file_label.config(text=f"فایل انتخاب شده: {file_name}")
-                self.status_var.set(f"فایل {file_name} با موفقیت بارگذاری شد.")
-                
-                # نمایش چند ردیف اول داده‌ها
-                print(f"اطلاعات فایل {file_name}:")
-                print(self.data.head())
-                
-                messagebox.showinfo("بارگذاری موفق", f"فایل {file_name} با موفقیت بارگذاری شد.\n"
-                                   f"تعداد رکوردها: {len(self.data)}")
-            except Exception as e:
-                self.status_var.set(f"خطا در بارگذاری فایل: {str(e)}")
-                messagebox.showerror("خطا", f"خطا در بارگذاری فایل:\n{str(e)}")
-    
-    def run_strategy(self):
-        """اجرای استراتژی انتخاب شده"""
-        if self.data is None:
-            messagebox.showwarning("هشدار", "لطفاً ابتدا یک فایل CSV انتخاب کنید.")
-            return
-        
-        strategy_name = self.strategy_var.get()
-        self.status_var.set(f"در حال اجرای استراتژی {strategy_name}...")
-        
-        try:
-            # پاک کردن جدول نتایج
-            for item in self.results_tree.get_children():
-                self.results_tree.delete(item)
-            
-            # اجرای استراتژی انتخاب شده
-            strategy = self.strategies[strategy_name]
-            signals = strategy.run(self.data.copy())
-            
-            if signals.empty:
-                self.status_var.set(f"هیچ سیگنالی برای استراتژی {strategy_name} یافت نشد.")
-                messagebox.info("اطلاعات", "هیچ سیگنالی یافت نشد.")
-                return
-            
-            # محاسبه مدیریت ریسک
-            signals = calculate_risk_reward(signals, self.data)
-            
-            # نمایش نتایج در جدول
-            for _, row in signals.iterrows():
-                date = row['Date']
-                price = row['Price']
-                signal_type = "خرید" if row['Signal'] == 1 else "فروش"
-                stop_loss = row['StopLoss']
-                take_profit = row['TakeProfit']
-                risk_reward = row['RiskReward']
-                
-                self.results_tree.insert('', 'end', values=(date, price, signal_type, stop_loss, take_profit, risk_reward))
-            
-            self.status_var.set(f"استراتژی {strategy_name} با موفقیت اجرا شد. {len(signals)} سیگنال یافت شد.")
-            self.signals = signals  # ذخیره سیگنال‌ها برای نمایش نمودار
-            
-        except Exception as e:
-            self.status_var.set(f"خطا در اجرای استراتژی: {str(e)}")
-            messagebox.showerror("خطا", f"خطا در اجرای استراتژی:\n{str(e)}")
-    
-    def show_chart(self):
-        """نمایش نمودار نتایج"""
-        if not hasattr(self, 'signals') or self.signals is None or self.data is None:
-            messagebox.showwarning("هشدار", "لطفاً ابتدا یک استراتژی را اجرا کنید.")
-            return
-        
-        try:
-            strategy_name = self.strategy_var.get()
-            plot_strategy_results(self.data, self.signals, strategy_name, self.symbol, self.timeframe)
-            self.status_var.set(f"نمودار استراتژی {strategy_name} با موفقیت نمایش داده شد.")
-        except Exception as e:
-            self.status_var.set(f"خطا در نمایش نمودار: {str(e)}")
-            messagebox.showerror("خطا", f"خطا در نمایش نمودار:\n{str(e)}")
-
-def main():
-    """تابع اصلی برنامه"""
-    # ایجاد پوشه‌های مورد نیاز
-    os.makedirs('csv', exist_ok=True)
+
+def _parse_param(text):
+    """تبدیل 'نام=مقدار' به (نام، مقدار) با تشخیص نوع عددی"""
+    if '=' not in text:
+        raise argparse.ArgumentTypeError(f"پارامتر باید به شکل name=value باشد: {text}")
+    name, value = text.split('=', 1)
+    try:
+        value = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        pass
+    return name.strip(), value
+
+def _strategy_names(names):
+    """نام استراتژی‌های انتخاب شده (None برای همه)"""
+    if not names or 'all' in names:
+        return None
+    return names
+
+def _risk_options(args):
+    """پارامترهای calculate_risk_reward از آرگومان‌های خط فرمان"""
+    return {
+        'risk_ratio': args.risk_ratio,
+        'stop': args.stop,
+        'atr_multiplier': args.atr_multiplier,
+        'stop_percent': args.stop_percent,
+        'swing_lookback': args.swing_lookback
+    }
+
+def _report_timings(args, timings):
+    """چاپ زمان مراحل در stderr"""
+    if args.timings:
+        for stage, seconds in timings:
+            print(f"{stage}: {seconds:.3f}s", file=sys.stderr)
+
+def command_list(args):
+    """نمایش استراتژی‌های موجود"""
+    from strategies.registry import STRATEGY_REGISTRY
+    
+    for entry in STRATEGY_REGISTRY.values():
+        print(f"{entry.key:<20}{entry.display_name}")
+    return 0
+
+def command_run(args):
+    """اجرای استراتژی‌ها روی یک فایل و ذخیره سیگنال‌ها"""
+    timings = [('startup', time.perf_counter() - _START)]
+    
+    stage = time.perf_counter()
+    from strategies.registry import create_strategy, create_strategies, strategy_entry
+    from strategies.engine import run_strategies_parallel
+    from utils.data_loader import load_csv_data, slice_dates
+    from utils.risk_management import calculate_risk_reward
+    timings.append(('imports', time.perf_counter() - stage))
+    
+    names = _strategy_names(args.strategy)
+    params = dict(args.param or [])
+    if params:
+        if names is None or len(names) != 1:
+            print("خطا: --param فقط همراه با یک استراتژی قابل استفاده است.", file=sys.stderr)
+            return 2
+        strategies = {strategy_entry(names[0]).display_name: create_strategy(names[0], **params)}
+    else:
+        strategies = create_strategies(names)
+    
+    if args.timeframe and args.ticks:
+        print("خطا: --timeframe و --ticks با هم قابل استفاده نیستند.", file=sys.stderr)
+        return 2
+    if args.chunk_rows or args.follow:
+        if args.timeframe or args.start or args.end:
+            print("خطا: --timeframe، --start و --end همراه با --chunk-rows یا --follow قابل استفاده نیستند.",
+                  file=sys.stderr)
+            return 2
+        if args.follow and args.ticks:
+            print("خطا: --follow همراه با --ticks قابل استفاده نیست.", file=sys.stderr)
+            return 2
+        return _run_chunked(args, strategies, timings)
+    
+    stage = time.perf_counter()
+    # پیام‌های بارگذاری به stderr می‌روند تا با خروجی CSV در stdout مخلوط نشوند
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.ticks:
+            from utils.ticks import load_tick_bars, parse_bar_spec
+            data, symbol, timeframe = load_tick_bars(args.file, *parse_bar_spec(args.ticks), tz=args.tz,
+                                                     session_start=args.session_start)
+        elif args.timeframe:
+            from utils.resample import load_timeframes
+            timeframe = args.timeframe.upper()
+            frames, symbol, _ = load_timeframes(args.file, [timeframe], float32=args.float32, tz=args.tz,
+                                                session_start=args.session_start)
+            data = frames[timeframe]
+        else:
+            data, symbol, timeframe = load_csv_data(args.file, float32=args.float32)
+        data = slice_dates(data, args.start, args.end)
+    timings.append(('load', time.perf_counter() - stage))
+    
+    stage = time.perf_counter()
+    signals, strategy_timings = run_strategies_parallel(data, strategies, max_workers=args.workers)
+    if not args.no_risk and not signals.empty:
+        signals = calculate_risk_reward(signals, data, **_risk_options(args))
+    timings.append(('run', time.perf_counter() - stage))
+    
+    for _, row in strategy_timings.iterrows():
+        if row['Error'] is not None:
+            print(f"خطا در {row['Strategy']}: {row['Error']}", file=sys.stderr)
+    
+    signals.insert(0, 'Symbol', symbol)
+    signals.insert(1, 'Timeframe', timeframe)
+    if args.out:
+        signals.to_csv(args.out, index=False, encoding='utf-8-sig')
+        print(f"{len(signals)} سیگنال در {args.out} ذخیره شد.")
+    else:
+        signals.to_csv(sys.stdout, index=False)
     
-    # تنظیم برای نمایش صحیح متن فارسی در پایتون
-    plt.rcParams['font.family'] = 'Tahoma'
+    timings.extend((f"  {row['Strategy']}", row['Seconds']) for _, row in strategy_timings.iterrows())
+    timings.append(('total', time.perf_counter() - _START))
+    _report_timings(args, timings)
+    return 1 if strategy_timings['Error'].notna().any() else 0
+
+def _run_chunked(args, strategies, timings):
+    """اجرای تکه‌ای روی فایل‌های بزرگ‌تر از حافظه و نوشتن سیگنال‌ها پس از هر تکه"""
+    from strategies.chunked import run_chunked
+    from strategies.scanner import report_columns
+    from utils.data_loader import parse_file_name
+    
+    stage = time.perf_counter()
+    symbol, timeframe = parse_file_name(args.file)
+    source = args.file
+    if args.follow:
+        from utils.tail_loader import follow_csv
+        source = follow_csv(args.file, interval=args.follow, float32=args.float32)
+    elif args.ticks:
+        from utils.ticks import bar_label, iter_tick_bars, parse_bar_spec
+        kind, size = parse_bar_spec(args.ticks)
+        timeframe = bar_label(kind, size)
+        source = iter_tick_bars(args.file, kind, size, args.chunk_rows, tz=args.tz, session_start=args.session_start)
+    columns = [column for column in report_columns(strategies, not args.no_risk) if column != 'File']
+    output = open(args.out, 'w', newline='', encoding='utf-8-sig') if args.out else sys.stdout
+    count = 0
+    try:
+        output.write(','.join(columns) + '\n')
+        for bars, signals in run_chunked(source, strategies, risk_reward=not args.no_risk,
+                                         chunk_rows=args.chunk_rows, float32=args.float32,
+                                         risk_options=_risk_options(args)):
+            if not signals.empty:
+                signals = signals.assign(Symbol=symbol, Timeframe=timeframe).reindex(columns=columns)
+                signals.to_csv(output, index=False, header=False)
+                output.flush()
+                count += len(signals)
+            print(f"{bars} کندل پردازش شد، {count} سیگنال", file=sys.stderr)
+    except KeyboardInterrupt:
+        # پایان دنبال کردن فایل با Ctrl+C
+        pass
+    finally:
+        if args.out:
+            output.close()
+    timings.append(('run', time.perf_counter() - stage))
+    
+    if args.out:
+        print(f"{count} سیگنال در {args.out} ذخیره شد.")
+    timings.append(('total', time.perf_counter() - _START))
+    _report_timings(args, timings)
+    return 0
+
+def command_scan(args):
+    """اسکن چند فایل و ذخیره گزارش تجمیعی"""
+    from strategies.registry import create_strategies
+    from strategies.scanner import scan_files
+    
+    strategies = create_strategies(_strategy_names(args.strategy))
     
-    # شروع برنامه
-    root = tk.Tk()
-    app = TradingApp(root)
-    root.mainloop()
+    def progress(done, total, summary):
+        status = summary['Error'] or f"{summary['Signals']} سیگنال"
+        print(f"[{done}/{total}] {summary['File']}: {status}", file=sys.stderr)
+    
+    summary = scan_files(args.source, strategies, args.out, max_workers=args.workers,
+                         risk_reward=not args.no_risk, progress=progress, symbols=args.symbol,
+                         timeframes=args.timeframe, start=args.start, end=args.end,
+                         risk_options=_risk_options(args))
+    print(f"{len(summary)} فایل اسکن شد، {summary['Signals'].sum()} سیگنال در {args.out} ذخیره شد.")
+    _report_timings(args, [('total', time.perf_counter() - _START)])
+    return 1 if summary['Error'].notna().any() else 0
+
+def command_catalog(args):
+    """به‌روزرسانی و نمایش کاتالوگ فایل‌های داده یک پوشه"""
+    from utils.catalog import DatasetCatalog
+    
+    catalog = DatasetCatalog(args.source)
+    updated = catalog.refresh(progress=lambda done, total, name: print(f"[{done}/{total}] {name}", file=sys.stderr))
+    print(f"{len(updated)} فایل به‌روز شد.", file=sys.stderr)
+    
+    entries = catalog.find(args.symbol, args.timeframe, args.start, args.end)
+    table = catalog.to_frame()
+    table = table[table['file'].isin([entry['file'] for entry in entries])]
+    table.drop(columns=['error']).to_csv(sys.stdout, index=False)
+    return 0
+
+def build_parser():
+    """تعریف آرگومان‌های خط فرمان"""
+    parser = argparse.ArgumentParser(description="سیستم تحلیل استراتژی‌های معاملاتی")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    list_parser = subparsers.add_parser('list', help="نمایش استراتژی‌های موجود")
+    list_parser.set_defaults(handler=command_list)
+    
+    run_parser = subparsers.add_parser('run', help="اجرای استراتژی روی یک فایل CSV")
+    run_parser.add_argument('--file', required=True, help="مسیر فایل CSV")
+    run_parser.add_argument('--strategy', action='append', help="کلید یا نام استراتژی (قابل تکرار، all برای همه)")
+    run_parser.add_argument('--param', action='append', type=_parse_param, help="پارامتر استراتژی به شکل name=value")
+    run_parser.add_argument('--out', help="مسیر فایل CSV خروجی (پیش‌فرض: خروجی استاندارد)")
+    run_parser.add_argument('--float32', action='store_true', help="ذخیره قیمت‌ها به صورت float32 (نصف حافظه)")
+    run_parser.add_argument('--timeframe', help="ساخت کندل‌های این تایم‌فریم از فایل (مثلاً H1 از فایل M1)")
+    run_parser.add_argument('--ticks', help="فایل تیک است؛ نوع کندل‌ها: تایم‌فریم (مثلاً M1)، tick:500 یا volume:1000")
+    run_parser.add_argument('--tz', help="منطقه زمانی مرز کندل‌های زمانی (مثلاً America/New_York)")
+    run_parser.add_argument('--session-start', help="ساعت شروع جلسه برای کندل‌های زمانی (مثلاً 17:00)")
+    run_parser.add_argument('--follow', type=float, default=None,
+                            help="دنبال کردن فایل در حال رشد: بررسی کندل‌های جدید هر این تعداد ثانیه")
+    run_parser.add_argument('--chunk-rows', type=int, default=None,
+                            help="اجرای تکه‌ای با این تعداد سطر در هر تکه (برای فایل‌های بزرگ‌تر از حافظه)")
+    run_parser.set_defaults(handler=command_run)
+    
+    scan_parser = subparsers.add_parser('scan', help="اسکن چند فایل CSV")
+    scan_parser.add_argument('--source', required=True, help="پوشه یا الگوی glob فایل‌های CSV")
+    scan_parser.add_argument('--strategy', action='append', help="کلید یا نام استراتژی (قابل تکرار، all برای همه)")
+    scan_parser.add_argument('--out', required=True, help="مسیر فایل CSV گزارش")
+    scan_parser.set_defaults(handler=command_scan)
+    
+    catalog_parser = subparsers.add_parser('catalog', help="به‌روزرسانی و نمایش کاتالوگ فایل‌های داده")
+    catalog_parser.add_argument('--source', default='csv', help="پوشه فایل‌های CSV (پیش‌فرض: csv)")
+    catalog_parser.set_defaults(handler=command_catalog)
+    
+    for subparser in (scan_parser, catalog_parser):
+        subparser.add_argument('--symbol', action='append', help="فقط این نماد (قابل تکرار)")
+        subparser.add_argument('--timeframe', action='append', help="فقط این تایم‌فریم (قابل تکرار)")
+    for subparser in (run_parser, scan_parser, catalog_parser):
+        subparser.add_argument('--start', help="اولین زمان بازه (مثلاً 2023-01-01)")
+        subparser.add_argument('--end', help="پایان بازه، غیر شامل (مثلاً 2024-01-01)")
+    
+    for subparser in (run_parser, scan_parser):
+        subparser.add_argument('--workers', type=int, default=None, help="تعداد پردازه‌ها (پیش‌فرض: تعداد هسته‌ها)")
+        subparser.add_argument('--no-risk', action='store_true', help="بدون محاسبه حد ضرر و حد سود")
+        subparser.add_argument('--stop', choices=('atr', 'percent', 'swing'), default='atr',
+                               help="روش حد ضرر: ضریب ATR، درصد قیمت یا کف و سقف اخیر (پیش‌فرض: atr)")
+        subparser.add_argument('--risk-ratio', type=float, default=2, help="نسبت حد سود به حد ضرر (پیش‌فرض: 2)")
+        subparser.add_argument('--atr-multiplier', type=float, default=1.5, help="ضریب ATR حد ضرر (پیش‌فرض: 1.5)")
+        subparser.add_argument('--stop-percent', type=float, default=1.0, help="فاصله حد ضرر به درصد قیمت (پیش‌فرض: 1)")
+        subparser.add_argument('--swing-lookback', type=int, default=20,
+                               help="تعداد کندل‌های بررسی کف و سقف در روش swing (پیش‌فرض: 20)")
+        subparser.add_argument('--timings', action='store_true', help="چاپ زمان مراحل اجرا در stderr")
+    
+    return parser
+
+def main(argv=None):
+    """تابع اصلی برنامه"""
+    args = build_parser().parse_args(argv)
+    if args.command is None:
+        # بدون دستور: اجرای رابط گرافیکی
+        from gui import start_gui
+        start_gui()
+        return 0
+    return args.handler(args)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+کلاس پایه استراتژی‌های معاملاتی
+
+هر استراتژی به صورت اعلانی مشخص می‌کند:
+- پارامترهای قابل تنظیم (آرگومان‌های سازنده)
+- اندیکاتورهای مورد نیاز (IndicatorSpec)
+- تعداد کندل‌های گذشته لازم برای گرم شدن (lookback)
+- تعداد کندل‌های آینده‌ای که سیگنال به آن‌ها وابسته است (lookahead)
+- ستون‌های جدول خروجی (output_columns)
+"""
+
+import inspect
+from collections import namedtuple
+
+import pandas as pd
+
+from utils.indicators import (
+    calculate_ema, calculate_sma, calculate_rsi, calculate_bollinger_bands, calculate_macd,
+    calculate_stochastic, calculate_atr, calculate_ichimoku, calculate_donchian_channels,
+    calculate_volume_sma
+)
+
+# ضریب دوره برای گرم شدن اندیکاتورهای بازگشتی (EMA و وایلدر) تا اثر مقدار اولیه ناچیز شود
+RECURSIVE_WARMUP = 10
+
+IndicatorDefinition = namedtuple('IndicatorDefinition', ['function', 'outputs', 'warmup'])
+
+# تعریف اندیکاتورهای قابل استفاده در استراتژی‌ها
+INDICATORS = {
+    'ema': IndicatorDefinition(calculate_ema, None,
+                               lambda period=20: RECURSIVE_WARMUP * period),
+    'sma': IndicatorDefinition(calculate_sma, None,
+                               lambda period=20: period),
+    'rsi': IndicatorDefinition(calculate_rsi, None,
+                               lambda period=14: RECURSIVE_WARMUP * period),
+    'bollinger': IndicatorDefinition(calculate_bollinger_bands, ('middle', 'upper', 'lower'),
+                                     lambda period=20, std_dev=2: period),
+    'macd': IndicatorDefinition(calculate_macd, ('macd', 'signal', 'histogram'),
+                                lambda fast_period=12, slow_period=26, signal_period=9:
+                                RECURSIVE_WARMUP * (slow_period + signal_period)),
+    'stochastic': IndicatorDefinition(calculate_stochastic, ('k', 'd'),
+                                      lambda k_period=14, d_period=3: k_period + d_period),
+    'atr': IndicatorDefinition(calculate_atr, None,
+                               lambda period=14, smoothing='sma':
+                               RECURSIVE_WARMUP * period if smoothing == 'wilder' else period + 1),
+    'ichimoku': IndicatorDefinition(calculate_ichimoku, ('tenkan', 'kijun', 'senkou_a', 'senkou_b', 'chikou'),
+                                    lambda tenkan_period=9, kijun_period=26, senkou_b_period=52, displacement=26:
+                                    max(tenkan_period, kijun_period, senkou_b_period) + displacement),
+    'donchian': IndicatorDefinition(calculate_donchian_channels, ('upper', 'middle', 'lower'),
+                                    lambda period=20: period),
+    'volume_sma': IndicatorDefinition(calculate_volume_sma, None,
+                                      lambda period=20: period),
+}
+
+class IndicatorSpec:
+    """
+    توصیف یک اندیکاتور مورد نیاز استراتژی
+    
+    مثال:
+        IndicatorSpec('rsi', period=14)
+        IndicatorSpec('bollinger', output='lower', period=20, std_dev=2)
+    """
+    
+    def __init__(self, name, output=None, **params):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            name (str): نام اندیکاتور در INDICATORS
+            output (str): نام خروجی برای اندیکاتورهای چند خروجی
+            **params: پارامترهای تابع اندیکاتور
+        """
+        if name not in INDICATORS:
+            raise ValueError(f"اندیکاتور ناشناخته: {name}")
+        outputs = INDICATORS[name].outputs
+        if (output is None) != (outputs is None) or (outputs is not None and output not in outputs):
+            raise ValueError(f"خروجی نامعتبر برای اندیکاتور {name}: {output}")
+        self.name = name
+        self.output = output
+        self.params = params
+    
+    @property
+    def key(self):
+        """کلید یکتای محاسبه (بدون در نظر گرفتن خروجی)"""
+        return (self.name, tuple(sorted(self.params.items())))
+    
+    @property
+    def base_column(self):
+        params = ','.join(f'{key}={value}' for key, value in sorted(self.params.items()))
+        return f'{self.name}({params})'
+    
+    @property
+    def column(self):
+        """نام ستون اندیکاتور در جدول مشترک اندیکاتورها"""
+        if self.output is None:
+            return self.base_column
+        return f'{self.base_column}.{self.output}'
+    
+    @property
+    def warmup(self):
+        """تعداد کندل‌های لازم برای معتبر شدن مقدار اندیکاتور"""
+        return INDICATORS[self.name].warmup(**self.params)
+    
+    def compute(self, data):
+        """
+        محاسبه همه خروجی‌های اندیکاتور
+        
+        خروجی:
+            dict: {نام ستون: Series}
+        """
+        definition = INDICATORS[self.name]
+        result = definition.function(data, **self.params)
+        if definition.outputs is None:
+            return {self.base_column: result}
+        return {f'{self.base_column}.{output}': series for output, series in zip(definition.outputs, result)}
+    
+    def __eq__(self, other):
+        return isinstance(other, IndicatorSpec) and self.key == other.key and self.output == other.output
+    
+    def __hash__(self):
+        return hash((self.key, self.output))
+    
+    def __repr__(self):
+        return f'IndicatorSpec({self.column})'
+
+def build_indicator_frame(data, specs):
+    """
+    محاسبه اجتماع اندیکاتورهای مورد نیاز، هر کدام فقط یک بار
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        specs (iterable): لیست IndicatorSpec
+    
+    خروجی:
+        DataFrame: یک ستون برای هر خروجی اندیکاتور (هم‌ایندکس با داده‌ها)
+    """
+    columns = {}
+    computed = set()
+    for spec in specs:
+        if spec.key in computed:
+            continue
+        computed.add(spec.key)
+        columns.update(spec.compute(data))
+    return pd.DataFrame(columns, index=data.index)
+
+class Strategy:
+    """
+    کلاس پایه استراتژی‌ها
+    
+    زیرکلاس‌ها باید indicators() و generate_signals() را پیاده‌سازی کنند و در صورت
+    نیاز name، output_columns، extra_lookback و lookahead را تعیین کنند.
+    پارامترهای استراتژی همان آرگومان‌های سازنده هستند که به صورت ویژگی ذخیره می‌شوند.
+    """
+    
+    # نام نمایشی استراتژی
+    name = ''
+    
+    # ستون‌های جدول سیگنال خروجی
+    output_columns = ['Date', 'Price', 'Signal']
+    
+    # کندل‌های گذشته مورد نیاز قوانین استراتژی علاوه بر گرم شدن اندیکاتورها
+    extra_lookback = 0
+    
+    # تعداد کندل‌های آینده‌ای که تأیید سیگنال به آن‌ها وابسته است
+    lookahead = 0
+    
+    @classmethod
+    def param_names(cls):
+        """نام پارامترهای استراتژی (آرگومان‌های سازنده)"""
+        signature = inspect.signature(cls.__init__)
+        return [name for name, param in signature.parameters.items()
+                if name != 'self' and param.kind not in (param.VAR_POSITIONAL, param.VAR_KEYWORD)]
+    
+    def get_params(self):
+        """
+        پارامترهای فعلی استراتژی
+        
+        خروجی:
+            dict: {نام پارامتر: مقدار}
+        """
+        return {name: getattr(self, name) for name in self.param_names()}
+    
+    def set_params(self, **params):
+        """تغییر پارامترهای استراتژی"""
+        valid = set(self.param_names())
+        for name, value in params.items():
+            if name not in valid:
+                raise ValueError(f"پارامتر ناشناخته برای {type(self).__name__}: {name}")
+            setattr(self, name, value)
+        return self
+    
+    def indicators(self):
+        """
+        اندیکاتورهای مورد نیاز استراتژی
+        
+        خروجی:
+            dict: {نام نقش در استراتژی: IndicatorSpec}
+        """
+        return {}
+    
+    @property
+    def lookback(self):
+        """تعداد کندل‌های گذشته لازم برای تولید اولین سیگنال معتبر"""
+        warmups = [spec.warmup for spec in self.indicators().values()]
+        return max(warmups, default=0) + self.extra_lookback
+    
+    def history_start(self, data, start):
+        """
+        شماره اولین کندلی که برای تولید دوباره سیگنال‌های کندل start به بعد لازم است
+        
+        اجرای تکه‌ای و افزایشی فقط کندل‌های از این شماره به بعد را نگه می‌دارد.
+        پیش‌فرض lookback کندل قبل از start است؛ استراتژی‌هایی که سیگنالشان به
+        ساختارهای قبلی (مثلاً ابتدای جلسه معاملاتی یا اکسترمم قبلی) وابسته است
+        این متد را بازنویسی می‌کنند.
+        
+        پارامترها:
+            data (DataFrame): داده‌های قیمت موجود
+            start (int): شماره اولین کندلی که سیگنال آن هنوز تولید نشده است
+        
+        خروجی:
+            int: شماره کندل در data
+        """
+        return max(0, start - self.lookback)
+    
+    def compute_indicators(self, data, frame=None):
+        """
+        محاسبه یا استخراج اندیکاتورهای مورد نیاز
+        
+        پارامترها:
+            data (DataFrame): داده‌های قیمت
+            frame (DataFrame): جدول مشترک اندیکاتورها (اختیاری)
+        
+        خروجی:
+            dict: {نام نقش: Series}
+        """
+        specs = self.indicators()
+        if frame is None:
+            frame = build_indicator_frame(data, specs.values())
+        return {role: frame[spec.column] for role, spec in specs.items()}
+    
+    def generate_signals(self, data, indicators):
+        """
+        تولید سیگنال‌ها از داده‌ها و اندیکاتورهای محاسبه شده
+        
+        data ممکن است نمای فقط خواندنی داده‌های اصلی باشد (بدون کپی)؛ مقادیر میانی
+        باید در آرایه‌های محلی نگهداری شوند نه در ستون‌های جدید data.
+        
+        خروجی:
+            list | DataFrame: سیگنال‌های خرید و فروش
+        """
+        raise NotImplementedError
+    
+    def run(self, data, indicators=None):
+        """
+        اجرای استراتژی روی داده‌ها
+        
+        پارامترها:
+            data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای از پیش محاسبه شده (اختیاری)
+        
+        خروجی:
+            DataFrame: سیگنال‌های خرید و فروش با ستون‌های output_columns
+        """
+        if indicators is None:
+            indicators = self.compute_indicators(data)
+        signals = self.generate_signals(data, indicators)
+        if isinstance(signals, pd.DataFrame):
+            return signals.reindex(columns=self.output_columns)
+        return pd.DataFrame(signals, columns=self.output_columns)
+    
+    def __repr__(self):
+        params = ', '.join(f'{name}={value!r}' for name, value in self.get_params().items())
+        return f'{type(self).__name__}({params})'
\ No newline at end of file
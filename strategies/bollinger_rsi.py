@@ -3,11 +3,10 @@
 استراتژی ترکیبی باندهای بولینگر و RSI
 """
 
-import pandas as pd
-import numpy as np
-from utils.indicators import calculate_rsi, calculate_bollinger_bands
+from strategies.base import Strategy, IndicatorSpec
+from utils.signals import gather_signals
 
-class Bollinger_RSI_Strategy:
+class Bollinger_RSI_Strategy(Strategy):
     """
     استراتژی ترکیبی باندهای بولینگر و RSI
     
@@ -16,6 +15,9 @@ class Bollinger_RSI_Strategy:
     - فروش: هنگامی که قیمت به باند بالای بولینگر نزدیک می‌شود و RSI بالای 70 است
     """
     
+    name = "بولینگر باند + RSI"
+    output_columns = ['Date', 'Price', 'Signal', 'RSI', 'BB_Lower', 'BB_Upper']
+    
     def __init__(self, bb_period=20, bb_std=2, rsi_period=14, rsi_buy=30, rsi_sell=70):
         """
         مقداردهی اولیه
@@ -33,55 +35,45 @@ class Bollinger_RSI_Strategy:
         self.rsi_buy = rsi_buy
         self.rsi_sell = rsi_sell
     
-    def run(self, data):
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        return {
+            'RSI': IndicatorSpec('rsi', period=self.rsi_period),
+            'BB_Upper': IndicatorSpec('bollinger', output='upper', period=self.bb_period, std_dev=self.bb_std),
+            'BB_Lower': IndicatorSpec('bollinger', output='lower', period=self.bb_period, std_dev=self.bb_std)
+        }
+    
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
             DataFrame: سیگنال‌های خرید و فروش
         """
-        # محاسبه شاخص‌ها
-        data['RSI'] = calculate_rsi(data, self.rsi_period)
-        mid_band, upper_band, lower_band = calculate_bollinger_bands(data, self.bb_period, self.bb_std)
-        data['BB_Middle'] = mid_band
-        data['BB_Upper'] = upper_band
-        data['BB_Lower'] = lower_band
+        rsi = indicators['RSI']
+        upper_band = indicators['BB_Upper']
+        lower_band = indicators['BB_Lower']
+        close = data['Close'].to_numpy()
+        upper = upper_band.to_numpy()
+        lower = lower_band.to_numpy()
         
         # محاسبه فاصله از باندها (به صورت درصد)
-        data['Price_to_Lower'] = (data['Close'] - data['BB_Lower']) / data['BB_Lower'] * 100
-        data['Price_to_Upper'] = (data['BB_Upper'] - data['Close']) / data['Close'] * 100
+        price_to_lower = (close - lower) / lower * 100
+        price_to_upper = (upper - close) / close * 100
         
         # شناسایی الگوهای شمعی
-        data['Bullish_Candle'] = data['Close'] > data['Open']
-        data['Bearish_Candle'] = data['Close'] < data['Open']
+        bullish_candle = close > data['Open'].to_numpy()
+        bearish_candle = close < data['Open'].to_numpy()
         
-        # شناسایی سیگنال‌های خرید و فروش
-        signals = []
+        # شرط خرید: قیمت نزدیک باند پایین و RSI زیر 30 و شمع صعودی
+        buy = (price_to_lower < 1.0) & (rsi.to_numpy() < self.rsi_buy) & bullish_candle
         
-        for i in range(1, len(data)):
-            # شرط خرید: قیمت نزدیک باند پایین و RSI زیر 30 و شمع صعودی
-            if (data['Price_to_Lower'].iloc[i] < 1.0) and (data['RSI'].iloc[i] < self.rsi_buy) and (data['Bullish_Candle'].iloc[i]):
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': 1,  # 1 برای خرید
-                    'RSI': data['RSI'].iloc[i],
-                    'BB_Lower': data['BB_Lower'].iloc[i],
-                    'BB_Upper': data['BB_Upper'].iloc[i]
-                })
-            
-            # شرط فروش: قیمت نزدیک باند بالا و RSI بالای 70 و شمع نزولی
-            elif (data['Price_to_Upper'].iloc[i] < 1.0) and (data['RSI'].iloc[i] > self.rsi_sell) and (data['Bearish_Candle'].iloc[i]):
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': -1,  # -1 برای فروش
-                    'RSI': data['RSI'].iloc[i],
-                    'BB_Lower': data['BB_Lower'].iloc[i],
-                    'BB_Upper': data['BB_Upper'].iloc[i]
-                })
+        # شرط فروش: قیمت نزدیک باند بالا و RSI بالای 70 و شمع نزولی
+        sell = (price_to_upper < 1.0) & (rsi.to_numpy() > self.rsi_sell) & bearish_candle
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        return gather_signals(data, buy, sell, {'RSI': rsi, 'BB_Lower': lower_band, 'BB_Upper': upper_band},
+                              start=1)
\ No newline at end of file
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+اجرای تکه‌ای (خارج از حافظه) استراتژی‌ها روی داده‌های بزرگ‌تر از حافظه
+
+داده‌ها به صورت تکه‌های متوالی وارد می‌شوند. برای هر استراتژی فقط کندل‌هایی که
+برای سیگنال‌های آینده لازم است (Strategy.history_start) نگه داشته می‌شود و هر تکه
+همراه با این تاریخچه اجرا می‌شود. سیگنال کندل‌هایی که هنوز به کندل‌های آینده
+وابسته‌اند (lookahead) تا رسیدن تکه بعدی نگه داشته می‌شوند؛ بنابراین هر سیگنال
+دقیقاً یک بار و همان‌طور که در اجرای کامل تولید می‌شود اعلام می‌شود. اندیکاتورهای
+بازگشتی (EMA و وایلدر) مانند StrategyEngine.slice_history در طول تاریخچه نگه داشته
+شده (RECURSIVE_WARMUP برابر دوره) گرم می‌شوند؛ بنابراین مقدار آن‌ها در ستون‌های
+خروجی با اجرای کامل حداکثر در حد 1e-5 نسبی تفاوت دارد.
+
+مثال:
+    for bars, signals in run_chunked('csv/EURUSD_M1.csv', strategies):
+        signals.to_csv(report, header=False, index=False)
+"""
+
+import pandas as pd
+
+from strategies.engine import merge_signals
+from utils.data_loader import iter_csv_chunks, CHUNK_ROWS
+from utils.risk_management import calculate_risk_reward
+from utils.shared_data import read_only_view
+
+# کندل‌های قبلی نگه داشته شده برای محاسبه ATR مدیریت ریسک
+RISK_HISTORY = 100
+
+class ChunkedRunner:
+    """
+    اجرای افزایشی یک استراتژی روی تکه‌های متوالی داده‌ها
+    
+    مثال:
+        runner = ChunkedRunner(strategy)
+        for chunk in chunks:
+            new_signals = runner.update(chunk)
+        new_signals = runner.finish()
+    """
+    
+    def __init__(self, strategy):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            strategy (Strategy): استراتژی
+        """
+        self.strategy = strategy
+        self.history = None
+        # شماره سراسری اولین کندل تاریخچه و اولین کندلی که سیگنال آن اعلام نشده است
+        self.offset = 0
+        self.emitted = 0
+    
+    @property
+    def bars(self):
+        """تعداد کل کندل‌های دریافت شده"""
+        return self.offset + (0 if self.history is None else len(self.history))
+    
+    def _empty(self):
+        return pd.DataFrame(columns=self.strategy.output_columns)
+    
+    def update(self, chunk, final=False):
+        """
+        افزودن کندل‌های جدید و دریافت سیگنال‌های قطعی شده
+        
+        پارامترها:
+            chunk (DataFrame): کندل‌های جدید (ادامه کندل‌های قبلی به ترتیب زمان)
+            final (bool): آخرین تکه؛ سیگنال کندل‌های انتهایی نیز اعلام می‌شود
+        
+        خروجی:
+            DataFrame: سیگنال‌های جدید به ترتیب زمان
+        """
+        if self.history is None:
+            window = chunk.reset_index(drop=True)
+        elif len(chunk):
+            window = pd.concat([self.history, chunk], ignore_index=True)
+        else:
+            window = self.history
+        self.history = window
+        if window.empty:
+            return self._empty()
+        
+        total = self.offset + len(window)
+        end = total if final else total - self.strategy.lookahead
+        if end <= self.emitted:
+            return self._empty()
+        
+        signals = self.strategy.run(read_only_view(window))
+        if not signals.empty:
+            # فقط سیگنال کندل‌های [emitted, end)
+            positions = self.offset + window['Date'].searchsorted(signals['Date'])
+            keep = (positions >= self.emitted) & (positions < end)
+            signals = signals[keep].sort_values('Date', kind='stable').reset_index(drop=True)
+        
+        # نگه داشتن فقط تاریخچه لازم برای سیگنال‌های بعدی
+        start = min(self.strategy.history_start(window, end - self.offset), end - self.offset)
+        self.history = window.iloc[start:].reset_index(drop=True)
+        self.offset += start
+        self.emitted = end
+        return signals
+    
+    def finish(self):
+        """اعلام سیگنال‌های باقیمانده در پایان داده‌ها"""
+        if self.history is None:
+            return self._empty()
+        return self.update(self.history.iloc[:0], final=True)
+
+def run_chunked(chunks, strategies, risk_reward=True, chunk_rows=CHUNK_ROWS, float32=False, risk_options=None):
+    """
+    اجرای تکه‌ای چند استراتژی و اعلام سیگنال‌ها پس از هر تکه
+    
+    پارامترها:
+        chunks (str | iterable): مسیر فایل CSV یا تکه‌های متوالی داده‌ها (DataFrame)
+        strategies (dict): {نام: استراتژی}
+        risk_reward (bool): محاسبه حد ضرر و حد سود
+        chunk_rows (int): تعداد سطرهای هر تکه هنگام خواندن از فایل
+        float32 (bool): ذخیره قیمت‌ها به صورت float32 هنگام خواندن از فایل
+        risk_options (dict): پارامترهای calculate_risk_reward (روش حد ضرر، ضریب ATR و ...)
+    
+    خروجی:
+        generator: (تعداد کندل‌های خوانده شده، DataFrame سیگنال‌های جدید ادغام شده)
+    """
+    if isinstance(chunks, str):
+        chunks = iter_csv_chunks(chunks, chunk_rows, float32)
+    runners = {name: ChunkedRunner(strategy) for name, strategy in strategies.items()}
+    risk_options = risk_options or {}
+    # کندل‌های اخیر برای ATR، کف و سقف حد ضرر و قیمت سیگنال‌هایی که با تأخیر lookahead اعلام می‌شوند
+    keep = (max(RISK_HISTORY, risk_options.get('atr_period', 0), risk_options.get('swing_lookback', 0))
+            + max((strategy.lookahead for strategy in strategies.values()), default=0))
+    market = None
+    bars = 0
+    
+    def emit(results):
+        signals = merge_signals(results)
+        if risk_reward and not signals.empty:
+            signals = calculate_risk_reward(signals, market, **risk_options)
+        return signals
+    
+    for chunk in chunks:
+        bars += len(chunk)
+        market = chunk if market is None else pd.concat([market.iloc[-keep:], chunk], ignore_index=True)
+        yield bars, emit({name: runner.update(chunk) for name, runner in runners.items()})
+    
+    if market is not None:
+        yield bars, emit({name: runner.finish() for name, runner in runners.items()})
@@ -3,11 +3,11 @@
 استراتژی واگرایی RSI
 """
 
-import pandas as pd
 import numpy as np
-from utils.indicators import calculate_rsi, calculate_bollinger_bands, detect_divergence
+from strategies.base import Strategy, IndicatorSpec
+from utils.indicators import strict_extrema
 
-class Divergence_Strategy:
+class Divergence_Strategy(Strategy):
     """
     استراتژی واگرایی RSI
     
@@ -16,6 +16,15 @@ class Divergence_Strategy:
     - واگرایی منفی: قیمت اوج‌های بالاتری می‌سازد اما RSI اوج‌های پایین‌تری می‌سازد
     """
     
+    name = "واگرایی"
+    output_columns = ['Date', 'Price', 'Signal', 'RSI', 'Divergence']
+    
+    # شناسایی اکسترمم‌ها به 5 کندل بعدی نیاز دارد
+    lookahead = 5
+    
+    # تقریبی: برای در بر گرفتن اکسترمم‌های قبلی جهت مقایسه
+    extra_lookback = 100
+    
     def __init__(self, rsi_period=14, window=10, bb_period=20, bb_std=2):
         """
         مقداردهی اولیه
@@ -31,54 +40,84 @@ class Divergence_Strategy:
         self.bb_period = bb_period
         self.bb_std = bb_std
     
-    def find_extrema(self, data, column, window=5):
+    def find_extrema(self, values, window=5):
         """
         شناسایی نقاط اکسترمم (اوج‌ها و حضیض‌ها)
         
         پارامترها:
-            data (DataFrame): داده‌ها
-            column (str): نام ستون برای بررسی
+            values (Series | ndarray): مقادیر برای بررسی
             window (int): اندازه پنجره برای شناسایی نقاط اکسترمم
             
         خروجی:
-            tuple: (highs, lows)
+            tuple: (highs, lows) به صورت لیست (شماره کندل، مقدار)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        high_idx, low_idx = strict_extrema(values, window)
+        highs = list(zip(high_idx.tolist(), values[high_idx]))
+        lows = list(zip(low_idx.tolist(), values[low_idx]))
+        return highs, lows
+    
+    def nearest_extremum(self, indices, position):
         """
-        highs = []
-        lows = []
+        نزدیک‌ترین اکسترمم در فاصله window از یک کندل
         
-        for i in range(window, len(data) - window):
-            # بررسی آیا نقطه i یک اوج است
-            if all(data[column].iloc[i] > data[column].iloc[i-j] for j in range(1, window+1)) and \
-               all(data[column].iloc[i] > data[column].iloc[i+j] for j in range(1, window+1)):
-                highs.append((i, data[column].iloc[i]))
+        پارامترها:
+            indices (ndarray): شماره اکسترمم‌ها (صعودی)
+            position (int): شماره کندل
             
-            # بررسی آیا نقطه i یک حضیض است
-            if all(data[column].iloc[i] < data[column].iloc[i-j] for j in range(1, window+1)) and \
-               all(data[column].iloc[i] < data[column].iloc[i+j] for j in range(1, window+1)):
-                lows.append((i, data[column].iloc[i]))
-        
-        return highs, lows
+        خروجی:
+            int: شماره نزدیک‌ترین اکسترمم (در تساوی فاصله، قبلی) یا None
+        """
+        left = np.searchsorted(indices, position - self.window, side='left')
+        right = np.searchsorted(indices, position + self.window, side='right')
+        if left == right:
+            return None
+        candidates = indices[left:right]
+        return int(candidates[np.argmin(np.abs(candidates - position))])
+    
+    def history_start(self, data, start):
+        """
+        واگرایی هر اکسترمم با اکسترمم قبلی هم‌نوع آن مقایسه می‌شود؛ بنابراین آخرین اوج
+        و حضیض قبل از start و همسایه‌های RSI آن‌ها نیز لازم است
+        """
+        close = data['Close'].to_numpy(dtype=np.float64)[:start + 5]
+        positions = [start]
+        for indices in strict_extrema(close):
+            previous = indices[indices < start]
+            if len(previous):
+                positions.append(int(previous[-1]))
+        # اکسترمم‌های RSI در فاصله window و 5 کندل همسایه آن‌ها
+        return super().history_start(data, max(0, min(positions) - self.window - 5))
+    
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        return {
+            'RSI': IndicatorSpec('rsi', period=self.rsi_period),
+            'BB_Upper': IndicatorSpec('bollinger', output='upper', period=self.bb_period, std_dev=self.bb_std),
+            'BB_Lower': IndicatorSpec('bollinger', output='lower', period=self.bb_period, std_dev=self.bb_std)
+        }
     
-    def run(self, data):
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
-            DataFrame: سیگنال‌های خرید و فروش
+            list: سیگنال‌های خرید و فروش
         """
-        # محاسبه شاخص‌ها
-        data['RSI'] = calculate_rsi(data, self.rsi_period)
-        mid_band, upper_band, lower_band = calculate_bollinger_bands(data, self.bb_period, self.bb_std)
-        data['BB_Middle'] = mid_band
-        data['BB_Upper'] = upper_band
-        data['BB_Lower'] = lower_band
+        # مقادیر به صورت آرایه‌های محلی؛ داده‌های ورودی تغییر نمی‌کنند
+        close = data['Close'].to_numpy(dtype=np.float64)
+        rsi = np.asarray(indicators['RSI'], dtype=np.float64)
+        bb_upper = np.asarray(indicators['BB_Upper'], dtype=np.float64)
+        bb_lower = np.asarray(indicators['BB_Lower'], dtype=np.float64)
+        dates = data['Date']
         
         # شناسایی اوج‌ها و حضیض‌های قیمت و RSI
-        price_highs, price_lows = self.find_extrema(data, 'Close')
-        rsi_highs, rsi_lows = self.find_extrema(data, 'RSI')
+        price_highs, price_lows = self.find_extrema(close)
+        rsi_highs, rsi_lows = strict_extrema(rsi)
         
         signals = []
         
@@ -91,28 +130,24 @@ class Divergence_Strategy:
             # بررسی آیا حضیض دوم قیمت پایین‌تر است
             if price_low2 < price_low1:
                 # پیدا کردن حضیض‌های RSI در محدوده زمانی مشابه
-                rsi_indices = [idx for idx, _ in rsi_lows if price_idx1 - self.window <= idx <= price_idx1 + self.window]
-                if not rsi_indices:
+                rsi_idx1 = self.nearest_extremum(rsi_lows, price_idx1)
+                if rsi_idx1 is None:
                     continue
                 
-                rsi_idx1 = min(rsi_indices, key=lambda x: abs(x - price_idx1))
-                
-                rsi_indices = [idx for idx, _ in rsi_lows if price_idx2 - self.window <= idx <= price_idx2 + self.window]
-                if not rsi_indices:
+                rsi_idx2 = self.nearest_extremum(rsi_lows, price_idx2)
+                if rsi_idx2 is None:
                     continue
                 
-                rsi_idx2 = min(rsi_indices, key=lambda x: abs(x - price_idx2))
-                
                 # آیا حضیض دوم RSI بالاتر است؟
-                if data['RSI'].iloc[rsi_idx2] > data['RSI'].iloc[rsi_idx1]:
+                if rsi[rsi_idx2] > rsi[rsi_idx1]:
                     # واگرایی مثبت
                     # تأیید با باندهای بولینگر (قیمت نزدیک باند پایین)
-                    if data['Close'].iloc[price_idx2] < data['BB_Lower'].iloc[price_idx2] * 1.01:
+                    if close[price_idx2] < bb_lower[price_idx2] * 1.01:
                         signals.append({
-                            'Date': data['Date'].iloc[price_idx2],
-                            'Price': data['Close'].iloc[price_idx2],
+                            'Date': dates.iloc[price_idx2],
+                            'Price': close[price_idx2],
                             'Signal': 1,  # 1 برای خرید
-                            'RSI': data['RSI'].iloc[price_idx2],
+                            'RSI': rsi[price_idx2],
                             'Divergence': 'Positive'
                         })
         
@@ -125,29 +160,25 @@ class Divergence_Strategy:
             # بررسی آیا اوج دوم قیمت بالاتر است
             if price_high2 > price_high1:
                 # پیدا کردن اوج‌های RSI در محدوده زمانی مشابه
-                rsi_indices = [idx for idx, _ in rsi_highs if price_idx1 - self.window <= idx <= price_idx1 + self.window]
-                if not rsi_indices:
+                rsi_idx1 = self.nearest_extremum(rsi_highs, price_idx1)
+                if rsi_idx1 is None:
                     continue
                 
-                rsi_idx1 = min(rsi_indices, key=lambda x: abs(x - price_idx1))
-                
-                rsi_indices = [idx for idx, _ in rsi_highs if price_idx2 - self.window <= idx <= price_idx2 + self.window]
-                if not rsi_indices:
+                rsi_idx2 = self.nearest_extremum(rsi_highs, price_idx2)
+                if rsi_idx2 is None:
                     continue
                 
-                rsi_idx2 = min(rsi_indices, key=lambda x: abs(x - price_idx2))
-                
                 # آیا اوج دوم RSI پایین‌تر است؟
-                if data['RSI'].iloc[rsi_idx2] < data['RSI'].iloc[rsi_idx1]:
+                if rsi[rsi_idx2] < rsi[rsi_idx1]:
                     # واگرایی منفی
                     # تأیید با باندهای بولینگر (قیمت نزدیک باند بالا)
-                    if data['Close'].iloc[price_idx2] > data['BB_Upper'].iloc[price_idx2] * 0.99:
+                    if close[price_idx2] > bb_upper[price_idx2] * 0.99:
                         signals.append({
-                            'Date': data['Date'].iloc[price_idx2],
-                            'Price': data['Close'].iloc[price_idx2],
+                            'Date': dates.iloc[price_idx2],
+                            'Price': close[price_idx2],
                             'Signal': -1,  # -1 برای فروش
-                            'RSI': data['RSI'].iloc[price_idx2],
+                            'RSI': rsi[price_idx2],
                             'Divergence': 'Negative'
                         })
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        return signals
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+موتور اجرای چند استراتژی روی یک جدول مشترک اندیکاتورها
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, CancelledError, wait, FIRST_COMPLETED
+
+import pandas as pd
+
+from strategies.base import build_indicator_frame
+from utils.shared_data import SharedFrame, attach_shared_frame, read_only_view
+
+def _timed_run(name, strategy, data):
+    """
+    اجرای یک استراتژی و اندازه‌گیری زمان آن
+    
+    خروجی:
+        tuple: (نام، سیگنال‌ها، زمان اجرا بر حسب ثانیه، پیام خطا یا None)
+    """
+    start = time.perf_counter()
+    try:
+        signals = strategy.run(read_only_view(data))
+        error = None
+    except Exception as e:
+        signals = None
+        error = str(e)
+    return name, signals, time.perf_counter() - start, error
+
+def _run_shared_task(spec, name, strategy):
+    """وظیفه پردازه کاری: اجرای استراتژی روی داده‌های حافظه مشترک"""
+    return _timed_run(name, strategy, attach_shared_frame(spec))
+
+def merge_signals(results):
+    """
+    ادغام سیگنال‌های چند استراتژی در یک جدول
+    
+    پارامترها:
+        results (dict): {نام استراتژی: DataFrame سیگنال‌ها}
+    
+    خروجی:
+        DataFrame: سیگنال‌ها به ترتیب تاریخ با ستون Strategy
+    """
+    tables = [signals.assign(Strategy=name) for name, signals in results.items()
+              if signals is not None and not signals.empty]
+    if not tables:
+        return pd.DataFrame(columns=['Strategy', 'Date', 'Price', 'Signal'])
+    merged = pd.concat(tables, ignore_index=True)
+    columns = ['Strategy'] + [column for column in merged.columns if column != 'Strategy']
+    return merged[columns].sort_values('Date', kind='stable').reset_index(drop=True)
+
+def run_strategies_parallel(data, strategies, max_workers=None, progress=None, cancel_event=None):
+    """
+    اجرای همزمان چند استراتژی روی یک داده در پردازه‌های جداگانه
+    
+    ستون‌های قیمت یک بار در حافظه مشترک قرار می‌گیرند و هر پردازه کاری بدون
+    دریافت کپی داده‌ها به آن متصل می‌شود. خطای یک استراتژی اجرای بقیه را متوقف
+    نمی‌کند و در جدول زمان‌بندی گزارش می‌شود.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        strategies (dict): {نام: استراتژی}
+        max_workers (int): تعداد پردازه‌ها (پیش‌فرض: تعداد هسته‌ها)
+        progress (callable): تابع progress(انجام شده، کل) برای گزارش پیشرفت
+        cancel_event (threading.Event): با set شدن، استراتژی‌های شروع نشده لغو
+            می‌شوند و CancelledError رخ می‌دهد
+    
+    خروجی:
+        tuple: (DataFrame سیگنال‌های ادغام شده، DataFrame زمان اجرای هر استراتژی)
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(strategies)))
+    
+    def cancelled():
+        return cancel_event is not None and cancel_event.is_set()
+    
+    started = time.perf_counter()
+    outcomes = {}
+    if max_workers == 1:
+        for name, strategy in strategies.items():
+            if cancelled():
+                raise CancelledError()
+            outcomes[name] = _timed_run(name, strategy, data)
+            if progress is not None:
+                progress(len(outcomes), len(strategies))
+    else:
+        with SharedFrame(data) as shared, ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(_run_shared_task, shared.spec, name, strategy)
+                       for name, strategy in strategies.items()}
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcome = future.result()
+                    outcomes[outcome[0]] = outcome
+                if progress is not None and done:
+                    progress(len(outcomes), len(strategies))
+                if pending and cancelled():
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise CancelledError()
+    # ترتیب خروجی مطابق ترتیب استراتژی‌ها
+    outcomes = [outcomes[name] for name in strategies]
+    elapsed = time.perf_counter() - started
+    
+    results = {name: signals for name, signals, _, _ in outcomes}
+    timings = pd.DataFrame([
+        {
+            'Strategy': name,
+            'Signals': 0 if signals is None else len(signals),
+            'Seconds': seconds,
+            'Error': error
+        }
+        for name, signals, seconds, error in outcomes
+    ])
+    timings.attrs['total_seconds'] = elapsed
+    
+    return merge_signals(results), timings
+
+class StrategyEngine:
+    """
+    اجرای چند استراتژی با محاسبه یک باره اندیکاتورها
+    
+    اجتماع اندیکاتورهای اعلام شده توسط استراتژی‌ها یک بار محاسبه می‌شود و همه
+    استراتژی‌ها از همان جدول اندیکاتور استفاده می‌کنند. در صورت تعیین `since` فقط
+    بخشی از تاریخچه که برای گرم شدن لازم است پردازش می‌شود.
+    """
+    
+    def __init__(self, strategies):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            strategies (dict | list): استراتژی‌ها ({نام: استراتژی} یا لیست)
+        """
+        if not isinstance(strategies, dict):
+            strategies = {strategy.name or type(strategy).__name__: strategy for strategy in strategies}
+        self.strategies = strategies
+    
+    def required_indicators(self):
+        """
+        اجتماع اندیکاتورهای مورد نیاز همه استراتژی‌ها
+        
+        خروجی:
+            list: لیست IndicatorSpec بدون تکرار
+        """
+        specs = {}
+        for strategy in self.strategies.values():
+            for spec in strategy.indicators().values():
+                specs.setdefault((spec.key, spec.output), spec)
+        return list(specs.values())
+    
+    @property
+    def lookback(self):
+        """بیشترین lookback بین استراتژی‌ها"""
+        return max((strategy.lookback for strategy in self.strategies.values()), default=0)
+    
+    def slice_history(self, data, since=None):
+        """
+        برش داده‌ها به کندل‌های لازم برای تولید سیگنال از تاریخ `since` به بعد
+        
+        پارامترها:
+            data (DataFrame): داده‌های قیمت
+            since: تاریخ شروع سیگنال‌ها (None برای کل داده‌ها)
+        
+        خروجی:
+            DataFrame: برش داده‌ها
+        """
+        if since is None:
+            return data
+        first = int(data['Date'].searchsorted(pd.Timestamp(since)))
+        start = min((strategy.history_start(data, first) for strategy in self.strategies.values()),
+                    default=first)
+        return data.iloc[start:]
+    
+    def build_indicator_frame(self, data):
+        """محاسبه جدول مشترک اندیکاتورها"""
+        return build_indicator_frame(data, self.required_indicators())
+    
+    def run(self, data, since=None):
+        """
+        اجرای همه استراتژی‌ها
+        
+        پارامترها:
+            data (DataFrame): داده‌های قیمت
+            since: فقط سیگنال‌های از این تاریخ به بعد (اختیاری)
+        
+        خروجی:
+            dict: {نام استراتژی: DataFrame سیگنال‌ها}
+        """
+        data = self.slice_history(data, since)
+        frame = self.build_indicator_frame(data)
+        
+        results = {}
+        for name, strategy in self.strategies.items():
+            indicators = strategy.compute_indicators(data, frame)
+            # نمای فقط خواندنی بدون کپی: ستون‌ها روی همان حافظه‌اند اما قابل نوشتن نیستند و
+            # نما DataFrame جداگانه‌ای است؛ بنابراین ستون‌های کمکی استراتژی به داده‌های مشترک
+            # (و استراتژی‌های بعدی) اضافه نمی‌شوند
+            signals = strategy.run(read_only_view(data), indicators)
+            if since is not None and not signals.empty:
+                signals = signals[signals['Date'] >= pd.Timestamp(since)].reset_index(drop=True)
+            results[name] = signals
+        
+        return results
+    
+    def run_parallel(self, data, max_workers=None):
+        """
+        اجرای همه استراتژی‌ها در پردازه‌های جداگانه
+        
+        خروجی:
+            tuple: (DataFrame سیگنال‌های ادغام شده، DataFrame زمان اجرای هر استراتژی)
+        """
+        return run_strategies_parallel(data, self.strategies, max_workers)
\ No newline at end of file
@@ -3,11 +3,11 @@
 استراتژی الگوهای هارمونیک
 """
 
-import pandas as pd
 import numpy as np
-from utils.indicators import calculate_rsi, fibonacci_levels
+from strategies.base import Strategy, IndicatorSpec
+from utils.indicators import strict_extrema
 
-class Harmonic_Patterns_Strategy:
+class Harmonic_Patterns_Strategy(Strategy):
     """
     استراتژی الگوهای هارمونیک
     
@@ -17,6 +17,16 @@ class Harmonic_Patterns_Strategy:
     - ورود در نقطه D
     """
     
+    name = "الگوهای هارمونیک"
+    output_columns = ['Date', 'Price', 'Signal', 'Pattern', 'RSI',
+                      'X_Price', 'A_Price', 'B_Price', 'C_Price', 'D_Price']
+    
+    # شناسایی نقاط چرخش به 5 کندل بعدی نیاز دارد
+    lookahead = 5
+    
+    # تقریبی: برای در بر گرفتن نقاط XABCD قبلی
+    extra_lookback = 100
+    
     def __init__(self, min_swing=10, tolerance=0.05, rsi_period=14):
         """
         مقداردهی اولیه
@@ -41,22 +51,26 @@ class Harmonic_Patterns_Strategy:
         خروجی:
             tuple: (swing_highs, swing_lows)
         """
-        swing_highs = []
-        swing_lows = []
-        
-        for i in range(window, len(data) - window):
-            # بررسی آیا کندل i یک نقطه چرخش بالا است
-            if all(data['High'].iloc[i] > data['High'].iloc[i-j] for j in range(1, window+1)) and \
-               all(data['High'].iloc[i] > data['High'].iloc[i+j] for j in range(1, window+1)):
-                swing_highs.append((i, data['High'].iloc[i]))
-            
-            # بررسی آیا کندل i یک نقطه چرخش پایین است
-            if all(data['Low'].iloc[i] < data['Low'].iloc[i-j] for j in range(1, window+1)) and \
-               all(data['Low'].iloc[i] < data['Low'].iloc[i+j] for j in range(1, window+1)):
-                swing_lows.append((i, data['Low'].iloc[i]))
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        high_idx, _ = strict_extrema(high, window)
+        _, low_idx = strict_extrema(low, window)
+        
+        swing_highs = list(zip(high_idx.tolist(), high[high_idx]))
+        swing_lows = list(zip(low_idx.tolist(), low[low_idx]))
         
         return swing_highs, swing_lows
     
+    def history_start(self, data, start):
+        """هر الگو از 5 نقطه چرخش متوالی تشکیل می‌شود؛ 4 نقطه قبل از start نیز لازم است"""
+        first = super().history_start(data, start)
+        swing_highs, swing_lows = self.find_swing_points(data.iloc[:start + 5])
+        previous = sorted(index for index, _ in swing_highs + swing_lows if index < start)
+        if len(previous) < 4:
+            return 0
+        # تشخیص نقطه چرخش به 5 کندل قبل از آن نیاز دارد
+        return min(first, max(0, previous[-4] - 5))
+    
     def check_gartley(self, points):
         """
         بررسی آیا نقاط داده شده الگوی Gartley را تشکیل می‌دهند
@@ -133,18 +147,27 @@ class Harmonic_Patterns_Strategy:
         
         return ab_check and bc_check and cd_check and xd_check
     
-    def run(self, data):
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        return {
+            'RSI': IndicatorSpec('rsi', period=self.rsi_period)
+        }
+    
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
-            DataFrame: سیگنال‌های خرید و فروش
+            list: سیگنال‌های خرید و فروش
         """
-        # محاسبه RSI برای تأیید
-        data['RSI'] = calculate_rsi(data, self.rsi_period)
+        # RSI برای تأیید (آرایه‌های محلی؛ داده‌های ورودی تغییر نمی‌کنند)
+        rsi = np.asarray(indicators['RSI'], dtype=np.float64)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        dates = data['Date']
         
         # شناسایی نقاط چرخش
         swing_highs, swing_lows = self.find_swing_points(data)
@@ -172,13 +195,13 @@ class Harmonic_Patterns_Strategy:
                 is_bullish = points[0][1] > points[4][1]  # اگر X بالاتر از D باشد، الگو صعودی است
                 
                 # تأیید با RSI
-                if (is_bullish and data['RSI'].iloc[d_idx] < 30) or (not is_bullish and data['RSI'].iloc[d_idx] > 70):
+                if (is_bullish and rsi[d_idx] < 30) or (not is_bullish and rsi[d_idx] > 70):
                     signals.append({
-                        'Date': data['Date'].iloc[d_idx],
-                        'Price': data['Close'].iloc[d_idx],
+                        'Date': dates.iloc[d_idx],
+                        'Price': close[d_idx],
                         'Signal': 1 if is_bullish else -1,
                         'Pattern': 'Gartley',
-                        'RSI': data['RSI'].iloc[d_idx],
+                        'RSI': rsi[d_idx],
                         'X_Price': points[0][1],
                         'A_Price': points[1][1],
                         'B_Price': points[2][1],
@@ -195,13 +218,13 @@ class Harmonic_Patterns_Strategy:
                 is_bullish = points[0][1] > points[4][1]  # اگر X بالاتر از D باشد، الگو صعودی است
                 
                 # تأیید با RSI
-                if (is_bullish and data['RSI'].iloc[d_idx] < 30) or (not is_bullish and data['RSI'].iloc[d_idx] > 70):
+                if (is_bullish and rsi[d_idx] < 30) or (not is_bullish and rsi[d_idx] > 70):
                     signals.append({
-                        'Date': data['Date'].iloc[d_idx],
-                        'Price': data['Close'].iloc[d_idx],
+                        'Date': dates.iloc[d_idx],
+                        'Price': close[d_idx],
                         'Signal': 1 if is_bullish else -1,
                         'Pattern': 'Butterfly',
-                        'RSI': data['RSI'].iloc[d_idx],
+                        'RSI': rsi[d_idx],
                         'X_Price': points[0][1],
                         'A_Price': points[1][1],
                         'B_Price': points[2][1],
@@ -209,4 +232,4 @@ class Harmonic_Patterns_Strategy:
                         'D_Price': points[4][1]
                     })
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        return signals
\ No newline at end of file
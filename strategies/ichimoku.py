@@ -3,11 +3,11 @@
 استراتژی ایچیموکو کلاود
 """
 
-import pandas as pd
 import numpy as np
-from utils.indicators import calculate_ichimoku
+from strategies.base import Strategy, IndicatorSpec
+from utils.signals import cross_above, cross_below, gather_signals
 
-class Ichimoku_Strategy:
+class Ichimoku_Strategy(Strategy):
     """
     استراتژی ایچیموکو کلاود
     
@@ -16,6 +16,9 @@ class Ichimoku_Strategy:
     - فروش: هنگامی که تنکان-سن از زیر کیجون-سن عبور می‌کند و قیمت زیر ابر است
     """
     
+    name = "ایچیموکو"
+    output_columns = ['Date', 'Price', 'Signal', 'Tenkan', 'Kijun', 'Cloud_Top', 'Cloud_Bottom']
+    
     def __init__(self, tenkan_period=9, kijun_period=26, senkou_b_period=52, displacement=26):
         """
         مقداردهی اولیه
@@ -31,72 +34,73 @@ class Ichimoku_Strategy:
         self.senkou_b_period = senkou_b_period
         self.displacement = displacement
     
-    def run(self, data):
+    @property
+    def extra_lookback(self):
+        # مقایسه چیکو با قیمت displacement کندل قبل
+        return self.displacement
+    
+    @property
+    def lookahead(self):
+        # چیکو اسپن قیمت displacement کندل بعد است
+        return self.displacement
+    
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        params = {
+            'tenkan_period': self.tenkan_period,
+            'kijun_period': self.kijun_period,
+            'senkou_b_period': self.senkou_b_period,
+            'displacement': self.displacement
+        }
+        return {
+            'Tenkan': IndicatorSpec('ichimoku', output='tenkan', **params),
+            'Kijun': IndicatorSpec('ichimoku', output='kijun', **params),
+            'Senkou_A': IndicatorSpec('ichimoku', output='senkou_a', **params),
+            'Senkou_B': IndicatorSpec('ichimoku', output='senkou_b', **params),
+            'Chikou': IndicatorSpec('ichimoku', output='chikou', **params)
+        }
+    
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
             DataFrame: سیگنال‌های خرید و فروش
         """
-        # محاسبه شاخص‌های ایچیموکو
-        tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span = calculate_ichimoku(
-            data, self.tenkan_period, self.kijun_period, self.senkou_b_period, self.displacement
-        )
-        
-        data['Tenkan'] = tenkan_sen
-        data['Kijun'] = kijun_sen
-        data['Senkou_A'] = senkou_span_a
-        data['Senkou_B'] = senkou_span_b
-        data['Chikou'] = chikou_span
+        tenkan = indicators['Tenkan']
+        kijun = indicators['Kijun']
+        senkou_a = indicators['Senkou_A'].to_numpy()
+        senkou_b = indicators['Senkou_B'].to_numpy()
+        chikou = indicators['Chikou'].to_numpy()
+        close = data['Close'].to_numpy()
         
         # تعیین وضعیت ابر
-        data['Cloud_Green'] = data['Senkou_A'] > data['Senkou_B']
-        data['Above_Cloud'] = (data['Close'] > data['Senkou_A']) & (data['Close'] > data['Senkou_B'])
-        data['Below_Cloud'] = (data['Close'] < data['Senkou_A']) & (data['Close'] < data['Senkou_B'])
-        data['In_Cloud'] = ~(data['Above_Cloud'] | data['Below_Cloud'])
+        above_cloud = (close > senkou_a) & (close > senkou_b)
+        below_cloud = (close < senkou_a) & (close < senkou_b)
         
-        # محاسبه کراس تنکان و کیجون
-        data['TK_Cross'] = np.nan
+        # کراس تنکان و کیجون
+        tk_cross_up = cross_above(tenkan, kijun)
+        tk_cross_down = cross_below(tenkan, kijun) & ~tk_cross_up
         
-        for i in range(1, len(data)):
-            if (data['Tenkan'].iloc[i-1] < data['Kijun'].iloc[i-1]) and (data['Tenkan'].iloc[i] >= data['Kijun'].iloc[i]):
-                data.loc[data.index[i], 'TK_Cross'] = 1  # کراس مثبت
-            elif (data['Tenkan'].iloc[i-1] > data['Kijun'].iloc[i-1]) and (data['Tenkan'].iloc[i] <= data['Kijun'].iloc[i]):
-                data.loc[data.index[i], 'TK_Cross'] = -1  # کراس منفی
+        # تأیید با چیکو اسپن: مقایسه با قیمت displacement کندل قبل
+        close_before = data['Close'].shift(self.displacement).to_numpy()
         
-        # شناسایی سیگنال‌های خرید و فروش
-        signals = []
+        # سیگنال خرید: کراس مثبت تنکان-کیجون، قیمت بالای ابر و چیکو بالای قیمت گذشته
+        buy = tk_cross_up & above_cloud & (chikou > close_before)
         
-        for i in range(self.displacement, len(data)):
-            # سیگنال خرید: کراس مثبت تنکان-کیجون و قیمت بالای ابر
-            if (data['TK_Cross'].iloc[i] == 1) and data['Above_Cloud'].iloc[i]:
-                # تأیید با چیکو اسپن
-                if i+self.displacement < len(data) and data['Chikou'].iloc[i] > data['Close'].iloc[i-self.displacement]:
-                    signals.append({
-                        'Date': data['Date'].iloc[i],
-                        'Price': data['Close'].iloc[i],
-                        'Signal': 1,  # 1 برای خرید
-                        'Tenkan': data['Tenkan'].iloc[i],
-                        'Kijun': data['Kijun'].iloc[i],
-                        'Cloud_Top': max(data['Senkou_A'].iloc[i], data['Senkou_B'].iloc[i]),
-                        'Cloud_Bottom': min(data['Senkou_A'].iloc[i], data['Senkou_B'].iloc[i])
-                    })
-            
-            # سیگنال فروش: کراس منفی تنکان-کیجون و قیمت زیر ابر
-            elif (data['TK_Cross'].iloc[i] == -1) and data['Below_Cloud'].iloc[i]:
-                # تأیید با چیکو اسپن
-                if i+self.displacement < len(data) and data['Chikou'].iloc[i] < data['Close'].iloc[i-self.displacement]:
-                    signals.append({
-                        'Date': data['Date'].iloc[i],
-                        'Price': data['Close'].iloc[i],
-                        'Signal': -1,  # -1 برای فروش
-                        'Tenkan': data['Tenkan'].iloc[i],
-                        'Kijun': data['Kijun'].iloc[i],
-                        'Cloud_Top': max(data['Senkou_A'].iloc[i], data['Senkou_B'].iloc[i]),
-                        'Cloud_Bottom': min(data['Senkou_A'].iloc[i], data['Senkou_B'].iloc[i])
-                    })
+        # سیگنال فروش: کراس منفی تنکان-کیجون، قیمت زیر ابر و چیکو زیر قیمت گذشته
+        sell = tk_cross_down & below_cloud & (chikou < close_before)
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        columns = {
+            'Tenkan': tenkan,
+            'Kijun': kijun,
+            'Cloud_Top': np.maximum(senkou_a, senkou_b),
+            'Cloud_Bottom': np.minimum(senkou_a, senkou_b)
+        }
+        # چیکو فقط برای کندل‌هایی که displacement کندل بعد از آن‌ها موجود است معتبر است
+        return gather_signals(data, buy, sell, columns,
+                              start=self.displacement, end=len(data) - self.displacement)
\ No newline at end of file
@@ -3,11 +3,10 @@
 استراتژی کراس مووینگ اوریج با فیلتر RSI
 """
 
-import pandas as pd
-import numpy as np
-from utils.indicators import calculate_ema, calculate_rsi
+from strategies.base import Strategy, IndicatorSpec
+from utils.signals import cross_above, cross_below, gather_signals
 
-class MA_Crossover_Strategy:
+class MA_Crossover_Strategy(Strategy):
     """
     استراتژی کراس مووینگ اوریج با فیلتر RSI
     
@@ -16,6 +15,10 @@ class MA_Crossover_Strategy:
     - فروش: هنگامی که EMA کوتاه‌مدت از پایین EMA بلندمدت عبور می‌کند و RSI زیر 50 است
     """
     
+    name = "کراس مووینگ اوریج"
+    output_columns = ['Date', 'Price', 'Signal', 'RSI', 'EMA_Short', 'EMA_Long']
+    extra_lookback = 1
+    
     def __init__(self, short_period=9, long_period=21, rsi_period=14):
         """
         مقداردهی اولیه
@@ -29,57 +32,39 @@ class MA_Crossover_Strategy:
         self.long_period = long_period
         self.rsi_period = rsi_period
     
-    def run(self, data):
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        return {
+            'EMA_Short': IndicatorSpec('ema', period=self.short_period),
+            'EMA_Long': IndicatorSpec('ema', period=self.long_period),
+            'RSI': IndicatorSpec('rsi', period=self.rsi_period)
+        }
+    
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
             DataFrame: سیگنال‌های خرید و فروش
         """
-        # محاسبه شاخص‌ها
-        data['EMA_Short'] = calculate_ema(data, self.short_period)
-        data['EMA_Long'] = calculate_ema(data, self.long_period)
-        data['RSI'] = calculate_rsi(data, self.rsi_period)
+        ema_short = indicators['EMA_Short']
+        ema_long = indicators['EMA_Long']
+        rsi = indicators['RSI'].to_numpy()
         
-        # شناسایی کراس‌ها
-        data['Cross'] = 0
+        # کراس صعودی (کوتاه‌مدت از پایین بلندمدت عبور می‌کند)
+        bullish_cross = cross_above(ema_short, ema_long, equal='before')
         
-        for i in range(1, len(data)):
-            # کراس صعودی (کوتاه‌مدت از پایین بلندمدت عبور می‌کند)
-            if (data['EMA_Short'].iloc[i-1] <= data['EMA_Long'].iloc[i-1]) and (data['EMA_Short'].iloc[i] > data['EMA_Long'].iloc[i]):
-                data.loc[data.index[i], 'Cross'] = 1
-            
-            # کراس نزولی (کوتاه‌مدت از بالای بلندمدت عبور می‌کند)
-            elif (data['EMA_Short'].iloc[i-1] >= data['EMA_Long'].iloc[i-1]) and (data['EMA_Short'].iloc[i] < data['EMA_Long'].iloc[i]):
-                data.loc[data.index[i], 'Cross'] = -1
+        # کراس نزولی (کوتاه‌مدت از بالای بلندمدت عبور می‌کند)
+        bearish_cross = cross_below(ema_short, ema_long, equal='before') & ~bullish_cross
         
-        # شناسایی سیگنال‌های خرید و فروش
-        signals = []
+        # سیگنال خرید: کراس صعودی و RSI بالای 50
+        buy = bullish_cross & (rsi > 50)
         
-        for i in range(1, len(data)):
-            # سیگنال خرید: کراس صعودی و RSI بالای 50
-            if (data['Cross'].iloc[i] == 1) and (data['RSI'].iloc[i] > 50):
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': 1,  # 1 برای خرید
-                    'RSI': data['RSI'].iloc[i],
-                    'EMA_Short': data['EMA_Short'].iloc[i],
-                    'EMA_Long': data['EMA_Long'].iloc[i]
-                })
-            
-            # سیگنال فروش: کراس نزولی و RSI زیر 50
-            elif (data['Cross'].iloc[i] == -1) and (data['RSI'].iloc[i] < 50):
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': -1,  # -1 برای فروش
-                    'RSI': data['RSI'].iloc[i],
-                    'EMA_Short': data['EMA_Short'].iloc[i],
-                    'EMA_Long': data['EMA_Long'].iloc[i]
-                })
+        # سیگنال فروش: کراس نزولی و RSI زیر 50
+        sell = bearish_cross & (rsi < 50)
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        return gather_signals(data, buy, sell, {'RSI': indicators['RSI'], 'EMA_Short': ema_short, 'EMA_Long': ema_long})
\ No newline at end of file
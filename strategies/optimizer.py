@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+بهینه‌سازی پارامترهای استراتژی‌ها با جستجوی شبکه‌ای یا تصادفی
+
+ترکیب‌های پارامتر بین پردازه‌های کاری تقسیم می‌شوند و داده‌های قیمت یک بار در
+حافظه مشترک قرار می‌گیرند. هر ترکیب با calculate_trading_metrics امتیازدهی می‌شود.
+"""
+
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from utils.risk_management import calculate_risk_reward, simulate_trades, calculate_trading_metrics
+from utils.shared_data import SharedFrame, attach_shared_frame, read_only_view
+
+def _grid_size(space):
+    return math.prod(len(values) for values in space.values())
+
+def _combination(space, index):
+    """ترکیب شماره index از شبکه پارامترها (ترتیب itertools.product)"""
+    params = {}
+    for name, values in reversed(list(space.items())):
+        index, position = divmod(index, len(values))
+        params[name] = values[position]
+    return {name: params[name] for name in space}
+
+def parameter_grid(space):
+    """
+    همه ترکیب‌های پارامترها
+    
+    پارامترها:
+        space (dict): {نام پارامتر: لیست مقادیر}
+    
+    خروجی:
+        list: لیست dict پارامترها
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+def random_parameters(space, n_iter, seed=None):
+    """
+    نمونه تصادفی و بدون تکرار از ترکیب‌های پارامترها
+    
+    ترکیب‌ها بدون ساختن کل شبکه از روی شماره آن‌ها ساخته می‌شوند؛ بنابراین فضای
+    جستجوی بسیار بزرگ هزینه حافظه ندارد.
+    
+    پارامترها:
+        space (dict): {نام پارامتر: لیست مقادیر}
+        n_iter (int): تعداد ترکیب‌ها
+        seed (int): بذر مولد اعداد تصادفی
+    
+    خروجی:
+        list: لیست dict پارامترها
+    """
+    space = {name: list(values) for name, values in space.items()}
+    total = _grid_size(space)
+    rng = np.random.default_rng(seed)
+    indices = rng.choice(total, size=min(n_iter, total), replace=False)
+    return [_combination(space, int(index)) for index in indices]
+
+def candidate_parameters(strategy_class, space, method='grid', n_iter=100, seed=0):
+    """
+    ترکیب‌های پارامتر مورد بررسی برای یک استراتژی
+    
+    پارامترها:
+        strategy_class (type): کلاس استراتژی
+        space (dict): {نام پارامتر: لیست مقادیر}
+        method (str): 'grid' یا 'random'
+        n_iter (int): تعداد ترکیب‌ها در جستجوی تصادفی
+        seed (int): بذر جستجوی تصادفی
+    
+    خروجی:
+        list: لیست dict پارامترها
+    """
+    unknown = set(space) - set(strategy_class.param_names())
+    if unknown:
+        raise ValueError(f"پارامتر ناشناخته برای {strategy_class.__name__}: {', '.join(sorted(unknown))}")
+    
+    if method == 'grid':
+        return parameter_grid(space)
+    if method == 'random':
+        return random_parameters(space, n_iter, seed=seed)
+    raise ValueError(f"روش نامعتبر: {method}")
+
+def score_signals(signals, data, initial_balance=10000, risk_percentage=1, risk_ratio=2, seed=0):
+    """
+    محاسبه معیارهای ارزیابی سیگنال‌ها
+    
+    شبیه‌سازی معاملات با بذر ثابت انجام می‌شود تا همه ترکیب‌ها شرایط یکسان داشته
+    باشند و نتیجه قابل تکرار باشد.
+    
+    پارامترها:
+        signals (DataFrame): سیگنال‌های استراتژی
+        data (DataFrame): داده‌های قیمت (برای محاسبه ATR)
+        initial_balance (float): موجودی اولیه حساب
+        risk_percentage (float): درصد ریسک برای هر معامله
+        risk_ratio (float): نسبت ریسک به ریوارد
+        seed (int): بذر شبیه‌سازی معاملات
+    
+    خروجی:
+        dict: معیارهای ارزیابی (به همراه final_balance و signals)
+    """
+    signals = calculate_risk_reward(signals, data, risk_ratio=risk_ratio)
+    np.random.seed(seed)
+    results, balance = simulate_trades(signals, initial_balance=initial_balance, risk_percentage=risk_percentage)
+    metrics = calculate_trading_metrics(results) if 'Result' in results.columns else {}
+    metrics['final_balance'] = balance
+    metrics['signals'] = len(signals)
+    return metrics
+
+def evaluate_parameters(data, strategy_class, params, **settings):
+    """
+    اجرای استراتژی با یک ترکیب پارامتر و محاسبه معیارهای ارزیابی
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        strategy_class (type): کلاس استراتژی
+        params (dict): پارامترهای سازنده استراتژی
+        **settings: تنظیمات score_signals
+    
+    خروجی:
+        dict: معیارهای ارزیابی
+    """
+    signals = strategy_class(**params).run(read_only_view(data))
+    return score_signals(signals, data, **settings)
+
+def _evaluate_batch(data, strategy_class, batch, settings):
+    """ارزیابی یک دسته از ترکیب‌ها (لیست (شماره، پارامترها))"""
+    rows = []
+    for number, params in batch:
+        start = time.perf_counter()
+        try:
+            row = evaluate_parameters(data, strategy_class, params, **settings)
+            row['error'] = None
+        except Exception as e:
+            row = {'error': str(e)}
+        row['seconds'] = time.perf_counter() - start
+        rows.append((number, params, row))
+    return rows
+
+def _evaluate_shared_batch(spec, strategy_class, batch, settings):
+    """وظیفه پردازه کاری: ارزیابی یک دسته روی داده‌های حافظه مشترک"""
+    return _evaluate_batch(attach_shared_frame(spec), strategy_class, batch, settings)
+
+def optimize_strategy(data, strategy_class, space, method='grid', n_iter=100, metric='total_profit',
+                      maximize=True, max_workers=None, batch_size=None, seed=0, progress=None, **settings):
+    """
+    جستجوی پارامترهای بهینه استراتژی
+    
+    ترکیب‌ها در دسته‌هایی بین پردازه‌ها پخش می‌شوند؛ هر پردازه کاری اندیکاتورهای
+    تکراری بین ترکیب‌های خود (مثلاً RSI یکسان) را از کش اندیکاتورها می‌خواند.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        strategy_class (type): کلاس استراتژی
+        space (dict): {نام پارامتر: لیست مقادیر}
+        method (str): 'grid' یا 'random'
+        n_iter (int): تعداد ترکیب‌ها در جستجوی تصادفی
+        metric (str): معیار رتبه‌بندی (کلید خروجی calculate_trading_metrics)
+        maximize (bool): بزرگ‌تر بودن معیار بهتر است
+        max_workers (int): تعداد پردازه‌ها (پیش‌فرض: تعداد هسته‌ها، 1 برای اجرای بدون پردازه)
+        batch_size (int): تعداد ترکیب‌های هر وظیفه
+        seed (int): بذر جستجوی تصادفی و شبیه‌سازی معاملات
+        progress (callable): تابع progress(انجام شده، کل) برای گزارش پیشرفت
+        **settings: initial_balance، risk_percentage و risk_ratio
+    
+    خروجی:
+        DataFrame: نتایج رتبه‌بندی شده (ستون‌های پارامتر، معیارها، seconds و error)
+    """
+    combinations = candidate_parameters(strategy_class, space, method, n_iter, seed)
+    settings['seed'] = seed
+    
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(combinations)))
+    if batch_size is None:
+        # چند دسته برای هر پردازه تا بار کاری متعادل بماند
+        batch_size = max(1, math.ceil(len(combinations) / (max_workers * 4)))
+    numbered = list(enumerate(combinations))
+    batches = [numbered[i:i + batch_size] for i in range(0, len(numbered), batch_size)]
+    
+    rows = []
+    if max_workers == 1:
+        for batch in batches:
+            rows.extend(_evaluate_batch(data, strategy_class, batch, settings))
+            if progress is not None:
+                progress(len(rows), len(combinations))
+    else:
+        with SharedFrame(data) as shared, ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_evaluate_shared_batch, shared.spec, strategy_class, batch, settings)
+                       for batch in batches]
+            for future in as_completed(futures):
+                rows.extend(future.result())
+                if progress is not None:
+                    progress(len(rows), len(combinations))
+    
+    # ترتیب ثابت برای ترکیب‌های هم‌امتیاز، مستقل از ترتیب پایان وظایف
+    rows.sort(key=lambda item: item[0])
+    table = pd.DataFrame([{**params, **row} for _, params, row in rows])
+    if metric in table.columns:
+        table = table.sort_values(metric, ascending=not maximize, na_position='last', kind='stable')
+    table = table.reset_index(drop=True)
+    table.index.name = 'rank'
+    return table
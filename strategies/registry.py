@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+فهرست استراتژی‌ها با بارگذاری تنبل
+
+ماژول هر استراتژی فقط هنگام اولین استفاده وارد می‌شود؛ بنابراین ابزارهای خط فرمان
+برای اجرای یک استراتژی هزینه وارد کردن همه استراتژی‌ها را نمی‌پردازند.
+"""
+
+import importlib
+from collections import namedtuple
+
+# مشخصات یک استراتژی در فهرست
+StrategyEntry = namedtuple('StrategyEntry', ['key', 'module', 'class_name', 'display_name'])
+
+# استراتژی‌های موجود به ترتیب نمایش
+STRATEGY_REGISTRY = {
+    entry.key: entry for entry in (
+        StrategyEntry('rsi_ema', 'strategies.rsi_ema', 'RSI_EMA_Strategy', "RSI + EMA"),
+        StrategyEntry('bollinger_rsi', 'strategies.bollinger_rsi', 'Bollinger_RSI_Strategy', "بولینگر باند + RSI"),
+        StrategyEntry('trend_pullback', 'strategies.trend_pullback', 'Trend_Pullback_Strategy', "استراتژی پولبک روند"),
+        StrategyEntry('time_breakout', 'strategies.time_breakout', 'Time_Breakout_Strategy', "شکست بر اساس زمان"),
+        StrategyEntry('ichimoku', 'strategies.ichimoku', 'Ichimoku_Strategy', "ایچیموکو"),
+        StrategyEntry('harmonic_patterns', 'strategies.harmonic_patterns', 'Harmonic_Patterns_Strategy', "الگوهای هارمونیک"),
+        StrategyEntry('divergence', 'strategies.divergence', 'Divergence_Strategy', "واگرایی"),
+        StrategyEntry('ma_crossover', 'strategies.ma_crossover', 'MA_Crossover_Strategy', "کراس مووینگ اوریج"),
+    )
+}
+
+def strategy_entry(name):
+    """
+    یافتن استراتژی با کلید، نام نمایشی یا نام کلاس
+    
+    پارامترها:
+        name (str): کلید (مثلاً rsi_ema)، نام نمایشی یا نام کلاس استراتژی
+    
+    خروجی:
+        StrategyEntry: مشخصات استراتژی
+    """
+    if name in STRATEGY_REGISTRY:
+        return STRATEGY_REGISTRY[name]
+    for entry in STRATEGY_REGISTRY.values():
+        if name in (entry.display_name, entry.class_name) or name.lower() == entry.key:
+            return entry
+    raise ValueError(f"استراتژی ناشناخته: {name}")
+
+def load_strategy_class(name):
+    """وارد کردن ماژول استراتژی و برگرداندن کلاس آن"""
+    entry = strategy_entry(name)
+    return getattr(importlib.import_module(entry.module), entry.class_name)
+
+def create_strategy(name, **params):
+    """ساخت نمونه استراتژی با پارامترهای داده شده"""
+    return load_strategy_class(name)(**params)
+
+def create_strategies(names=None):
+    """
+    ساخت نمونه چند استراتژی
+    
+    پارامترها:
+        names (iterable): نام استراتژی‌ها (None برای همه)
+    
+    خروجی:
+        dict: {نام نمایشی: نمونه استراتژی}
+    """
+    entries = STRATEGY_REGISTRY.values() if names is None else [strategy_entry(name) for name in names]
+    return {entry.display_name: create_strategy(entry.key) for entry in entries}
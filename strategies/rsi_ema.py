@@ -3,11 +3,10 @@
 استراتژی ترکیبی RSI و EMA
 """
 
-import pandas as pd
-import numpy as np
-from utils.indicators import calculate_rsi, calculate_ema
+from strategies.base import Strategy, IndicatorSpec
+from utils.signals import cross_above, cross_below, gather_signals
 
-class RSI_EMA_Strategy:
+class RSI_EMA_Strategy(Strategy):
     """
     استراتژی ترکیبی RSI و EMA
     
@@ -16,6 +15,10 @@ class RSI_EMA_Strategy:
     - فروش: هنگامی که RSI از بالای 70 عبور کند و قیمت زیر EMA(50) باشد
     """
     
+    name = "RSI + EMA"
+    output_columns = ['Date', 'Price', 'Signal', 'RSI', 'EMA']
+    extra_lookback = 1
+    
     def __init__(self, rsi_period=14, ema_period=50, rsi_buy=40, rsi_sell=70):
         """
         مقداردهی اولیه
@@ -31,42 +34,32 @@ class RSI_EMA_Strategy:
         self.rsi_buy = rsi_buy
         self.rsi_sell = rsi_sell
     
-    def run(self, data):
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        return {
+            'RSI': IndicatorSpec('rsi', period=self.rsi_period),
+            'EMA': IndicatorSpec('ema', period=self.ema_period)
+        }
+    
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
             DataFrame: سیگنال‌های خرید و فروش
         """
-        # محاسبه شاخص‌ها
-        data['RSI'] = calculate_rsi(data, self.rsi_period)
-        data['EMA'] = calculate_ema(data, self.ema_period)
+        rsi = indicators['RSI']
+        ema = indicators['EMA']
+        close = data['Close'].to_numpy()
         
-        # شناسایی سیگنال‌های خرید و فروش
-        signals = []
+        # شرط خرید: RSI از زیر 40 رد شده و قیمت بالای EMA
+        buy = cross_above(rsi, self.rsi_buy) & (close > ema.to_numpy())
         
-        for i in range(1, len(data)):
-            # شرط خرید: RSI از زیر 40 رد شده و قیمت بالای EMA
-            if (data['RSI'].iloc[i-1] < self.rsi_buy and data['RSI'].iloc[i] >= self.rsi_buy) and data['Close'].iloc[i] > data['EMA'].iloc[i]:
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': 1,  # 1 برای خرید
-                    'RSI': data['RSI'].iloc[i],
-                    'EMA': data['EMA'].iloc[i]
-                })
-            
-            # شرط فروش: RSI از بالای 70 رد شده و قیمت زیر EMA
-            elif (data['RSI'].iloc[i-1] > self.rsi_sell and data['RSI'].iloc[i] <= self.rsi_sell) and data['Close'].iloc[i] < data['EMA'].iloc[i]:
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': -1,  # -1 برای فروش
-                    'RSI': data['RSI'].iloc[i],
-                    'EMA': data['EMA'].iloc[i]
-                })
+        # شرط فروش: RSI از بالای 70 رد شده و قیمت زیر EMA
+        sell = cross_below(rsi, self.rsi_sell) & (close < ema.to_numpy())
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        return gather_signals(data, buy, sell, {'RSI': rsi, 'EMA': ema})
\ No newline at end of file
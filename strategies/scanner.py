@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+اسکن دسته‌ای چند نماد (چند فایل CSV) با مجموعه‌ای از استراتژی‌ها
+
+فایل‌ها به صورت جریانی از یک استخر پردازه با تعداد وظایف محدود عبور می‌کنند و
+سیگنال‌های هر فایل بلافاصله به گزارش تجمیعی اضافه می‌شود؛ بنابراین مصرف حافظه به
+تعداد فایل‌ها بستگی ندارد.
+"""
+
+import contextlib
+import glob
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+import pandas as pd
+
+from utils.catalog import select_files
+from utils.data_loader import load_csv_data, slice_dates
+from utils.risk_management import calculate_risk_reward
+from utils.shared_data import read_only_view
+
+# ستون‌های ثابت ابتدای گزارش
+REPORT_COLUMNS = ['Symbol', 'Timeframe', 'File', 'Strategy', 'Date', 'Price', 'Signal']
+
+# ستون‌های مدیریت ریسک
+RISK_COLUMNS = ['StopLoss', 'TakeProfit', 'RiskReward']
+
+# استراتژی‌های پردازه کاری فعلی (یک بار در شروع پردازه دریافت می‌شوند)
+_worker_strategies = None
+
+def iter_csv_files(source):
+    """
+    فهرست فایل‌های CSV یک پوشه، الگوی glob یا لیست مسیرها
+    
+    پارامترها:
+        source (str | list): مسیر پوشه، الگوی glob یا لیست مسیر فایل‌ها
+    
+    خروجی:
+        list: مسیر فایل‌ها به ترتیب الفبایی
+    """
+    if isinstance(source, (list, tuple)):
+        return list(source)
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    return sorted(glob.glob(source))
+
+def report_columns(strategies, risk_reward=True):
+    """
+    ستون‌های گزارش تجمیعی: ستون‌های ثابت و اجتماع ستون‌های خروجی استراتژی‌ها
+    
+    پارامترها:
+        strategies (dict): {نام: استراتژی}
+        risk_reward (bool): افزودن ستون‌های حد ضرر و حد سود
+    
+    خروجی:
+        list: نام ستون‌ها
+    """
+    columns = list(REPORT_COLUMNS)
+    for strategy in strategies.values():
+        for column in strategy.output_columns:
+            if column not in columns:
+                columns.append(column)
+    if risk_reward:
+        columns.extend(column for column in RISK_COLUMNS if column not in columns)
+    return columns
+
+def scan_file(path, strategies, risk_reward=True, quiet=True, start=None, end=None, risk_options=None):
+    """
+    بارگذاری یک فایل و اجرای همه استراتژی‌ها روی آن
+    
+    پارامترها:
+        path (str): مسیر فایل CSV
+        strategies (dict): {نام: استراتژی}
+        risk_reward (bool): محاسبه حد ضرر و حد سود
+        quiet (bool): عدم چاپ پیام‌های بارگذاری
+        start (str | Timestamp): اولین زمان بازه بررسی (شامل)
+        end (str | Timestamp): پایان بازه بررسی (غیر شامل)
+        risk_options (dict): پارامترهای calculate_risk_reward (روش حد ضرر، ضریب ATR و ...)
+    
+    خروجی:
+        tuple: (dict خلاصه فایل، DataFrame سیگنال‌ها یا None)
+    """
+    started = time.perf_counter()
+    summary = {'File': path, 'Symbol': None, 'Timeframe': None, 'Bars': 0, 'Signals': 0, 'Seconds': 0.0, 'Error': None}
+    try:
+        output = io.StringIO() if quiet else None
+        with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+            data, symbol, timeframe = load_csv_data(path)
+        data = slice_dates(data, start, end)
+        summary.update(Symbol=symbol, Timeframe=timeframe, Bars=len(data))
+        
+        tables = []
+        errors = []
+        for name, strategy in strategies.items():
+            try:
+                signals = strategy.run(read_only_view(data))
+                if signals.empty:
+                    continue
+                if risk_reward:
+                    signals = calculate_risk_reward(signals, data, **(risk_options or {}))
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+                continue
+            tables.append(signals.assign(Strategy=name))
+        if errors:
+            summary['Error'] = '; '.join(errors)
+        
+        signals = None
+        if tables:
+            signals = pd.concat(tables, ignore_index=True)
+            signals = signals.assign(Symbol=symbol, Timeframe=timeframe, File=os.path.basename(path))
+            summary['Signals'] = len(signals)
+    except Exception as e:
+        signals = None
+        summary['Error'] = str(e)
+    
+    summary['Seconds'] = time.perf_counter() - started
+    return summary, signals
+
+def _init_worker(strategies):
+    global _worker_strategies
+    _worker_strategies = strategies
+
+def _scan_worker_file(path, risk_reward, quiet, start, end, risk_options):
+    """وظیفه پردازه کاری: اسکن یک فایل با استراتژی‌های پردازه"""
+    return scan_file(path, _worker_strategies, risk_reward, quiet, start, end, risk_options)
+
+def scan_files(source, strategies, out_path, max_workers=None, max_pending=None, risk_reward=True,
+               quiet=True, progress=None, symbols=None, timeframes=None, start=None, end=None,
+               risk_options=None):
+    """
+    اسکن موازی چند فایل CSV و نوشتن گزارش تجمیعی سیگنال‌ها
+    
+    در هر لحظه حداکثر max_pending فایل در حال پردازش یا منتظر نوشتن است و
+    سیگنال‌های هر فایل پس از پایان پردازش آن به فایل گزارش اضافه می‌شود.
+    
+    پارامترها:
+        source (str | list): مسیر پوشه، الگوی glob یا لیست مسیر فایل‌ها
+        strategies (dict): {نام: استراتژی}
+        out_path (str): مسیر فایل CSV گزارش
+        max_workers (int): تعداد پردازه‌ها (پیش‌فرض: تعداد هسته‌ها، 1 برای اجرای بدون پردازه)
+        max_pending (int): حداکثر وظایف همزمان (پیش‌فرض: دو برابر تعداد پردازه‌ها)
+        risk_reward (bool): محاسبه حد ضرر و حد سود
+        quiet (bool): عدم چاپ پیام‌های بارگذاری
+        progress (callable): تابع progress(انجام شده، کل، خلاصه فایل) برای گزارش پیشرفت
+        symbols (list): فقط این نمادها (انتخاب از روی کاتالوگ بدون باز کردن فایل‌ها)
+        timeframes (list): فقط این تایم‌فریم‌ها
+        start (str | Timestamp): اولین زمان بازه بررسی؛ فایل‌های بدون داده در بازه کنار گذاشته می‌شوند
+        end (str | Timestamp): پایان بازه بررسی (غیر شامل)
+        risk_options (dict): پارامترهای calculate_risk_reward
+    
+    خروجی:
+        DataFrame: خلاصه هر فایل (نماد، تایم‌فریم، تعداد کندل و سیگنال، زمان، خطا)
+    """
+    files = iter_csv_files(source)
+    if symbols or timeframes or start is not None or end is not None:
+        files = select_files(files, symbols or None, timeframes or None, start, end)
+    columns = report_columns(strategies, risk_reward)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(files) or 1))
+    max_pending = max_pending or max_workers * 2
+    
+    summaries = []
+    with open(out_path, 'w', encoding='utf-8-sig', newline='') as report:
+        pd.DataFrame(columns=columns).to_csv(report, index=False)
+        
+        def collect(summary, signals):
+            if signals is not None:
+                signals.reindex(columns=columns).to_csv(report, header=False, index=False)
+            summaries.append(summary)
+            if progress is not None:
+                progress(len(summaries), len(files), summary)
+        
+        if max_workers == 1:
+            for path in files:
+                collect(*scan_file(path, strategies, risk_reward, quiet, start, end, risk_options))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(strategies,)) as executor:
+                pending = set()
+                for path in files:
+                    if len(pending) >= max_pending:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(*future.result())
+                    pending.add(executor.submit(_scan_worker_file, path, risk_reward, quiet, start, end,
+                                                risk_options))
+                for future in as_completed(pending):
+                    collect(*future.result())
+    
+    return pd.DataFrame(summaries, columns=['File', 'Symbol', 'Timeframe', 'Bars', 'Signals', 'Seconds', 'Error'])
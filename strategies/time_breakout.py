@@ -6,9 +6,9 @@
 import pandas as pd
 import numpy as np
 from datetime import time
-from utils.indicators import calculate_atr, detect_support_resistance
+from strategies.base import Strategy, IndicatorSpec
 
-class Time_Breakout_Strategy:
+class Time_Breakout_Strategy(Strategy):
     """
     استراتژی شکست بر اساس زمان
     
@@ -17,6 +17,9 @@ class Time_Breakout_Strategy:
     - معامله بر اساس شکست این محدوده در ادامه روز
     """
     
+    name = "شکست بر اساس زمان"
+    output_columns = ['Date', 'Price', 'Signal', 'Range_High', 'Range_Low', 'ATR']
+    
     def __init__(self, morning_start=time(9, 30), morning_end=time(10, 0), 
                  breakout_threshold=0.5, volume_factor=1.5):
         """
@@ -33,76 +36,95 @@ class Time_Breakout_Strategy:
         self.breakout_threshold = breakout_threshold
         self.volume_factor = volume_factor
     
-    def run(self, data):
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        return {
+            'ATR': IndicatorSpec('atr', period=14),
+            'Avg_Volume': IndicatorSpec('volume_sma', period=20)
+        }
+    
+    def history_start(self, data, start):
+        """محدوده صبحگاهی و اولین شکست هر روز به همه کندل‌های همان روز وابسته است"""
+        first = super().history_start(data, start)
+        if len(data) == 0 or not pd.api.types.is_datetime64_any_dtype(data['Date']):
+            return first
+        # روز کندل start (یا آخرین کندل موجود که کندل‌های بعدی ممکن است ادامه همان روز باشند)
+        day = data['Date'].iloc[min(start, len(data) - 1)].normalize()
+        return min(first, int(data['Date'].searchsorted(day)))
+    
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
             DataFrame: سیگنال‌های خرید و فروش
         """
-        # تبدیل ستون تاریخ به ساعت
-        if 'Date' in data.columns and hasattr(data['Date'].iloc[0], 'time'):
-            data['Time'] = data['Date'].apply(lambda x: x.time())
+        # زمان هر کندل به صورت میکروثانیه از ابتدای روز (بدون افزودن ستون به داده‌ها)
+        if 'Date' in data.columns and pd.api.types.is_datetime64_any_dtype(data['Date']):
+            dates = data['Date']
+            days = dates.dt.normalize()
+            times = (dates - days).to_numpy().astype('timedelta64[us]').astype(np.int64)
         else:
             # اگر ستون ساعت وجود نداشت، نمی‌توانیم این استراتژی را اجرا کنیم
             print("هشدار: داده‌های زمانی برای استراتژی شکست بر اساس زمان موجود نیست.")
-            return pd.DataFrame()
+            return []
         
-        # محاسبه میانگین دامنه حقیقی (ATR)
-        data['ATR'] = calculate_atr(data)
+        start = _time_to_microseconds(self.morning_start)
+        end = _time_to_microseconds(self.morning_end)
         
-        # محاسبه میانگین حجم
-        data['Avg_Volume'] = data['Volume'].rolling(window=20).mean()
+        high = data['High'].to_numpy(dtype=np.float64)
+        low = data['Low'].to_numpy(dtype=np.float64)
+        volume = data['Volume'].to_numpy(dtype=np.float64)
         
-        # تعیین محدوده صبحگاهی
-        signals = []
-        date_groups = data.groupby(data['Date'].dt.date)
+        # میانگین دامنه حقیقی (ATR) و میانگین حجم
+        atr = np.asarray(indicators['ATR'], dtype=np.float64)
+        avg_volume = np.asarray(indicators['Avg_Volume'], dtype=np.float64)
         
-        for date, group in date_groups:
-            # فیلتر کردن کندل‌های صبحگاهی
-            morning_candles = group[(group['Time'] >= self.morning_start) & (group['Time'] <= self.morning_end)]
-            
-            if len(morning_candles) > 0:
-                # تعیین محدوده
-                morning_high = morning_candles['High'].max()
-                morning_low = morning_candles['Low'].min()
-                
-                # محاسبه دامنه
-                range_size = morning_high - morning_low
-                
-                # تعیین شکست با استفاده از ATR
-                atr_value = morning_candles['ATR'].iloc[-1]
-                breakout_amount = atr_value * self.breakout_threshold
-                
-                # فیلتر کردن کندل‌های بعد از صبح
-                day_candles = group[group['Time'] > self.morning_end]
-                
-                for i, row in day_candles.iterrows():
-                    # شکست بالا
-                    if row['High'] > (morning_high + breakout_amount) and row['Volume'] > (row['Avg_Volume'] * self.volume_factor):
-                        signals.append({
-                            'Date': row['Date'],
-                            'Price': row['Close'],
-                            'Signal': 1,  # 1 برای خرید
-                            'Range_High': morning_high,
-                            'Range_Low': morning_low,
-                            'ATR': row['ATR']
-                        })
-                        break  # فقط اولین شکست در هر روز
-                    
-                    # شکست پایین
-                    elif row['Low'] < (morning_low - breakout_amount) and row['Volume'] > (row['Avg_Volume'] * self.volume_factor):
-                        signals.append({
-                            'Date': row['Date'],
-                            'Price': row['Close'],
-                            'Signal': -1,  # -1 برای فروش
-                            'Range_High': morning_high,
-                            'Range_Low': morning_low,
-                            'ATR': row['ATR']
-                        })
-                        break  # فقط اولین شکست در هر روز
+        # شماره روز هر کندل (روزها به ترتیب تاریخ)
+        day_codes, day_values = pd.factorize(days, sort=True)
+        n_days = len(day_values)
+        positions = np.arange(len(data))
+        
+        # تعیین محدوده صبحگاهی هر روز
+        morning = (times >= start) & (times <= end)
+        morning_high = np.full(n_days, np.nan)
+        morning_low = np.full(n_days, np.nan)
+        last_morning = np.full(n_days, -1)
+        np.fmax.at(morning_high, day_codes[morning], high[morning])
+        np.fmin.at(morning_low, day_codes[morning], low[morning])
+        np.maximum.at(last_morning, day_codes[morning], positions[morning])
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        # تعیین شکست با استفاده از ATR آخرین کندل صبحگاهی
+        has_morning = last_morning >= 0
+        breakout_amount = np.where(has_morning, atr[np.maximum(last_morning, 0)], np.nan) * self.breakout_threshold
+        
+        # شکست بالا یا پایین در کندل‌های بعد از صبح با تأیید حجم
+        range_high = morning_high[day_codes]
+        range_low = morning_low[day_codes]
+        amount = breakout_amount[day_codes]
+        volume_ok = volume > avg_volume * self.volume_factor
+        buy = (high > range_high + amount) & volume_ok
+        sell = (low < range_low - amount) & volume_ok
+        candidates = (times > end) & has_morning[day_codes] & (buy | sell)
+        
+        # فقط اولین شکست در هر روز
+        hits = np.flatnonzero(candidates)
+        _, first = np.unique(day_codes[hits], return_index=True)
+        rows = hits[first]
+        
+        return pd.DataFrame({
+            'Date': dates.iloc[rows].reset_index(drop=True),
+            'Price': data['Close'].to_numpy()[rows],
+            'Signal': np.where(buy[rows], 1, -1),  # 1 برای خرید، -1 برای فروش
+            'Range_High': range_high[rows],
+            'Range_Low': range_low[rows],
+            'ATR': atr[rows]
+        })
+
+def _time_to_microseconds(value):
+    """تبدیل زمان روز به میکروثانیه از ابتدای روز"""
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
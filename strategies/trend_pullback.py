@@ -3,11 +3,10 @@
 استراتژی پولبک روند
 """
 
-import pandas as pd
-import numpy as np
-from utils.indicators import calculate_ema, calculate_rsi
+from strategies.base import Strategy, IndicatorSpec
+from utils.signals import all_true_over, between, rising, falling, gather_signals
 
-class Trend_Pullback_Strategy:
+class Trend_Pullback_Strategy(Strategy):
     """
     استراتژی پولبک روند
     
@@ -16,6 +15,10 @@ class Trend_Pullback_Strategy:
     - روند نزولی: EMA(50) زیر EMA(200) و قیمت در حال اصلاح به سمت فیبوناچی
     """
     
+    name = "استراتژی پولبک روند"
+    output_columns = ['Date', 'Price', 'Signal', 'RSI', 'EMA_50', 'EMA_200']
+    extra_lookback = 5
+    
     def __init__(self, ema_short=50, ema_long=200, rsi_period=14, rsi_threshold=40):
         """
         مقداردهی اولیه
@@ -31,67 +34,51 @@ class Trend_Pullback_Strategy:
         self.rsi_period = rsi_period
         self.rsi_threshold = rsi_threshold
     
-    def run(self, data):
+    def indicators(self):
+        """اندیکاتورهای مورد نیاز استراتژی"""
+        return {
+            'EMA_50': IndicatorSpec('ema', period=self.ema_short),
+            'EMA_200': IndicatorSpec('ema', period=self.ema_long),
+            'RSI': IndicatorSpec('rsi', period=self.rsi_period)
+        }
+    
+    def generate_signals(self, data, indicators):
         """
-        اجرای استراتژی روی داده‌ها
+        تولید سیگنال‌ها
         
         پارامترها:
             data (DataFrame): داده‌های قیمت
+            indicators (dict): اندیکاتورهای محاسبه شده
             
         خروجی:
             DataFrame: سیگنال‌های خرید و فروش
         """
-        # محاسبه شاخص‌ها
-        data['EMA_50'] = calculate_ema(data, self.ema_short)
-        data['EMA_200'] = calculate_ema(data, self.ema_long)
-        data['RSI'] = calculate_rsi(data, self.rsi_period)
+        ema_short = indicators['EMA_50']
+        ema_long = indicators['EMA_200']
+        rsi = indicators['RSI']
+        close = data['Close'].to_numpy()
         
         # تعیین روند
-        data['UpTrend'] = data['EMA_50'] > data['EMA_200']
+        up_trend = ema_short.to_numpy() > ema_long.to_numpy()
         
         # محاسبه فاصله قیمت از EMA کوتاه مدت (به عنوان معیاری برای پولبک)
-        data['Price_to_EMA50'] = (data['Close'] - data['EMA_50']) / data['EMA_50'] * 100
+        price_to_ema = (close - ema_short.to_numpy()) / ema_short.to_numpy() * 100
         
-        # شناسایی سیگنال‌های خرید و فروش
-        signals = []
+        # شرط روند صعودی و نزولی در 5 کندل قبل
+        uptrend = all_true_over(up_trend, 5, lag=1)
+        downtrend = all_true_over(~up_trend, 5, lag=1)
         
-        for i in range(5, len(data)):
-            # شرط روند صعودی
-            uptrend = data['UpTrend'].iloc[i-5:i].all()
-            
-            # شرط روند نزولی
-            downtrend = (~data['UpTrend'].iloc[i-5:i]).all()
-            
-            # شرط پولبک در روند صعودی: قیمت نزدیک EMA50 یا کمی زیر آن
-            pullback_in_uptrend = uptrend and (-5 < data['Price_to_EMA50'].iloc[i] < 0)
-            
-            # شرط پولبک در روند نزولی: قیمت نزدیک EMA50 یا کمی بالای آن
-            pullback_in_downtrend = downtrend and (0 < data['Price_to_EMA50'].iloc[i] < 5)
-            
-            # تأیید با RSI
-            rsi_confirms_buy = data['RSI'].iloc[i] > self.rsi_threshold and data['RSI'].iloc[i] < 60
-            rsi_confirms_sell = data['RSI'].iloc[i] < (100 - self.rsi_threshold) and data['RSI'].iloc[i] > 40
-            
-            # سیگنال خرید
-            if pullback_in_uptrend and rsi_confirms_buy and data['Close'].iloc[i] > data['Close'].iloc[i-1]:
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': 1,  # 1 برای خرید
-                    'RSI': data['RSI'].iloc[i],
-                    'EMA_50': data['EMA_50'].iloc[i],
-                    'EMA_200': data['EMA_200'].iloc[i]
-                })
-            
-            # سیگنال فروش
-            elif pullback_in_downtrend and rsi_confirms_sell and data['Close'].iloc[i] < data['Close'].iloc[i-1]:
-                signals.append({
-                    'Date': data['Date'].iloc[i],
-                    'Price': data['Close'].iloc[i],
-                    'Signal': -1,  # -1 برای فروش
-                    'RSI': data['RSI'].iloc[i],
-                    'EMA_50': data['EMA_50'].iloc[i],
-                    'EMA_200': data['EMA_200'].iloc[i]
-                })
+        # شرط پولبک در روند صعودی: قیمت نزدیک EMA50 یا کمی زیر آن
+        pullback_in_uptrend = uptrend & between(price_to_ema, -5, 0)
+        
+        # شرط پولبک در روند نزولی: قیمت نزدیک EMA50 یا کمی بالای آن
+        pullback_in_downtrend = downtrend & between(price_to_ema, 0, 5)
+        
+        # تأیید با RSI
+        rsi_confirms_buy = between(rsi, self.rsi_threshold, 60)
+        rsi_confirms_sell = between(rsi, 40, 100 - self.rsi_threshold)
+        
+        buy = pullback_in_uptrend & rsi_confirms_buy & rising(close)
+        sell = pullback_in_downtrend & rsi_confirms_sell & falling(close)
         
-        return pd.DataFrame(signals)
\ No newline at end of file
+        return gather_signals(data, buy, sell, {'RSI': rsi, 'EMA_50': ema_short, 'EMA_200': ema_long})
\ No newline at end of file
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+اعتبارسنجی پیش‌رونده (walk-forward) استراتژی‌ها
+
+داده‌ها به پنجره‌های آموزش/آزمون متوالی (غلتان یا لنگردار) تقسیم می‌شوند. در هر
+پنجره بهترین پارامترها روی بخش آموزش انتخاب شده و روی بخش آزمون بعدی ارزیابی
+می‌شوند؛ سپس سیگنال‌های بخش‌های آزمون به یک منحنی سرمایه واحد متصل می‌شوند.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from strategies.optimizer import candidate_parameters, score_signals
+from utils.risk_management import calculate_risk_reward, simulate_trades, calculate_trading_metrics
+from utils.shared_data import SharedFrame, attach_shared_frame, read_only_view
+
+# مرزهای یک پنجره بر حسب شماره کندل (شروع شامل، پایان غیر شامل)
+WalkForwardWindow = namedtuple('WalkForwardWindow', ['train_start', 'train_end', 'test_start', 'test_end'])
+
+# نتیجه اعتبارسنجی پیش‌رونده
+WalkForwardResult = namedtuple('WalkForwardResult', ['windows', 'trades', 'equity', 'metrics'])
+
+# اندیکاتورهای محاسبه شده روی کل داده‌ها در هر پردازه کاری {نام بلوک: {ستون: Series}}
+_indicator_store = {}
+
+def walk_forward_windows(n, train_size, test_size, step=None, anchored=False):
+    """
+    تقسیم n کندل به پنجره‌های آموزش و آزمون
+    
+    پارامترها:
+        n (int): تعداد کل کندل‌ها
+        train_size (int): طول بخش آموزش (در حالت لنگردار: طول اولین بخش آموزش)
+        test_size (int): طول بخش آزمون
+        step (int): فاصله شروع پنجره‌های متوالی (پیش‌فرض: test_size)؛ کوچک‌تر از test_size
+            مجاز نیست زیرا بخش‌های آزمون هم‌پوشان می‌شوند و منحنی سرمایه خارج از نمونه
+            یک کندل را چند بار معامله می‌کند
+        anchored (bool): شروع همه بخش‌های آموزش از ابتدای داده‌ها
+    
+    خروجی:
+        list: لیست WalkForwardWindow
+    """
+    if train_size < 1 or test_size < 1:
+        raise ValueError("طول بخش آموزش و آزمون باید حداقل 1 باشد")
+    step = step or test_size
+    if step < test_size:
+        raise ValueError("فاصله پنجره‌ها (step) نباید از طول بخش آزمون کوچک‌تر باشد")
+    
+    windows = []
+    train_start = 0
+    train_end = train_size
+    while train_end + test_size <= n:
+        windows.append(WalkForwardWindow(train_start, train_end, train_end, train_end + test_size))
+        train_end += step
+        if not anchored:
+            train_start += step
+    return windows
+
+def _shared_indicators(data, strategy, store):
+    """
+    اندیکاتورهای استراتژی روی داده‌ها، هر ستون فقط یک بار در هر پردازه
+    
+    پنجره‌های هم‌پوشان و ترکیب‌های پارامتر با اندیکاتور مشترک، محاسبه را تکرار نمی‌کنند.
+    """
+    indicators = {}
+    for role, spec in strategy.indicators().items():
+        if spec.column not in store:
+            store.update(spec.compute(data))
+        indicators[role] = store[spec.column]
+    return indicators
+
+def _run_slice(data, strategy, store, start, end):
+    """
+    اجرای استراتژی روی کندل‌های [start, end)
+    
+    اندیکاتورهای استراتژی‌های بدون lookahead فقط به کندل‌های گذشته وابسته‌اند و یک بار
+    روی کل داده‌ها محاسبه و برای هر پنجره برش داده می‌شوند (از ابتدای پنجره گرم شده‌اند).
+    در استراتژی‌های دارای lookahead ستون‌هایی مانند chikou ایچیموکو (Close.shift(-26))
+    به کندل‌های بعدی وابسته‌اند؛ برش آن‌ها در انتهای پنجره قیمت‌های بعد از end را
+    می‌خواند. بنابراین اندیکاتور این استراتژی‌ها روی کندل‌های [0, end) محاسبه می‌شود و
+    بین ترکیب‌های پارامتر با پایان یکسان مشترک است.
+    """
+    if strategy.lookahead:
+        store = store.setdefault(('before', end), {})
+        data = data.iloc[:end]
+    indicators = _shared_indicators(data, strategy, store)
+    window = data.iloc[start:end]
+    indicators = {role: series.iloc[start:end] for role, series in indicators.items()}
+    return strategy.run(read_only_view(window), indicators)
+
+def _evaluate_window(data, strategy_class, window, combinations, metric, maximize, settings, store):
+    """
+    انتخاب بهترین پارامترها روی بخش آموزش و تولید سیگنال‌های بخش آزمون
+    
+    خروجی:
+        tuple: (بهترین پارامترها، معیارهای آموزش، سیگنال‌های آزمون)
+    """
+    best_params = None
+    best_metrics = None
+    best_score = None
+    for params in combinations:
+        strategy = strategy_class(**params)
+        signals = _run_slice(data, strategy, store, window.train_start, window.train_end)
+        metrics = score_signals(signals, data, **settings)
+        score = metrics.get(metric)
+        if score is None or np.isnan(score):
+            continue
+        if best_score is None or (score > best_score if maximize else score < best_score):
+            best_params, best_metrics, best_score = params, metrics, score
+    
+    if best_params is None:
+        result = None, {}, None
+    else:
+        test_signals = _run_slice(data, strategy_class(**best_params), store, window.test_start, window.test_end)
+        result = best_params, best_metrics, test_signals
+    
+    # اندیکاتورهای محاسبه شده تا پایان این پنجره دوباره استفاده نمی‌شوند
+    store.pop(('before', window.train_end), None)
+    store.pop(('before', window.test_end), None)
+    return result
+
+def _evaluate_shared_window(spec, strategy_class, window, combinations, metric, maximize, settings):
+    """وظیفه پردازه کاری: ارزیابی یک پنجره روی داده‌های حافظه مشترک"""
+    store = _indicator_store.setdefault(spec.shm_name, {})
+    return _evaluate_window(attach_shared_frame(spec), strategy_class, window, combinations,
+                            metric, maximize, settings, store)
+
+def walk_forward(data, strategy_class, space, train_size, test_size, step=None, anchored=False,
+                 method='grid', n_iter=100, metric='total_profit', maximize=True, max_workers=None,
+                 seed=0, progress=None, **settings):
+    """
+    اعتبارسنجی پیش‌رونده یک استراتژی
+    
+    پنجره‌ها به صورت همزمان در پردازه‌های جداگانه ارزیابی می‌شوند. سیگنال‌های همه
+    بخش‌های آزمون به ترتیب زمان کنار هم قرار گرفته و یک بار شبیه‌سازی می‌شوند تا
+    منحنی سرمایه خارج از نمونه به دست آید.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        strategy_class (type): کلاس استراتژی
+        space (dict): {نام پارامتر: لیست مقادیر}
+        train_size (int): تعداد کندل‌های بخش آموزش
+        test_size (int): تعداد کندل‌های بخش آزمون
+        step (int): فاصله پنجره‌های متوالی (پیش‌فرض: test_size، حداقل test_size)
+        anchored (bool): بخش آموزش لنگردار (از ابتدای داده‌ها) به جای غلتان
+        method (str): 'grid' یا 'random'
+        n_iter (int): تعداد ترکیب‌ها در جستجوی تصادفی
+        metric (str): معیار انتخاب پارامترها (کلید خروجی calculate_trading_metrics)
+        maximize (bool): بزرگ‌تر بودن معیار بهتر است
+        max_workers (int): تعداد پردازه‌ها (پیش‌فرض: تعداد هسته‌ها، 1 برای اجرای بدون پردازه)
+        seed (int): بذر جستجوی تصادفی و شبیه‌سازی معاملات
+        progress (callable): تابع progress(انجام شده، کل) برای گزارش پیشرفت
+        **settings: initial_balance، risk_percentage و risk_ratio
+    
+    خروجی:
+        WalkForwardResult: (جدول پنجره‌ها، معاملات بخش‌های آزمون، منحنی سرمایه، معیارهای کل)
+    """
+    data = data.reset_index(drop=True)
+    windows = walk_forward_windows(len(data), train_size, test_size, step, anchored)
+    if not windows:
+        raise ValueError("داده‌ها برای یک پنجره آموزش و آزمون کافی نیستند")
+    combinations = candidate_parameters(strategy_class, space, method, n_iter, seed)
+    settings['seed'] = seed
+    
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(windows)))
+    
+    outcomes = []
+    if max_workers == 1:
+        store = {}
+        for window in windows:
+            outcomes.append(_evaluate_window(data, strategy_class, window, combinations,
+                                             metric, maximize, settings, store))
+            if progress is not None:
+                progress(len(outcomes), len(windows))
+    else:
+        with SharedFrame(data) as shared, ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_evaluate_shared_window, shared.spec, strategy_class, window,
+                                       combinations, metric, maximize, settings)
+                       for window in windows]
+            for future in futures:
+                outcomes.append(future.result())
+                if progress is not None:
+                    progress(len(outcomes), len(windows))
+    
+    dates = data['Date']
+    rows = []
+    test_tables = []
+    for number, (window, (params, train_metrics, test_signals)) in enumerate(zip(windows, outcomes)):
+        rows.append({
+            'Window': number,
+            'Train_Start': dates.iloc[window.train_start],
+            'Train_End': dates.iloc[window.train_end - 1],
+            'Test_Start': dates.iloc[window.test_start],
+            'Test_End': dates.iloc[window.test_end - 1],
+            'Params': params,
+            'Train_Score': train_metrics.get(metric),
+            'Test_Signals': 0 if test_signals is None else len(test_signals)
+        })
+        if test_signals is not None and not test_signals.empty:
+            test_tables.append(test_signals.assign(Window=number))
+    
+    # اتصال بخش‌های آزمون و شبیه‌سازی یکجا برای منحنی سرمایه پیوسته
+    initial_balance = settings.get('initial_balance', 10000)
+    if test_tables:
+        signals = pd.concat(test_tables, ignore_index=True)
+        signals = calculate_risk_reward(signals, data, risk_ratio=settings.get('risk_ratio', 2))
+        np.random.seed(seed)
+        trades, _ = simulate_trades(signals, initial_balance=initial_balance,
+                                    risk_percentage=settings.get('risk_percentage', 1))
+        trades['Window'] = signals['Window'].to_numpy()
+    else:
+        trades = pd.DataFrame(columns=['Date', 'Signal', 'Entry', 'Result', 'Balance', 'Window'])
+    
+    equity = pd.Series(trades['Balance'].to_numpy(dtype=float), index=pd.Index(trades['Date'], name='Date'),
+                       name='Balance')
+    metrics = calculate_trading_metrics(trades) if not trades.empty else {}
+    
+    return WalkForwardResult(pd.DataFrame(rows), trades, equity, metrics)
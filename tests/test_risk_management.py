@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+آزمون محاسبه حد ضرر و حد سود روی جدول ادغام شده چند استراتژی
+"""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from strategies.engine import merge_signals
+from utils.indicators import calculate_atr
+from utils.risk_management import calculate_risk_reward
+
+def _market(bars=500, seed=0):
+    """داده‌های قیمت ساختگی"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-3, bars))
+    return pd.DataFrame({
+        'Date': pd.date_range('2023-01-01', periods=bars, freq='h'),
+        'Open': close,
+        'High': close + rng.random(bars) * 3e-3,
+        'Low': close - rng.random(bars) * 3e-3,
+        'Close': close
+    })
+
+class RiskRewardMergedTableTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.data = _market()
+        dates = self.data['Date']
+        price = self.data['Close']
+        # فقط سیگنال‌های شکست زمانی ستون ATR (با مقدار متفاوت) دارند
+        breakout = pd.DataFrame({'Date': dates[[50, 200]], 'Price': price[[50, 200]], 'Signal': [1, -1],
+                                 'ATR': [1.0, 1.0]})
+        rsi = pd.DataFrame({'Date': dates[[30, 120, 300]], 'Price': price[[30, 120, 300]], 'Signal': [-1, 1, 1]})
+        self.signals = merge_signals({'Time Breakout': breakout, 'RSI + EMA': rsi})
+    
+    def test_all_rows_have_stops(self):
+        result = calculate_risk_reward(self.signals, self.data)
+        self.assertEqual(len(result), 5)
+        self.assertFalse(result[['ATR', 'StopLoss', 'TakeProfit']].isna().any().any())
+    
+    def test_stops_use_market_atr(self):
+        result = calculate_risk_reward(self.signals, self.data, atr_period=20, atr_multiplier=2.0)
+        positions = self.data['Date'].searchsorted(result['Date'])
+        atr = calculate_atr(self.data, period=20).to_numpy()[positions]
+        np.testing.assert_allclose(result['ATR'], atr)
+        direction = np.where(result['Signal'] == 1, 1.0, -1.0)
+        np.testing.assert_allclose(result['StopLoss'], result['Price'] - direction * 2.0 * atr)
+        np.testing.assert_allclose(result['TakeProfit'], result['Price'] + direction * 4.0 * atr)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+"""
+فهرست دائمی فایل‌های داده (کاتالوگ)
+
+برای هر فایل CSV مشخصات آن ذخیره می‌شود: نماد، تایم‌فریم، تعداد کندل،
+اولین و آخرین زمان، ستون‌ها، هش محتوا و مسیر کش. کاتالوگ هر پوشه در
+<پوشه>/.cache/catalog.json نگهداری می‌شود و با refresh فقط فایل‌های جدید یا تغییر
+یافته دوباره بررسی می‌شوند؛ بنابراین رابط گرافیکی، اسکنر و بهینه‌ساز می‌توانند بدون
+باز کردن فایل‌ها داده‌ها و بازه زمانی موردنظر را انتخاب کنند.
+
+مثال:
+    catalog = DatasetCatalog('csv')
+    catalog.refresh()
+    for entry in catalog.find(symbol='EURUSD', timeframe='H1', start='2023-01-01'):
+        data, symbol, timeframe = catalog.load(entry['file'], start='2023-01-01')
+"""
+
+import contextlib
+import glob
+import hashlib
+import io
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from utils.data_cache import CACHE_DIR_NAME, cache_path
+from utils.data_loader import load_csv_data, match_columns, read_header, slice_dates
+from utils.resample import TIMEFRAMES
+
+# نام فایل کاتالوگ در پوشه کش
+CATALOG_FILE = 'catalog.json'
+
+# نسخه قالب کاتالوگ؛ با تغییر مشخصات ذخیره شده افزایش می‌یابد
+CATALOG_VERSION = 1
+
+def file_hash(file_path, block_size=1 << 20):
+    """هش SHA-1 محتوای فایل (خواندن تکه‌ای)"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def infer_timeframe(dates):
+    """
+    تشخیص تایم‌فریم از فاصله رایج بین کندل‌ها
+    
+    پارامترها:
+        dates (ndarray): زمان کندل‌ها (مرتب)
+    
+    خروجی:
+        str: نام تایم‌فریم یا "Unknown"
+    """
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    if len(dates) < 2:
+        return "Unknown"
+    # فاصله رایج (میانه) در برابر فاصله‌های بزرگ تعطیلات پایدار است
+    step = pd.Timedelta(int(np.median(np.diff(dates.view(np.int64)))))
+    for name, delta in TIMEFRAMES.items():
+        if delta == step:
+            return name
+    if pd.Timedelta(days=28) <= step <= pd.Timedelta(days=31):
+        return 'MN'
+    return "Unknown"
+
+class DatasetCatalog:
+    """
+    کاتالوگ فایل‌های داده یک پوشه
+    
+    هر مشخصه (entry) یک dict با کلیدهای file، symbol، timeframe، bars، first، last،
+    columns، mapping، dtypes، size، mtime_ns، sha1 و cache است.
+    """
+    
+    def __init__(self, directory='csv'):
+        """
+        مقداردهی اولیه و خواندن کاتالوگ ذخیره شده
+        
+        پارامترها:
+            directory (str): پوشه فایل‌های CSV
+        """
+        self.directory = os.path.abspath(directory)
+        self.path = os.path.join(self.directory, CACHE_DIR_NAME, CATALOG_FILE)
+        self.entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('version') == CATALOG_VERSION:
+                self.entries = stored.get('datasets', {})
+        except (OSError, ValueError):
+            pass
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __iter__(self):
+        return iter(self.entries.values())
+    
+    def file_path(self, name):
+        """مسیر کامل فایل یک مشخصه"""
+        return os.path.join(self.directory, name)
+    
+    def save(self):
+        """ذخیره کاتالوگ (نوشتن در فایل موقت و جایگزینی یکجا)"""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = f"{self.path}.tmp-{uuid.uuid4().hex}"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CATALOG_VERSION, 'datasets': self.entries}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(temp_path)
+            raise
+    
+    def _index_file(self, file_path, stat, previous=None):
+        """ساخت مشخصات یک فایل (در صورت تغییر نکردن محتوا از مشخصات قبلی استفاده می‌شود)"""
+        name = os.path.basename(file_path)
+        sha1 = file_hash(file_path)
+        if previous is not None and previous.get('sha1') == sha1:
+            # فقط زمان تغییر عوض شده است (مثلاً کپی دوباره فایل)
+            cache = cache_path(file_path)
+            return dict(previous, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                        cache=cache if os.path.isdir(cache) else None)
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            data, symbol, timeframe = load_csv_data(file_path)
+        dates = data['Date'].to_numpy() if 'Date' in data.columns else np.array([], dtype='datetime64[ns]')
+        if timeframe == "Unknown":
+            timeframe = infer_timeframe(dates)
+        header = read_header(file_path)[0]
+        cache = cache_path(file_path)
+        return {
+            'file': name,
+            'symbol': symbol,
+            'timeframe': timeframe.upper(),
+            'bars': len(data),
+            'first': pd.Timestamp(dates[0]).isoformat() if len(dates) else None,
+            'last': pd.Timestamp(dates[-1]).isoformat() if len(dates) else None,
+            'columns': header,
+            'mapping': match_columns(header),
+            'dtypes': {column: str(data[column].dtype) for column in data.columns},
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': sha1,
+            'cache': cache if os.path.isdir(cache) else None
+        }
+    
+    def refresh(self, paths=None, progress=None):
+        """
+        به‌روزرسانی افزایشی کاتالوگ
+        
+        فقط فایل‌هایی که اندازه یا زمان تغییر آن‌ها عوض شده دوباره بررسی می‌شوند و
+        مشخصات فایل‌های حذف شده پاک می‌شود.
+        
+        پارامترها:
+            paths (list): فقط این فایل‌ها (پیش‌فرض: همه فایل‌های CSV پوشه)
+            progress (callable): تابع progress(انجام شده، کل، نام فایل)
+        
+        خروجی:
+            list: نام فایل‌های اضافه یا به‌روز شده
+        """
+        if paths is None:
+            paths = sorted(glob.glob(os.path.join(self.directory, '*.csv')))
+            removed = set(self.entries) - {os.path.basename(path) for path in paths}
+        else:
+            removed = {os.path.basename(path) for path in paths if not os.path.isfile(path)}
+            paths = [path for path in paths if os.path.isfile(path)]
+        for name in removed:
+            self.entries.pop(name, None)
+        
+        updated = []
+        for done, path in enumerate(paths, 1):
+            name = os.path.basename(path)
+            stat = os.stat(path)
+            previous = self.entries.get(name)
+            if previous is None or previous.get('size') != stat.st_size or previous.get('mtime_ns') != stat.st_mtime_ns:
+                try:
+                    self.entries[name] = self._index_file(path, stat, previous)
+                except Exception as e:
+                    # فایل نامعتبر با خطای آن ثبت می‌شود و تا تغییر فایل دوباره بررسی نمی‌شود
+                    self.entries[name] = {'file': name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                          'error': str(e)}
+                updated.append(name)
+            if progress is not None:
+                progress(done, len(paths), name)
+        
+        if updated or removed or not os.path.isfile(self.path):
+            self.save()
+        return updated
+    
+    def find(self, symbol=None, timeframe=None, start=None, end=None):
+        """
+        جستجوی فایل‌ها بدون باز کردن آن‌ها
+        
+        پارامترها:
+            symbol (str | list): نماد یا لیست نمادها (بدون حساسیت به حروف بزرگ و کوچک)
+            timeframe (str | list): تایم‌فریم یا لیست تایم‌فریم‌ها
+            start (str | Timestamp): فقط فایل‌هایی که داده‌ای از این زمان به بعد دارند
+            end (str | Timestamp): فقط فایل‌هایی که داده‌ای قبل از این زمان دارند
+        
+        خروجی:
+            list: مشخصات فایل‌ها به ترتیب نماد و تایم‌فریم
+        """
+        def names(value):
+            if value is None:
+                return None
+            return {str(item).upper() for item in ([value] if isinstance(value, str) else value)}
+        
+        symbols, timeframes = names(symbol), names(timeframe)
+        start = pd.Timestamp(start) if start is not None else None
+        end = pd.Timestamp(end) if end is not None else None
+        result = []
+        for entry in self.entries.values():
+            if entry.get('error') or not entry.get('bars') or entry.get('first') is None:
+                continue
+            if symbols is not None and str(entry['symbol']).upper() not in symbols:
+                continue
+            if timeframes is not None and entry['timeframe'] not in timeframes:
+                continue
+            if start is not None and pd.Timestamp(entry['last']) < start:
+                continue
+            if end is not None and pd.Timestamp(entry['first']) >= end:
+                continue
+            result.append(entry)
+        return sorted(result, key=lambda entry: (entry['symbol'], list(TIMEFRAMES).index(entry['timeframe'])
+                                                 if entry['timeframe'] in TIMEFRAMES else -1, entry['file']))
+    
+    def load(self, name, start=None, end=None, float32=False):
+        """
+        بارگذاری یک فایل کاتالوگ و برش بازه زمانی
+        
+        پارامترها:
+            name (str): نام فایل
+            start (str | Timestamp): اولین زمان (شامل)
+            end (str | Timestamp): پایان بازه (غیر شامل)
+            float32 (bool): قیمت‌ها به صورت float32
+        
+        خروجی:
+            tuple: (DataFrame داده‌ها، نماد، تایم‌فریم)
+        """
+        entry = self.entries.get(name)
+        if entry is None or entry.get('error'):
+            raise ValueError(f"فایل {name} در کاتالوگ وجود ندارد")
+        with contextlib.redirect_stdout(io.StringIO()):
+            data = load_csv_data(self.file_path(name), float32=float32)[0]
+        return slice_dates(data, start, end), entry['symbol'], entry['timeframe']
+    
+    def to_frame(self):
+        """مشخصات فایل‌ها به صورت جدول برای نمایش"""
+        columns = ['file', 'symbol', 'timeframe', 'bars', 'first', 'last', 'size', 'error']
+        return pd.DataFrame([{column: entry.get(column) for column in columns} for entry in self.entries.values()],
+                            columns=columns)
+
+def select_files(paths, symbol=None, timeframe=None, start=None, end=None):
+    """
+    انتخاب فایل‌ها بر اساس نماد، تایم‌فریم و بازه زمانی از روی کاتالوگ پوشه آن‌ها
+    
+    کاتالوگ هر پوشه قبل از جستجو به‌روز می‌شود (فقط فایل‌های تغییر یافته بررسی می‌شوند).
+    
+    خروجی:
+        list: مسیر فایل‌های انتخاب شده به ترتیب ورودی
+    """
+    by_directory = {}
+    for path in paths:
+        by_directory.setdefault(os.path.dirname(os.path.abspath(path)), []).append(path)
+    
+    selected = set()
+    for directory, files in by_directory.items():
+        catalog = DatasetCatalog(directory)
+        catalog.refresh(files)
+        selected.update(os.path.join(directory, entry['file'])
+                        for entry in catalog.find(symbol, timeframe, start, end))
+    return [path for path in paths if os.path.abspath(path) in selected]
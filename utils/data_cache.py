@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+کش دودویی ستونی داده‌های بارگذاری شده از فایل‌های CSV
+
+هر ستون جدول نهایی (پس از شناسایی ستون‌ها و ترکیب تاریخ و ساعت) در یک فایل .npy
+جداگانه ذخیره می‌شود. کلید کش مسیر، اندازه و زمان تغییر فایل CSV است؛ بنابراین با
+تغییر فایل کش قبلی خودبه‌خود نامعتبر می‌شود. بارگذاری دوباره با نگاشت حافظه
+(memory-map) انجام می‌شود: هیچ متنی تجزیه نمی‌شود، فقط صفحات لازم از دیسک خوانده
+می‌شوند و چند پردازه همان صفحات حافظه را به اشتراک می‌گذارند.
+
+ساختار:
+    csv/.cache/EURUSD_M1.csv.f64.<کلید>/
+        meta.json
+        Date.npy, Open.npy, High.npy, Low.npy, Close.npy, Volume.npy
+    csv/.cache/EURUSD_M1.csv.f64.H1.<کلید>/
+        جدول مشتق شده از همان فایل (variant)، مثلاً تایم‌فریم بالاتر
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# نسخه قالب کش؛ با تغییر نحوه بارگذاری یا ذخیره افزایش می‌یابد تا کش‌های قدیمی استفاده نشوند
+CACHE_VERSION = 1
+
+# نام پوشه کش در کنار فایل‌های CSV
+CACHE_DIR_NAME = '.cache'
+
+def cache_root(file_path):
+    """پوشه کش فایل‌های یک پوشه"""
+    return os.path.join(os.path.dirname(os.path.abspath(file_path)), CACHE_DIR_NAME)
+
+def cache_key(file_path, float32=False, variant=''):
+    """
+    کلید کش یک فایل
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        float32 (bool): قیمت‌ها به صورت float32
+        variant (str): نام جدول مشتق شده از فایل (خالی برای خود فایل)
+    
+    خروجی:
+        str: کلید (بر اساس مسیر، اندازه، زمان تغییر و تنظیمات بارگذاری)
+    """
+    stat = os.stat(file_path)
+    source = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}|{float32}|{variant}|{CACHE_VERSION}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:16]
+
+def _cache_prefix(file_path, float32, variant=''):
+    # نام variant بدون نقطه است تا پیشوند جدول‌های مختلف با هم اشتباه نشود
+    variant = re.sub(r'[^0-9A-Za-z_+-]', '-', variant)
+    return f"{os.path.basename(file_path)}.{'f32' if float32 else 'f64'}.{variant + '.' if variant else ''}"
+
+def cache_path(file_path, float32=False, variant=''):
+    """مسیر پوشه کش یک فایل (یا جدول مشتق شده از آن) با تنظیمات داده شده"""
+    return os.path.join(cache_root(file_path),
+                        _cache_prefix(file_path, float32, variant) + cache_key(file_path, float32, variant))
+
+def load_cached_frame(file_path, float32=False, variant=''):
+    """
+    بارگذاری جدول از کش با نگاشت حافظه
+    
+    ستون‌ها فقط خواندنی هستند و روی فایل‌های کش قرار دارند.
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        float32 (bool): قیمت‌ها به صورت float32
+        variant (str): نام جدول مشتق شده از فایل (خالی برای خود فایل)
+    
+    خروجی:
+        tuple: (DataFrame، dict مشخصات) یا None اگر کش معتبری وجود نداشته باشد
+    """
+    path = cache_path(file_path, float32, variant)
+    try:
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r') for name in meta['columns']}
+    except (OSError, ValueError, KeyError):
+        return None
+    
+    if any(len(values) != meta['length'] for values in columns.values()):
+        return None
+    return pd.DataFrame(columns, index=pd.RangeIndex(meta['length']), copy=False), meta
+
+def save_cached_frame(file_path, data, float32=False, variant='', **info):
+    """
+    ذخیره جدول در کش
+    
+    فایل‌ها ابتدا در یک پوشه موقت نوشته و سپس یکجا جایگزین می‌شوند؛ بنابراین
+    پردازه دیگری کش نیمه‌کاره نمی‌بیند. کش‌های قدیمی همان فایل حذف می‌شوند.
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        data (DataFrame): جدول بارگذاری شده (ستون‌های عددی و تاریخ)
+        float32 (bool): قیمت‌ها به صورت float32
+        variant (str): نام جدول مشتق شده از فایل (خالی برای خود فایل)
+        **info: مشخصات اضافی برای ذخیره در meta.json (مثلاً symbol و timeframe)
+    
+    خروجی:
+        str: مسیر پوشه کش
+    """
+    path = cache_path(file_path, float32, variant)
+    root = os.path.dirname(path)
+    os.makedirs(root, exist_ok=True)
+    
+    temp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+    os.makedirs(temp_path)
+    try:
+        for name in data.columns:
+            np.save(os.path.join(temp_path, f"{name}.npy"), np.ascontiguousarray(data[name].to_numpy()))
+        meta = dict(info, source=os.path.abspath(file_path), length=len(data), columns=list(data.columns),
+                    dtypes={name: str(data[name].dtype) for name in data.columns}, float32=float32,
+                    variant=variant, version=CACHE_VERSION)
+        with open(os.path.join(temp_path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    except BaseException:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+    
+    clear_cache(file_path, float32, keep=os.path.basename(path), variant=variant)
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        # پردازه دیگری همزمان همین کش را ساخته است
+        shutil.rmtree(temp_path, ignore_errors=True)
+        if not os.path.isdir(path):
+            raise
+    return path
+
+def clear_cache(file_path, float32=None, keep=None, variant=None):
+    """
+    حذف کش‌های یک فایل
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        float32 (bool): فقط کش‌های با این تنظیم (None برای همه)
+        keep (str): نام پوشه کشی که حذف نشود
+        variant (str): فقط کش‌های این جدول مشتق شده ('' برای خود فایل، None برای همه)
+    """
+    root = cache_root(file_path)
+    if not os.path.isdir(root):
+        return
+    prefixes = tuple(_cache_prefix(file_path, option, variant or '')
+                     for option in ((False, True) if float32 is None else (float32,)))
+    for name in os.listdir(root):
+        if not name.startswith(prefixes) or name == keep or '.tmp-' in name:
+            continue
+        # بخش باقیمانده نام فقط کلید است مگر اینکه کش مربوط به variant دیگری باشد
+        if variant is not None and '.' in name[len(prefixes[0]):]:
+            continue
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
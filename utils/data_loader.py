@@ -1,79 +1,373 @@
 # -*- coding: utf-8 -*-
 """
 ماژول بارگذاری داده‌ها از فایل‌های CSV
+
+ستون‌ها از روی سطر عنوان شناسایی شده و فقط ستون‌های لازم با نوع مشخص در یک گذر
+خوانده می‌شوند (قیمت‌ها به صورت float). ستون ساعت جداگانه با تبدیل فقط مقادیر
+یکتای آن با تاریخ ترکیب می‌شود و زمان دقیق کندل (datetime64[ns]) به دست می‌آید.
 """
 
-import pandas as pd
-import re
+import importlib.util
 import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.data_cache import load_cached_frame, save_cached_frame
+
+# ستون‌های ضروری
+REQUIRED_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# نام‌های شناخته شده هر ستون (حروف کوچک، بدون فاصله و علائم)
+COLUMN_ALIASES = {
+    'Date': ('date', 'datetime', 'timestamp', 'gmttime', 'localtime'),
+    'Time': ('time',),
+    'Open': ('open', 'o'),
+    'High': ('high', 'h'),
+    'Low': ('low', 'l'),
+    'Close': ('close', 'c', 'last'),
+    'Volume': ('volume', 'vol', 'tickvol', 'tickvolume', 'realvolume', 'v')
+}
+
+# تعداد سطرهای هر تکه در خواندن فایل
+CHUNK_ROWS = 500_000
+
+# تایم‌فریم در نام فایل (نام‌های طولانی‌تر ابتدا)
+_TIMEFRAME_PATTERN = r'(M15|M30|M1|M5|H1|H4|D1|W1|MN)'
+
+# قالب‌های ستون ساعت به ترتیب بررسی
+TIME_FORMATS = ('%H:%M:%S.%f', '%H:%M:%S', '%H:%M', '%H%M', '%H%M%S')
 
-def load_csv_data(file_path):
+def _normalize_name(name):
+    """نام ستون به حروف کوچک و بدون علائم، مثلاً '<TICKVOL>' به 'tickvol'"""
+    return re.sub(r'[^0-9a-z]', '', str(name).lower())
+
+def read_header(file_path):
+    """خواندن سطر عنوان و تشخیص جداکننده (کاما، نقطه‌ویرگول یا تب)"""
+    with open(file_path, 'r', encoding='utf-8-sig', errors='replace') as f:
+        header = f.readline().rstrip('\r\n')
+    separator = max([',', ';', '\t'], key=header.count)
+    return header.split(separator), separator
+
+def match_columns(columns, aliases=COLUMN_ALIASES, required=REQUIRED_COLUMNS):
     """
-    بارگذاری داده‌های بازار مالی از فایل CSV
+    نگاشت ستون‌های فایل به نام‌های استاندارد
+    
+    ابتدا نام‌های شناخته شده به صورت دقیق مقایسه می‌شوند و فقط برای ستون‌هایی که
+    پیدا نشده‌اند شامل بودن نام بررسی می‌شود؛ بنابراین ستونی مانند Openint با
+    Open اشتباه گرفته نمی‌شود.
     
     پارامترها:
-        file_path (str): مسیر فایل CSV
-        
+        columns (list): نام ستون‌های فایل
+        aliases (dict): {نام استاندارد: نام‌های شناخته شده}
+        required (list): ستون‌های ضروری (با جستجوی شامل بودن نام)
+    
     خروجی:
-        tuple: (DataFrame داده‌ها، نماد، تایم‌فریم)
+        dict: {نام ستون فایل: نام استاندارد}
+    """
+    normalized = {column: _normalize_name(column) for column in columns}
+    mapping = {}
+    for target, names in aliases.items():
+        for column, name in normalized.items():
+            if column not in mapping and name in names:
+                mapping[column] = target
+                break
+    
+    for target in required:
+        if target in mapping.values():
+            continue
+        candidates = [column for column, name in normalized.items()
+                      if column not in mapping and target.lower() in name]
+        if len(candidates) == 1:
+            mapping[candidates[0]] = target
+    
+    return mapping
+
+def parser_engine():
+    """سریع‌ترین موتور موجود read_csv (pyarrow در صورت نصب، در غیر این صورت c)"""
+    return 'pyarrow' if importlib.util.find_spec('pyarrow') is not None else 'c'
+
+def _parse_dates(values):
+    """تبدیل ستون تاریخ (یا تاریخ و ساعت) به datetime64[ns]"""
+    codes, uniques = None, values
+    sample = values[:1024]
+    if len(values) > 2 * len(sample) and len(pd.unique(sample)) * 2 <= len(sample):
+        # ستون تاریخ بدون ساعت فقط چند مقدار یکتا دارد که هر کدام یک بار تبدیل می‌شوند
+        codes, uniques = pd.factorize(values)
+    try:
+        dates = pd.to_datetime(uniques).to_numpy('datetime64[ns]')
+    except ValueError:
+        # قالب‌های ناهمگون (مثلاً با و بدون ساعت)
+        dates = pd.to_datetime(uniques, format='mixed').to_numpy('datetime64[ns]')
+    if codes is None:
+        return dates
+    result = dates[codes]
+    result[codes < 0] = np.datetime64('NaT')
+    return result
+
+def _parse_fixed_times(values):
+    """
+    تبدیل سریع ساعت‌های هم‌طول به قالب HH:MM، HH:MM:SS یا HH:MM:SS.fff (مثلاً ستون ساعت فایل تیک)
+    
+    رقم‌ها مستقیماً از بایت‌های متن خوانده می‌شوند.
+    
+    خروجی:
+        ndarray: timedelta64[ns] یا None اگر مقادیر این قالب را نداشته باشند
+    """
+    try:
+        text = np.asarray(values, dtype=object).astype('S')
+    except (UnicodeEncodeError, ValueError):
+        return None
+    width = text.dtype.itemsize
+    if len(text) == 0 or width < 5 or width == 6 or width == 7 or width == 9 or width > 18:
+        return None
+    chars = text.view(np.uint8).reshape(len(text), width)
+    separators = {2: ord(':'), 5: ord(':'), 8: ord('.')}
+    for position in range(width):
+        column = chars[:, position]
+        expected = separators.get(position)
+        if expected is not None:
+            if not np.all(column == expected):
+                return None
+        elif not np.all((column >= 48) & (column <= 57)):
+            # رقم نیست یا طول مقادیر یکسان نیست (بایت صفر انتهایی)
+            return None
+    
+    digits = chars.astype(np.int64) - 48
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 3] * 10 + digits[:, 4]
+    seconds = digits[:, 6] * 10 + digits[:, 7] if width >= 8 else 0
+    if np.any(hours > 23) or np.any(minutes > 59) or np.any(seconds > 59):
+        # مقدار نامعتبر؛ بررسی دقیق با قالب‌های TIME_FORMATS
+        return None
+    seconds = hours * 3600 + minutes * 60 + seconds
+    nanoseconds = seconds * 1_000_000_000
+    if width > 9:
+        fraction = np.zeros(len(text), dtype=np.int64)
+        for position in range(9, width):
+            fraction = fraction * 10 + digits[:, position]
+        nanoseconds += fraction * 10 ** (18 - width)
+    return nanoseconds.view('timedelta64[ns]')
+
+def _parse_times(values):
+    """
+    تبدیل ستون ساعت به فاصله از ابتدای روز (timedelta64[ns])
+    
+    هر ساعت یکتا (حداکثر چند هزار مقدار در فایل کندل) فقط یک بار تبدیل می‌شود.
+    """
+    codes, uniques = pd.factorize(values)
+    offsets = _parse_fixed_times(uniques)
+    if offsets is not None:
+        result = offsets[codes]
+        result[codes < 0] = np.timedelta64('NaT')
+        return result
+    
+    uniques = pd.Index(uniques).astype(str).str.strip()
+    for time_format in TIME_FORMATS:
+        try:
+            times = pd.to_datetime(uniques, format=time_format)
+        except ValueError:
+            continue
+        offsets = (times - times.normalize()).to_numpy('timedelta64[ns]')
+        result = offsets[codes]
+        result[codes < 0] = np.timedelta64('NaT')
+        return result
+    raise ValueError(f"قالب ستون ساعت شناخته نشد: {uniques[0]}")
+
+def _report_range(df):
+    """چاپ تعداد رکوردها و بازه زمانی (داده‌ها مرتب هستند)"""
+    print(f"تعداد رکوردها: {len(df)}")
+    if 'Date' in df.columns and len(df):
+        print(f"بازه زمانی: از {df['Date'].iloc[0]} تا {df['Date'].iloc[-1]}")
+
+def parse_timestamps(dates, times=None):
+    """
+    تبدیل ستون تاریخ و در صورت وجود ستون ساعت جداگانه به زمان دقیق
+    
+    پارامترها:
+        dates (Series): ستون تاریخ (یا تاریخ و ساعت)
+        times (Series): ستون ساعت (اختیاری)
+    
+    خروجی:
+        ndarray: datetime64[ns]
+    """
+    result = _parse_dates(dates)
+    if times is not None:
+        result = result.astype('datetime64[D]').astype('datetime64[ns]') + _parse_times(times)
+    return result
+
+def convert_chunk(chunk):
+    """تبدیل یک تکه خوانده شده (با نام‌های استاندارد ستون‌ها) به آرایه‌های نهایی ستون‌ها"""
+    columns = {}
+    if 'Date' in chunk.columns:
+        # ترکیب تاریخ و ساعت به زمان دقیق کندل
+        columns['Date'] = parse_timestamps(chunk['Date'], chunk['Time'] if 'Time' in chunk.columns else None)
+    for col in REQUIRED_COLUMNS:
+        if col in chunk.columns:
+            columns[col] = chunk[col].to_numpy()
+    return columns
+
+def parse_file_name(file_path):
     """
-    # خواندن فایل CSV
-    df = pd.read_csv(file_path)
+    استخراج نماد و تایم‌فریم از نام فایل
     
-    # استخراج نام نماد و تایم‌فریم از نام فایل
+    خروجی:
+        tuple: (نماد، تایم‌فریم) یا "Unknown" برای مقادیر نامشخص
+    """
     file_name = os.path.basename(file_path)
     symbol_match = re.search(r'([A-Z]+/[A-Z]+|[A-Z]+)', file_name)
-    timeframe_match = re.search(r'(M1|M5|M15|M30|H1|H4|D1|W1|MN)', file_name, re.IGNORECASE)
+    # ترجیح تایم‌فریم جدا شده با علائم (مثلاً SYM5_M15 تایم‌فریم M15 است نه M5)
+    timeframe_match = (re.search(r'(?<![A-Za-z0-9])' + _TIMEFRAME_PATTERN + r'(?![A-Za-z0-9])', file_name, re.IGNORECASE)
+                       or re.search(_TIMEFRAME_PATTERN + r'(?!\d)', file_name, re.IGNORECASE))
     
     symbol = symbol_match.group(1) if symbol_match else "Unknown"
     timeframe = timeframe_match.group(1) if timeframe_match else "Unknown"
+    return symbol, timeframe
+
+def csv_read_options(file_path, float32=False):
+    """
+    شناسایی ستون‌های فایل و تنظیمات read_csv برای خواندن فقط ستون‌های لازم با نوع مشخص
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        float32 (bool): ستون‌های قیمت به صورت float32
+    
+    خروجی:
+        tuple: (نام ستون‌های سطر عنوان، dict نگاشت ستون‌ها، dict تنظیمات read_csv)
+    """
+    # شناسایی ستون‌ها از روی سطر عنوان
+    header, separator = read_header(file_path)
+    mapping = match_columns(header)
+    for col in REQUIRED_COLUMNS:
+        if col not in mapping.values():
+            print(f"هشدار: ستون {col} در فایل وجود ندارد.")
+    
+    # خواندن فقط ستون‌های لازم با نوع مشخص
+    price_dtype = np.float32 if float32 else np.float64
+    dtypes = {}
+    for column, target in mapping.items():
+        if target in ('Date', 'Time'):
+            dtypes[column] = object
+        elif target == 'Volume':
+            dtypes[column] = np.float64
+        else:
+            dtypes[column] = price_dtype
+    return header, mapping, dict(sep=separator, usecols=list(mapping), dtype=dtypes)
+
+def _read_chunks(file_path, float32=False, chunk_rows=CHUNK_ROWS, engine=None):
+    """
+    خواندن تکه‌ای فایل و تبدیل هر تکه به آرایه‌های نهایی ستون‌ها
+    
+    خروجی:
+        generator: dict {نام ستون: ndarray} برای هر تکه
+    """
+    _, mapping, options = csv_read_options(file_path, float32)
+    engine = engine or parser_engine()
+    options.update(engine=engine, encoding='utf-8-sig')
+    if engine == 'c':
+        # خواندن تکه‌ای: متن تاریخ و ساعت هر تکه پس از تبدیل آزاد می‌شود
+        chunks = pd.read_csv(file_path, chunksize=chunk_rows, **options)
+    else:
+        chunks = [pd.read_csv(file_path, **options)]
+    
+    for chunk in chunks:
+        yield convert_chunk(chunk.rename(columns=mapping))
+
+def iter_csv_chunks(file_path, chunk_rows=CHUNK_ROWS, float32=False):
+    """
+    خواندن فایل CSV به صورت تکه‌های متوالی با حافظه محدود
+    
+    فایل باید بر اساس زمان مرتب باشد (مانند خروجی متاتریدر)؛ در غیر این صورت
+    ValueError ایجاد می‌شود. هر تکه ستون‌های load_csv_data را دارد.
     
-    # تبدیل ستون تاریخ به تایپ datetime
-    if 'Date' in df.columns or 'date' in df.columns:
-        date_col = 'Date' if 'Date' in df.columns else 'date'
-        df[date_col] = pd.to_datetime(df[date_col])
-    
-    # بررسی و تغییر نام ستون‌های ضروری
-    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-    column_mapping = {}
-    
-    for col in df.columns:
-        for req_col in required_columns:
-            if req_col.lower() in col.lower():
-                column_mapping[col] = req_col
-    
-    # تغییر نام ستون‌ها
-    if column_mapping:
-        df = df.rename(columns=column_mapping)
-    
-    # اطمینان از وجود ستون‌های ضروری
-    for col in required_columns:
-        if col not in df.columns:
-            if col == 'Volume' and 'volume' in df.columns:
-                df = df.rename(columns={'volume': 'Volume'})
-            elif col == 'Close' and 'close' in df.columns:
-                df = df.rename(columns={'close': 'Close'})
-            elif col == 'Open' and 'open' in df.columns:
-                df = df.rename(columns={'open': 'Open'})
-            elif col == 'High' and 'high' in df.columns:
-                df = df.rename(columns={'high': 'High'})
-            elif col == 'Low' and 'low' in df.columns:
-                df = df.rename(columns={'low': 'Low'})
-            else:
-                print(f"هشدار: ستون {col} در فایل وجود ندارد.")
-    
-    # تنظیم ایندکس
-    if 'Date' in df.columns:
-        df.set_index('Date', inplace=True)
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        chunk_rows (int): تعداد سطرهای هر تکه
+        float32 (bool): ذخیره ستون‌های قیمت به صورت float32
+    
+    خروجی:
+        generator: DataFrame هر تکه
+    """
+    last_date = None
+    # موتور pyarrow خواندن تکه‌ای را پشتیبانی نمی‌کند
+    for columns in _read_chunks(file_path, float32, chunk_rows, engine='c'):
+        chunk = pd.DataFrame(columns, copy=False)
+        if 'Date' in chunk.columns and len(chunk):
+            dates = chunk['Date']
+            if not dates.is_monotonic_increasing or (last_date is not None and dates.iloc[0] < last_date):
+                raise ValueError(f"داده‌های فایل {os.path.basename(file_path)} بر اساس زمان مرتب نیستند")
+            last_date = dates.iloc[-1]
+        yield chunk
+
+def slice_dates(data, start=None, end=None):
+    """
+    برش کندل‌های بازه [start, end) با جستجوی دودویی روی ستون Date مرتب (بدون کپی)
+    
+    پارامترها:
+        data (DataFrame): داده‌های مرتب بر اساس Date
+        start (str | Timestamp): اولین زمان (شامل)
+        end (str | Timestamp): پایان بازه (غیر شامل)
+    
+    خروجی:
+        DataFrame: کندل‌های بازه با شماره سطر از صفر
+    """
+    if start is None and end is None:
+        return data
+    dates = data['Date'].to_numpy()
+    first = 0 if start is None else dates.searchsorted(pd.Timestamp(start).to_datetime64())
+    last = len(dates) if end is None else dates.searchsorted(pd.Timestamp(end).to_datetime64())
+    return data.iloc[first:last].reset_index(drop=True)
+
+def load_csv_data(file_path, float32=False, cache=True):
+    """
+    بارگذاری داده‌های بازار مالی از فایل CSV
+    
+    فقط ستون‌های تاریخ، ساعت و OHLCV خوانده می‌شوند. اگر فایل ستون ساعت جداگانه
+    داشته باشد با تاریخ ترکیب می‌شود.
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        float32 (bool): ذخیره ستون‌های قیمت به صورت float32 (نصف حافظه)
+        cache (bool): استفاده از کش دودویی (utils.data_cache)؛ اگر فایل از آخرین
+            بارگذاری تغییر نکرده باشد ستون‌ها با نگاشت حافظه و بدون تجزیه متن
+            بارگذاری می‌شوند و فقط خواندنی هستند
+    
+    خروجی:
+        tuple: (DataFrame داده‌ها، نماد، تایم‌فریم)
+    """
+    symbol, timeframe = parse_file_name(file_path)
+    
+    cached = load_cached_frame(file_path, float32) if cache else None
+    if cached is not None:
+        df = cached[0]
+        print(f"داده‌های {symbol} با تایم‌فریم {timeframe} از کش بارگذاری شد.")
+        _report_range(df)
+        return df, symbol, timeframe
+    
+    parts = {}
+    for columns in _read_chunks(file_path, float32):
+        for name, values in columns.items():
+            parts.setdefault(name, []).append(values)
+        del columns
+    
+    columns = {name: np.concatenate(parts.pop(name)) for name in list(parts)}
+    df = pd.DataFrame(columns, copy=False)
+    del columns
     
     # مرتب‌سازی داده‌ها بر اساس تاریخ (صعودی)
-    df.sort_index(inplace=True)
+    if 'Date' in df.columns and not df['Date'].is_monotonic_increasing:
+        order = np.argsort(df['Date'].to_numpy(), kind='stable')
+        df = df.take(order).reset_index(drop=True)
     
-    # برگرداندن ایندکس به ستون عادی برای استفاده راحت‌تر
-    df.reset_index(inplace=True)
+    if cache:
+        try:
+            save_cached_frame(file_path, df, float32, symbol=symbol, timeframe=timeframe)
+        except OSError as e:
+            # پوشه فقط خواندنی یا دیسک پر: بارگذاری بدون کش ادامه می‌یابد
+            print(f"هشدار: ذخیره کش ممکن نیست: {e}")
     
     print(f"داده‌های {symbol} با تایم‌فریم {timeframe} بارگذاری شد.")
-    print(f"تعداد رکوردها: {len(df)}")
-    print(f"بازه زمانی: از {df['Date'].min()} تا {df['Date'].max()}")
+    _report_range(df)
     
-    return df, symbol, timeframe
\ No newline at end of file
+    return df, symbol, timeframe
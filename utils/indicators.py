@@ -3,17 +3,273 @@
 ماژول محاسبه اندیکاتورهای تکنیکال
 """
 
+import hashlib
+import inspect
+import threading
+import weakref
+from collections import OrderedDict
+from functools import wraps
+
 import numpy as np
 import pandas as pd
 
+class IndicatorCache:
+    """
+    کش LRU برای نتایج اندیکاتورها
+    
+    کلید هر ورودی (اثرانگشت محتوای داده‌ها، نام اندیکاتور، پارامترها) است؛ بنابراین
+    اجرای چند استراتژی روی یک فایل (حتی روی کپی‌های مختلف آن) محاسبات مشترک
+    مانند RSI(14) یا EMA(50) را دوباره انجام نمی‌دهد.
+    """
+    
+    def __init__(self, max_bytes=512 * 1024 * 1024, enabled=True):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            max_bytes (int): حداکثر حافظه مصرفی کش (بایت)
+            enabled (bool): فعال بودن کش
+        """
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key):
+        """برگرداندن مقدار ذخیره شده برای کلید (یا None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, value, nbytes):
+        """ذخیره یک مقدار و حذف قدیمی‌ترین ورودی‌ها در صورت عبور از سقف حافظه"""
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            self._evict()
+    
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._bytes -= nbytes
+            self.evictions += 1
+    
+    def set_max_bytes(self, max_bytes):
+        """تغییر سقف حافظه کش"""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+    
+    def clear(self):
+        """پاک کردن کامل کش، آمار آن و هش‌های ذخیره شده ستون‌ها"""
+        with _column_digests_lock:
+            _column_digests.clear()
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self):
+        """
+        آمار کش
+        
+        خروجی:
+            dict: تعداد hit و miss، نرخ hit، تعداد حذف‌ها، تعداد ورودی‌ها و حافظه مصرفی
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': (self.hits / lookups) * 100 if lookups > 0 else 0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+# کش سراسری اندیکاتورها
+indicator_cache = IndicatorCache()
+
+# هش ستون‌های محاسبه شده برای هر بافر داده
+# {id آرایه مالک حافظه: (weakref آرایه، {(آدرس، شکل، گام‌ها، نوع): (نمونه مقادیر، هش)})}
+_column_digests = {}
+_column_digests_lock = threading.RLock()
+
+# تعداد تقریبی مقادیر نمونه‌ای که در هر استفاده از هش ذخیره شده دوباره مقایسه می‌شوند
+_DIGEST_SAMPLE = 256
+
+def _forget_buffer(ref):
+    """حذف هش‌های یک بافر پس از آزاد شدن آن"""
+    with _column_digests_lock:
+        for key, (stored, _) in list(_column_digests.items()):
+            if stored is ref:
+                del _column_digests[key]
+
+def _column_digest(values):
+    """
+    هش محتوای یک ستون عددی، یک بار برای هر بافر
+    
+    هش بر اساس آرایه مالک حافظه (با weakref)، آدرس داده، شکل، گام‌ها و نوع ذخیره
+    می‌شود؛ بنابراین فراخوانی‌های بعدی روی همان DataFrame (یا برش‌ها و نماهای
+    بدون کپی آن) کل ستون را دوباره هش نمی‌کنند. نمونه‌ای از مقادیر (حدود 256 مقدار
+    با فاصله یکسان و آخرین مقدار) همراه هش ذخیره و در هر استفاده مقایسه می‌شود تا
+    تغییر درجای بیشتر ستون به هش دوباره منجر شود؛ تغییر درجای مقادیر خارج از نمونه
+    تشخیص داده نمی‌شود و پس از آن باید indicator_cache.clear() فراخوانده شود.
+    """
+    owner = values
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    key = (values.__array_interface__['data'][0], values.shape, values.strides, values.dtype.str)
+    step = max(1, len(values) // _DIGEST_SAMPLE)
+    sample = np.concatenate((values[::step], values[-1:])).tobytes()
+    
+    with _column_digests_lock:
+        entry = _column_digests.get(id(owner))
+        if entry is not None and entry[0]() is owner:
+            stored = entry[1].get(key)
+            if stored is not None and stored[0] == sample:
+                return stored[1]
+    
+    digest = hashlib.blake2b(np.ascontiguousarray(values).view(np.uint8), digest_size=16).digest()
+    with _column_digests_lock:
+        entry = _column_digests.get(id(owner))
+        if entry is None or entry[0]() is not owner:
+            try:
+                entry = (weakref.ref(owner, _forget_buffer), {})
+            except TypeError:
+                return digest
+            _column_digests[id(owner)] = entry
+        entry[1][key] = (sample, digest)
+    return digest
+
+def dataset_fingerprint(data, columns):
+    """
+    محاسبه اثرانگشت محتوای ستون‌های داده
+    
+    هش هر ستون عددی برای هر بافر داده فقط یک بار محاسبه می‌شود (_column_digest)؛
+    بنابراین برخورد با کش اندیکاتورها روی داده‌های بزرگ هزینه هش کامل ندارد.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        columns (list): ستون‌هایی که در اثرانگشت لحاظ می‌شوند
+        
+    خروجی:
+        str: هش محتوای ستون‌ها
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(data)).encode())
+    for col in columns:
+        values = data[col].to_numpy()
+        digest.update(col.encode())
+        digest.update(values.dtype.str.encode())
+        if values.dtype == object:
+            digest.update(pd.util.hash_pandas_object(data[col], index=False).to_numpy().view(np.uint8))
+        else:
+            digest.update(_column_digest(values))
+    return digest.hexdigest()
+
+def cached_indicator(name, columns):
+    """
+    دکوراتور ذخیره نتایج یک تابع اندیکاتور در کش سراسری
+    
+    نتایج به صورت آرایه NumPy ذخیره می‌شوند و هنگام بازیابی با ایندکس داده‌های
+    ورودی دوباره به Series تبدیل می‌شوند.
+    
+    پارامترها:
+        name (str): نام اندیکاتور
+        columns (list): ستون‌های ورودی مورد استفاده اندیکاتور
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        def wrapper(data, *args, **kwargs):
+            if not indicator_cache.enabled:
+                return func(data, *args, **kwargs)
+            
+            bound = signature.bind(data, *args, **kwargs)
+            bound.apply_defaults()
+            params = tuple((key, value) for key, value in bound.arguments.items() if key != 'data')
+            key = (dataset_fingerprint(data, columns), name, params)
+            
+            cached = indicator_cache.get(key)
+            if cached is not None:
+                is_tuple, arrays, names = cached
+                outputs = tuple(pd.Series(arr.copy(), index=data.index, name=col) for arr, col in zip(arrays, names))
+                return outputs if is_tuple else outputs[0]
+            
+            result = func(data, *args, **kwargs)
+            is_tuple = isinstance(result, tuple)
+            outputs = result if is_tuple else (result,)
+            arrays = tuple(out.to_numpy(copy=True) for out in outputs)
+            names = tuple(out.name for out in outputs)
+            indicator_cache.put(key, (is_tuple, arrays, names), sum(arr.nbytes for arr in arrays))
+            return result
+        
+        return wrapper
+    return decorator
+
+@cached_indicator('ema', ['Close'])
 def calculate_ema(data, period=20):
     """محاسبه میانگین متحرک نمایی (EMA)"""
     return data['Close'].ewm(span=period, adjust=False).mean()
 
+@cached_indicator('sma', ['Close'])
 def calculate_sma(data, period=20):
     """محاسبه میانگین متحرک ساده (SMA)"""
     return data['Close'].rolling(window=period).mean()
 
+@cached_indicator('volume_sma', ['Volume'])
+def calculate_volume_sma(data, period=20):
+    """محاسبه میانگین متحرک ساده حجم معاملات"""
+    return data['Volume'].rolling(window=period).mean()
+
+def wilder_smoothing(values, period=14):
+    """
+    هموارسازی وایلدر (RMA) به صورت برداری
+    
+    مقدار اولیه، میانگین ساده‌ی `period` مقدار نخست است و پس از آن
+    avg[i] = (avg[i-1] * (period-1) + x[i]) / period
+    کل بازگشت به جای حلقه‌ی پایتونی با ewm (alpha=1/period) روی آرایه‌ی کامل انجام می‌شود.
+    
+    پارامترها:
+        values (Series | ndarray): مقادیر ورودی
+        period (int): دوره هموارسازی
+        
+    خروجی:
+        Series: مقادیر هموار شده (با همان ایندکس ورودی)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    arr = series.to_numpy(dtype=np.float64)
+    
+    seeded = np.full(len(arr), np.nan)
+    if len(arr) >= period:
+        seed = arr[:period].mean()
+        # اگر پنجره اولیه مقدار گمشده داشته باشد، مانند روش حلقه‌ای کل خروجی نامعتبر است
+        if not np.isnan(seed):
+            seeded[period-1] = seed
+            seeded[period:] = arr[period:]
+    
+    smoothed = pd.Series(seeded, index=series.index).ewm(alpha=1.0 / period, adjust=False).mean()
+    return smoothed
+
+@cached_indicator('rsi', ['Close'])
 def calculate_rsi(data, period=14):
     """
     محاسبه شاخص قدرت نسبی (RSI)
@@ -29,19 +285,16 @@ def calculate_rsi(data, period=14):
     gain = delta.where(delta > 0, 0)
     loss = -delta.where(delta < 0, 0)
     
-    avg_gain = gain.rolling(window=period).mean()
-    avg_loss = loss.rolling(window=period).mean()
-    
-    # برای محاسبات بعد از دوره اولیه
-    for i in range(period, len(delta)):
-        avg_gain.iloc[i] = (avg_gain.iloc[i-1] * (period-1) + gain.iloc[i]) / period
-        avg_loss.iloc[i] = (avg_loss.iloc[i-1] * (period-1) + loss.iloc[i]) / period
+    # میانگین‌گیری وایلدر روی کل آرایه
+    avg_gain = wilder_smoothing(gain, period)
+    avg_loss = wilder_smoothing(loss, period)
     
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     
     return rsi
 
+@cached_indicator('bollinger', ['Close'])
 def calculate_bollinger_bands(data, period=20, std_dev=2):
     """
     محاسبه باندهای بولینگر
@@ -62,6 +315,7 @@ def calculate_bollinger_bands(data, period=20, std_dev=2):
     
     return middle_band, upper_band, lower_band
 
+@cached_indicator('macd', ['Close'])
 def calculate_macd(data, fast_period=12, slow_period=26, signal_period=9):
     """
     محاسبه واگرایی/همگرایی میانگین متحرک (MACD)
@@ -84,6 +338,123 @@ def calculate_macd(data, fast_period=12, slow_period=26, signal_period=9):
     
     return macd_line, signal_line, histogram
 
+def rolling_extremes(values, windows, how='max'):
+    """
+    بیشینه یا کمینه متحرک برای چند طول پنجره به صورت همزمان
+    
+    از جدول دو برابر شونده (sparse table) استفاده می‌شود: بیشینه پنجره‌های به طول
+    توان‌های دو یک بار ساخته می‌شود و بین همه پنجره‌ها مشترک است؛ سپس هر پنجره
+    با ترکیب دو پنجره هم‌پوشان از این جدول به دست می‌آید. خروجی با rolling(window)
+    در pandas برابر است (پنجره‌های ناقص یا دارای مقدار گمشده nan می‌شوند).
+    
+    پارامترها:
+        values (Series | ndarray): مقادیر ورودی
+        windows (iterable): طول پنجره‌ها
+        how (str): 'max' یا 'min'
+        
+    خروجی:
+        dict: {طول پنجره: ndarray}
+    """
+    if how == 'max':
+        combine = np.maximum
+    elif how == 'min':
+        combine = np.minimum
+    else:
+        raise ValueError(f"نوع نامعتبر: {how}")
+    
+    arr = np.asarray(values, dtype=np.float64)
+    # مانند rolling در pandas، مقادیر بی‌نهایت گمشده در نظر گرفته می‌شوند
+    arr = np.where(np.isinf(arr), np.nan, arr)
+    n = len(arr)
+    windows = sorted(set(int(w) for w in windows))
+    if windows and windows[0] < 1:
+        raise ValueError("طول پنجره باید حداقل 1 باشد")
+    
+    needed_levels = {w.bit_length() - 1 for w in windows}
+    tables = {}
+    table = arr
+    level = 0
+    max_level = max(needed_levels) if needed_levels else -1
+    while level <= max_level:
+        if level in needed_levels:
+            tables[level] = table
+        if level == max_level:
+            break
+        # table[i] = ترکیب مقادیر بازه [i - 2^level + 1, i]
+        step = 1 << level
+        doubled = np.full(n, np.nan)
+        if step < n:
+            doubled[step:] = combine(table[step:], table[:-step])
+        table = doubled
+        level += 1
+    
+    results = {}
+    for window in windows:
+        level = window.bit_length() - 1
+        table = tables[level]
+        offset = window - (1 << level)
+        if offset == 0:
+            result = table.copy()
+            result[:window - 1] = np.nan
+        else:
+            result = np.full(n, np.nan)
+            if offset < n:
+                result[offset:] = combine(table[offset:], table[:-offset])
+        results[window] = result
+    
+    return results
+
+def rolling_high_low(data, windows):
+    """
+    سقف و کف متحرک برای چند طول پنجره در یک گذر مشترک
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        windows (iterable): طول پنجره‌ها
+        
+    خروجی:
+        dict: {طول پنجره: (highest_high, lowest_low)} به صورت Series
+    """
+    highs = rolling_extremes(data['High'].to_numpy(), windows, 'max')
+    lows = rolling_extremes(data['Low'].to_numpy(), windows, 'min')
+    
+    return {
+        window: (pd.Series(highs[window], index=data.index, name='High'),
+                 pd.Series(lows[window], index=data.index, name='Low'))
+        for window in highs
+    }
+
+def strict_extrema(values, window=5):
+    """
+    شماره نقاط اوج و حضیض اکید (بزرگ‌تر یا کوچک‌تر از window مقدار قبل و بعد)
+    
+    مقایسه‌ها روی آرایه انجام می‌شوند و نقطه‌ای که خودش یا یکی از همسایه‌هایش
+    مقدار گمشده داشته باشد اکسترمم نیست. window کندل ابتدا و انتها بررسی نمی‌شوند.
+    
+    پارامترها:
+        values (Series | ndarray): مقادیر ورودی
+        window (int): تعداد همسایه‌های هر طرف
+        
+    خروجی:
+        tuple: (شماره اوج‌ها، شماره حضیض‌ها) به صورت ndarray صعودی
+    """
+    arr = np.asarray(values, dtype=np.float64)
+    n = len(arr)
+    if n <= 2 * window:
+        empty = np.array([], dtype=np.intp)
+        return empty, empty
+    
+    center = arr[window:n - window]
+    is_high = np.ones(len(center), dtype=bool)
+    is_low = np.ones(len(center), dtype=bool)
+    for j in range(1, window + 1):
+        for neighbor in (arr[window - j:n - window - j], arr[window + j:n - window + j]):
+            is_high &= center > neighbor
+            is_low &= center < neighbor
+    
+    return np.flatnonzero(is_high) + window, np.flatnonzero(is_low) + window
+
+@cached_indicator('stochastic', ['High', 'Low', 'Close'])
 def calculate_stochastic(data, k_period=14, d_period=3):
     """
     محاسبه اسیلاتور استوکاستیک
@@ -96,36 +467,57 @@ def calculate_stochastic(data, k_period=14, d_period=3):
     خروجی:
         tuple: (k_line, d_line)
     """
-    lowest_low = data['Low'].rolling(window=k_period).min()
-    highest_high = data['High'].rolling(window=k_period).max()
+    highest_high, lowest_low = rolling_high_low(data, [k_period])[k_period]
     
     k_line = 100 * ((data['Close'] - lowest_low) / (highest_high - lowest_low))
     d_line = k_line.rolling(window=d_period).mean()
     
     return k_line, d_line
 
-def calculate_atr(data, period=14):
+def calculate_true_range(data):
+    """
+    محاسبه دامنه حقیقی (True Range) به صورت برداری
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        
+    خروجی:
+        Series: مقادیر دامنه حقیقی
+    """
+    high = data['High'].to_numpy(dtype=np.float64)
+    low = data['Low'].to_numpy(dtype=np.float64)
+    prev_close = data['Close'].shift().to_numpy(dtype=np.float64)
+    
+    # fmax مقادیر گمشده را نادیده می‌گیرد (مانند max روی ستون‌ها در pandas)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    
+    return pd.Series(true_range, index=data.index)
+
+@cached_indicator('atr', ['High', 'Low', 'Close'])
+def calculate_atr(data, period=14, smoothing='sma'):
     """
     محاسبه میانگین دامنه حقیقی (ATR)
     
     پارامترها:
         data (DataFrame): داده‌های قیمت
         period (int): دوره زمانی
+        smoothing (str): روش میانگین‌گیری ('sma' یا 'wilder')
         
     خروجی:
         Series: مقادیر ATR
     """
-    high_low = data['High'] - data['Low']
-    high_close = np.abs(data['High'] - data['Close'].shift())
-    low_close = np.abs(data['Low'] - data['Close'].shift())
-    
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = ranges.max(axis=1)
+    true_range = calculate_true_range(data)
     
-    atr = true_range.rolling(window=period).mean()
+    if smoothing == 'wilder':
+        atr = wilder_smoothing(true_range, period)
+    elif smoothing == 'sma':
+        atr = true_range.rolling(window=period).mean()
+    else:
+        raise ValueError(f"روش میانگین‌گیری نامعتبر: {smoothing}")
     
     return atr
 
+@cached_indicator('ichimoku', ['High', 'Low', 'Close'])
 def calculate_ichimoku(data, tenkan_period=9, kijun_period=26, senkou_b_period=52, displacement=26):
     """
     محاسبه ابر ایچیموکو
@@ -140,22 +532,22 @@ def calculate_ichimoku(data, tenkan_period=9, kijun_period=26, senkou_b_period=5
     خروجی:
         tuple: (tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span)
     """
+    # سقف و کف هر سه دوره در یک گذر مشترک
+    extremes = rolling_high_low(data, [tenkan_period, kijun_period, senkou_b_period])
+    
     # محاسبه تنکان سن (خط تبدیل)
-    tenkan_high = data['High'].rolling(window=tenkan_period).max()
-    tenkan_low = data['Low'].rolling(window=tenkan_period).min()
+    tenkan_high, tenkan_low = extremes[tenkan_period]
     tenkan_sen = (tenkan_high + tenkan_low) / 2
     
     # محاسبه کیجون سن (خط پایه)
-    kijun_high = data['High'].rolling(window=kijun_period).max()
-    kijun_low = data['Low'].rolling(window=kijun_period).min()
+    kijun_high, kijun_low = extremes[kijun_period]
     kijun_sen = (kijun_high + kijun_low) / 2
     
     # محاسبه سنکو اسپن A (خط اول ابر)
     senkou_span_a = ((tenkan_sen + kijun_sen) / 2).shift(displacement)
     
     # محاسبه سنکو اسپن B (خط دوم ابر)
-    senkou_high = data['High'].rolling(window=senkou_b_period).max()
-    senkou_low = data['Low'].rolling(window=senkou_b_period).min()
+    senkou_high, senkou_low = extremes[senkou_b_period]
     senkou_span_b = ((senkou_high + senkou_low) / 2).shift(displacement)
     
     # محاسبه چیکو اسپن (خط تأخیری)
@@ -163,6 +555,221 @@ def calculate_ichimoku(data, tenkan_period=9, kijun_period=26, senkou_b_period=5
     
     return tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span
 
+@cached_indicator('donchian', ['High', 'Low'])
+def calculate_donchian_channels(data, period=20):
+    """
+    محاسبه کانال دانچیان
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        period (int): دوره کانال
+        
+    خروجی:
+        tuple: (upper_channel, middle_channel, lower_channel)
+    """
+    upper_channel, lower_channel = rolling_high_low(data, [period])[period]
+    middle_channel = (upper_channel + lower_channel) / 2
+    
+    return upper_channel, middle_channel, lower_channel
+
+def detect_channel_breakout(data, periods=(20,)):
+    """
+    تشخیص شکست سقف یا کف چند کندل گذشته
+    
+    شکست صعودی: بسته شدن بالای سقف `period` کندل قبلی
+    شکست نزولی: بسته شدن زیر کف `period` کندل قبلی
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        periods (iterable): دوره‌های کانال
+        
+    خروجی:
+        DataFrame: ستون‌های Breakout_Up_<period> و Breakout_Down_<period>
+    """
+    close = data['Close'].to_numpy(dtype=np.float64)
+    breakouts = {}
+    
+    for period, (highest_high, lowest_low) in rolling_high_low(data, periods).items():
+        # مقایسه با کانال کندل قبلی (بدون احتساب کندل فعلی)
+        breakouts[f'Breakout_Up_{period}'] = close > _shift_array(highest_high.to_numpy(), 1)
+        breakouts[f'Breakout_Down_{period}'] = close < _shift_array(lowest_low.to_numpy(), 1)
+    
+    return pd.DataFrame(breakouts, index=data.index)
+
+def _price_series(data):
+    """سری قیمت بسته شدن به صورت float64 (از DataFrame، Series یا آرایه)"""
+    if isinstance(data, pd.DataFrame):
+        data = data['Close']
+    if isinstance(data, pd.Series):
+        return data.astype(np.float64)
+    return pd.Series(np.asarray(data, dtype=np.float64))
+
+def _matrix_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype not in (np.dtype(np.float32), np.dtype(np.float64)):
+        raise ValueError(f"نوع داده نامعتبر برای ماتریس اندیکاتور: {dtype}")
+    return dtype
+
+def _fill_matrix(n, params, compute, dtype, outputs=1):
+    """
+    ساخت ماتریس‌های (کندل × پارامتر) با محاسبه یک بار برای هر پارامتر یکتا
+    
+    compute برای هر پارامتر یکتا یک آرایه (یا outputs آرایه) برمی‌گرداند که مستقیماً
+    در ستون ماتریس نوشته می‌شود؛ ستون پارامترهای تکراری از اولین ستون همان پارامتر
+    کپی می‌شود و نتیجه جداگانه‌ای نگه داشته نمی‌شود. ستون‌ها به ترتیب Fortran ذخیره
+    می‌شوند تا نوشتن هر ستون پیوسته باشد.
+    
+    خروجی:
+        ndarray یا tuple: ماتریس (یا outputs ماتریس)
+    """
+    dtype = _matrix_dtype(dtype)
+    matrices = [np.empty((n, len(params)), dtype=dtype, order='F') for _ in range(outputs)]
+    first = {}
+    for col, param in enumerate(params):
+        if param in first:
+            for matrix in matrices:
+                matrix[:, col] = matrix[:, first[param]]
+            continue
+        first[param] = col
+        values = compute(param)
+        for matrix, column in zip(matrices, values if outputs > 1 else (values,)):
+            matrix[:, col] = column
+    return matrices[0] if outputs == 1 else tuple(matrices)
+
+def calculate_ema_matrix(data, periods, dtype=np.float64):
+    """
+    محاسبه EMA برای چند دوره به صورت یک ماتریس
+    
+    بازگشت EMA برای هر دوره ضریب جداگانه‌ای دارد؛ بنابراین این تابع یک پوشش دسته‌ای
+    است: ewm برای هر دوره یکتا یک بار اجرا و مستقیماً در ستون ماتریس نوشته می‌شود.
+    
+    پارامترها:
+        data (DataFrame | Series | ndarray): داده‌های قیمت
+        periods (list): دوره‌ها
+        dtype: نوع داده خروجی (float32 یا float64)
+        
+    خروجی:
+        ndarray: ماتریس (تعداد کندل‌ها × تعداد دوره‌ها)
+    """
+    close = _price_series(data)
+    return _fill_matrix(len(close), list(periods),
+                        lambda period: close.ewm(span=period, adjust=False).mean().to_numpy(), dtype)
+
+def calculate_sma_matrix(data, periods, dtype=np.float64):
+    """
+    محاسبه SMA برای چند دوره به صورت یک ماتریس
+    
+    rolling().mean() برای هر دوره یکتا یک بار اجرا و مستقیماً در ستون ماتریس نوشته
+    می‌شود؛ بنابراین مقادیر دقیقاً با calculate_sma برابرند (مجموع تجمعی مشترک خطای
+    گرد کردنی دارد که با طول داده‌ها رشد می‌کند).
+    
+    پارامترها:
+        data (DataFrame | Series | ndarray): داده‌های قیمت
+        periods (list): دوره‌ها
+        dtype: نوع داده خروجی (float32 یا float64)
+        
+    خروجی:
+        ndarray: ماتریس (تعداد کندل‌ها × تعداد دوره‌ها)
+    """
+    close = _price_series(data)
+    return _fill_matrix(len(close), list(periods),
+                        lambda period: close.rolling(window=period).mean().to_numpy(), dtype)
+
+def calculate_rsi_matrix(data, periods, dtype=np.float64):
+    """
+    محاسبه RSI برای چند دوره به صورت یک ماتریس
+    
+    تغییرات قیمت و سود/زیان فقط یک بار محاسبه و بین همه دوره‌ها مشترک است؛ هموارسازی
+    وایلدر هر دوره (بازگشتی با ضریب جداگانه) برای هر دوره یکتا یک بار اجرا می‌شود.
+    
+    پارامترها:
+        data (DataFrame | Series | ndarray): داده‌های قیمت
+        periods (list): دوره‌ها
+        dtype: نوع داده خروجی (float32 یا float64)
+        
+    خروجی:
+        ndarray: ماتریس (تعداد کندل‌ها × تعداد دوره‌ها)
+    """
+    close = _price_series(data)
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    
+    def compute(period):
+        rs = wilder_smoothing(gain, period) / wilder_smoothing(loss, period)
+        return (100 - (100 / (1 + rs))).to_numpy()
+    
+    return _fill_matrix(len(close), list(periods), compute, dtype)
+
+def calculate_bollinger_matrix(data, params, dtype=np.float64):
+    """
+    محاسبه باندهای بولینگر برای چند ترکیب (دوره، انحراف معیار)
+    
+    میانگین و انحراف معیار متحرک هر دوره یکتا یک بار محاسبه می‌شود و پیش از رفتن به
+    دوره بعد همه ستون‌های آن دوره (با ضرایب مختلف انحراف معیار) پر می‌شوند.
+    
+    پارامترها:
+        data (DataFrame | Series | ndarray): داده‌های قیمت
+        params (list): لیست (period, std_dev)
+        dtype: نوع داده خروجی (float32 یا float64)
+        
+    خروجی:
+        tuple: (middle, upper, lower) هر کدام ماتریس (تعداد کندل‌ها × تعداد ترکیب‌ها)
+    """
+    close = _price_series(data)
+    params = [tuple(param) for param in params]
+    dtype = _matrix_dtype(dtype)
+    n = len(close)
+    middle, upper, lower = (np.empty((n, len(params)), dtype=dtype, order='F') for _ in range(3))
+    
+    for period in dict.fromkeys(param[0] for param in params):
+        rolling = close.rolling(window=period)
+        mean = rolling.mean().to_numpy()
+        std = rolling.std().to_numpy()
+        for col, (param_period, std_dev) in enumerate(params):
+            if param_period == period:
+                middle[:, col] = mean
+                upper[:, col] = mean + (std * std_dev)
+                lower[:, col] = mean - (std * std_dev)
+    
+    return middle, upper, lower
+
+def calculate_macd_matrix(data, params, dtype=np.float64):
+    """
+    محاسبه MACD برای چند ترکیب (سریع، آهسته، سیگنال)
+    
+    EMA همه دوره‌های یکتا یک بار در یک ماتریس ساخته می‌شود و خط MACD همه ترکیب‌ها با
+    یک تفاضل ستونی به دست می‌آید. خط سیگنال برای هر دوره سیگنال یکتا با یک ewm روی
+    همه ستون‌های آن دوره محاسبه می‌شود.
+    
+    پارامترها:
+        data (DataFrame | Series | ndarray): داده‌های قیمت
+        params (list): لیست (fast_period, slow_period, signal_period)
+        dtype: نوع داده خروجی (float32 یا float64)
+        
+    خروجی:
+        tuple: (macd_line, signal_line, histogram) هر کدام ماتریس (تعداد کندل‌ها × تعداد ترکیب‌ها)
+    """
+    close = _price_series(data)
+    params = [tuple(param) for param in params]
+    dtype = _matrix_dtype(dtype)
+    
+    periods = list(dict.fromkeys(period for param in params for period in param[:2]))
+    emas = calculate_ema_matrix(close, periods)
+    column = {period: index for index, period in enumerate(periods)}
+    fast = [column[param[0]] for param in params]
+    slow = [column[param[1]] for param in params]
+    macd_lines = emas[:, fast] - emas[:, slow]
+    del emas
+    
+    signal_lines = np.empty_like(macd_lines)
+    for signal_period in dict.fromkeys(param[2] for param in params):
+        cols = [col for col, param in enumerate(params) if param[2] == signal_period]
+        signal_lines[:, cols] = pd.DataFrame(macd_lines[:, cols]).ewm(span=signal_period, adjust=False).mean().to_numpy()
+    
+    histogram = macd_lines - signal_lines
+    return tuple(np.asfortranarray(matrix, dtype=dtype) for matrix in (macd_lines, signal_lines, histogram))
+
 def detect_divergence(data, price_col='Close', indicator_col='RSI', window=10):
     """
     تشخیص واگرایی بین قیمت و یک اندیکاتور
@@ -191,6 +798,47 @@ def detect_divergence(data, price_col='Close', indicator_col='RSI', window=10):
     
     return data[['Bullish_Divergence', 'Bearish_Divergence']]
 
+def _support_resistance_pivots(data, window=10, threshold=0.01):
+    """
+    یافتن نقاط چرخش حمایت و مقاومت با کمینه/بیشینه متحرک دو طرفه
+    
+    بیشینه و کمینه پنجره‌های چپ و راست هر کندل با rolling (صف یکنوا در pandas)
+    در یک گذر خطی محاسبه و سپس با جابجایی هم‌تراز می‌شوند.
+    
+    خروجی:
+        tuple: (indices, levels, is_support) به صورت آرایه‌های NumPy
+    """
+    high = data['High'].astype(np.float64)
+    low = data['Low'].astype(np.float64)
+    
+    # min_periods=1 معادل نادیده گرفتن مقادیر گمشده در max/min روی برش‌ها است
+    rolling_max = high.rolling(window=window, min_periods=1).max()
+    rolling_min = low.rolling(window=window, min_periods=1).min()
+    
+    max_left = rolling_max.shift(1).to_numpy()
+    min_left = rolling_min.shift(1).to_numpy()
+    max_right = rolling_max.shift(-window).to_numpy()
+    min_right = rolling_min.shift(-window).to_numpy()
+    
+    high = high.to_numpy()
+    low = low.to_numpy()
+    
+    valid = np.zeros(len(data), dtype=bool)
+    valid[window:len(data) - window] = True
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # تشخیص سطح حمایت
+        is_support = valid & (min_left > low) & (low < min_right) & (np.abs(min_left - low) / low > threshold)
+        
+        # تشخیص سطح مقاومت
+        is_resistance = (valid & ~is_support & (max_left < high) & (high > max_right) &
+                         (np.abs(max_left - high) / high > threshold))
+    
+    indices = np.flatnonzero(is_support | is_resistance)
+    levels = np.where(is_support, low, high)[indices]
+    
+    return indices, levels, is_support[indices]
+
 def detect_support_resistance(data, window=10, threshold=0.01):
     """
     تشخیص سطوح حمایت و مقاومت
@@ -203,84 +851,165 @@ def detect_support_resistance(data, window=10, threshold=0.01):
     خروجی:
         tuple: (levels, is_support, is_resistance)
     """
-    data = data.copy()
-    levels = []
-    is_support = []
-    is_resistance = []
-    
-    for i in range(window, len(data) - window):
-        max_left = data['High'].iloc[i-window:i].max()
-        max_right = data['High'].iloc[i+1:i+window+1].max()
-        min_left = data['Low'].iloc[i-window:i].min()
-        min_right = data['Low'].iloc[i+1:i+window+1].min()
-        
-        # تشخیص سطح حمایت
-        if min_left > data['Low'].iloc[i] < min_right and abs(min_left - data['Low'].iloc[i]) / data['Low'].iloc[i] > threshold:
-            levels.append(data['Low'].iloc[i])
-            is_support.append(True)
-            is_resistance.append(False)
-        
-        # تشخیص سطح مقاومت
-        elif max_left < data['High'].iloc[i] > max_right and abs(max_left - data['High'].iloc[i]) / data['High'].iloc[i] > threshold:
-            levels.append(data['High'].iloc[i])
-            is_support.append(False)
-            is_resistance.append(True)
+    _, levels, support = _support_resistance_pivots(data, window, threshold)
+    
+    levels = levels.tolist()
+    is_support = support.tolist()
+    is_resistance = (~support).tolist()
     
     return levels, is_support, is_resistance
 
+def cluster_support_resistance(data, window=10, threshold=0.01, tolerance=0.005):
+    """
+    خوشه‌بندی سطوح حمایت و مقاومت نزدیک به هم در قالب نواحی قیمتی
+    
+    سطوح مرتب می‌شوند و هر جا فاصله نسبی دو سطح متوالی از tolerance بیشتر باشد
+    ناحیه جدیدی شروع می‌شود.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        window (int): اندازه پنجره برای بررسی
+        threshold (float): آستانه تشخیص
+        tolerance (float): حداکثر فاصله نسبی سطوح در یک ناحیه
+        
+    خروجی:
+        DataFrame: نواحی با ستون‌های Level، Zone_Low، Zone_High، Touches،
+        Support_Touches، Resistance_Touches و Last_Touch
+    """
+    columns = ['Level', 'Zone_Low', 'Zone_High', 'Touches', 'Support_Touches', 'Resistance_Touches', 'Last_Touch']
+    indices, levels, is_support = _support_resistance_pivots(data, window, threshold)
+    if len(levels) == 0:
+        return pd.DataFrame(columns=columns)
+    
+    order = np.argsort(levels, kind='stable')
+    sorted_levels = levels[order]
+    sorted_indices = indices[order]
+    sorted_support = is_support[order]
+    
+    # شروع ناحیه جدید در فاصله‌های بزرگ‌تر از tolerance
+    gaps = np.diff(sorted_levels) / np.abs(sorted_levels[:-1])
+    starts = np.concatenate(([0], np.flatnonzero(gaps > tolerance) + 1))
+    
+    touches = np.diff(np.append(starts, len(sorted_levels)))
+    support_touches = np.add.reduceat(sorted_support.astype(np.int64), starts)
+    last_index = np.maximum.reduceat(sorted_indices, starts)
+    
+    if 'Date' in data.columns:
+        last_touch = data['Date'].to_numpy()[last_index]
+    else:
+        last_touch = data.index.to_numpy()[last_index]
+    
+    zones = pd.DataFrame({
+        'Level': np.add.reduceat(sorted_levels, starts) / touches,
+        'Zone_Low': sorted_levels[starts],
+        'Zone_High': np.maximum.reduceat(sorted_levels, starts),
+        'Touches': touches,
+        'Support_Touches': support_touches,
+        'Resistance_Touches': touches - support_touches,
+        'Last_Touch': last_touch
+    })
+    
+    return zones
+
+def _shift_array(values, periods):
+    """جابجایی آرایه به سمت جلو (مقادیر ابتدایی nan می‌شوند)"""
+    shifted = np.full(len(values), np.nan)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
 def detect_candlestick_patterns(data):
     """
     تشخیص الگوهای شمعی
     
+    همه الگوها در یک مرحله با عملیات برداری روی آرایه‌ها و مقایسه با کندل‌های
+    قبلی (آرایه‌های جابجا شده) محاسبه می‌شوند.
+    
     پارامترها:
         data (DataFrame): داده‌های قیمت
         
     خروجی:
         DataFrame: سیگنال‌های الگوهای شمعی
     """
-    data = data.copy()
+    open_ = data['Open'].to_numpy(dtype=np.float64)
+    high = data['High'].to_numpy(dtype=np.float64)
+    low = data['Low'].to_numpy(dtype=np.float64)
+    close = data['Close'].to_numpy(dtype=np.float64)
     
     # محاسبه دامنه بدنه و سایه‌ها
-    data['Body'] = abs(data['Close'] - data['Open'])
-    data['Upper_Shadow'] = data.apply(
-        lambda x: x['High'] - x['Close'] if x['Close'] > x['Open'] else x['High'] - x['Open'],
-        axis=1
-    )
-    data['Lower_Shadow'] = data.apply(
-        lambda x: x['Open'] - x['Low'] if x['Close'] > x['Open'] else x['Close'] - x['Low'],
-        axis=1
-    )
+    bullish = close > open_
+    bearish = close < open_
+    body = np.abs(close - open_)
+    upper_shadow = np.where(bullish, high - close, high - open_)
+    lower_shadow = np.where(bullish, open_ - low, close - low)
     
     # میانگین اندازه بدنه برای تعیین الگوها
-    avg_body = data['Body'].mean()
+    avg_body = np.nanmean(body) if len(body) > 0 else np.nan
+    small_body = body < 0.5 * avg_body
+    long_body = body > avg_body
+    
+    # مقادیر کندل‌های قبلی (1 و 2 کندل قبل)
+    open_1, open_2 = _shift_array(open_, 1), _shift_array(open_, 2)
+    close_1, close_2 = _shift_array(close, 1), _shift_array(close, 2)
+    high_1, low_1 = _shift_array(high, 1), _shift_array(low, 1)
+    bullish_1, bullish_2 = close_1 > open_1, close_2 > open_2
+    bearish_1, bearish_2 = close_1 < open_1, close_2 < open_2
+    body_1 = np.abs(close_1 - open_1)
+    body_2 = np.abs(close_2 - open_2)
+    
+    patterns = {}
     
     # دوجی (بدنه کوچک)
-    data['Doji'] = data['Body'] < 0.1 * avg_body
+    patterns['Doji'] = body < 0.1 * avg_body
     
     # چکش (بدنه کوچک، سایه پایینی بلند)
-    data['Hammer'] = (data['Body'] < 0.5 * avg_body) & (data['Lower_Shadow'] > 2 * data['Body']) & (data['Upper_Shadow'] < 0.5 * data['Body'])
+    patterns['Hammer'] = small_body & (lower_shadow > 2 * body) & (upper_shadow < 0.5 * body)
     
     # ستاره شوتینگ (بدنه کوچک، سایه بالایی بلند)
-    data['Shooting_Star'] = (data['Body'] < 0.5 * avg_body) & (data['Upper_Shadow'] > 2 * data['Body']) & (data['Lower_Shadow'] < 0.5 * data['Body'])
+    patterns['Shooting_Star'] = small_body & (upper_shadow > 2 * body) & (lower_shadow < 0.5 * body)
     
     # الگوی بلعیدن صعودی (Bullish Engulfing)
-    data['Bullish_Engulfing'] = False
-    for i in range(1, len(data)):
-        if (data['Close'].iloc[i-1] < data['Open'].iloc[i-1]) and (data['Close'].iloc[i] > data['Open'].iloc[i]):
-            if (data['Open'].iloc[i] < data['Close'].iloc[i-1]) and (data['Close'].iloc[i] > data['Open'].iloc[i-1]):
-                data.loc[data.index[i], 'Bullish_Engulfing'] = True
+    patterns['Bullish_Engulfing'] = bearish_1 & bullish & (open_ < close_1) & (close > open_1)
     
     # الگوی بلعیدن نزولی (Bearish Engulfing)
-    data['Bearish_Engulfing'] = False
-    for i in range(1, len(data)):
-        if (data['Close'].iloc[i-1] > data['Open'].iloc[i-1]) and (data['Close'].iloc[i] < data['Open'].iloc[i]):
-            if (data['Open'].iloc[i] > data['Close'].iloc[i-1]) and (data['Close'].iloc[i] < data['Open'].iloc[i-1]):
-                data.loc[data.index[i], 'Bearish_Engulfing'] = True
+    patterns['Bearish_Engulfing'] = bullish_1 & bearish & (open_ > close_1) & (close < open_1)
     
     # الگوی پین‌بار (Pinbar)
-    data['Pinbar'] = (data['Upper_Shadow'] > 2 * data['Body']) | (data['Lower_Shadow'] > 2 * data['Body'])
+    patterns['Pinbar'] = (upper_shadow > 2 * body) | (lower_shadow > 2 * body)
+    
+    # الگوی هارامی صعودی (بدنه صعودی کوچک داخل بدنه نزولی قبلی)
+    patterns['Bullish_Harami'] = bearish_1 & bullish & (open_ > close_1) & (close < open_1)
+    
+    # الگوی هارامی نزولی (بدنه نزولی کوچک داخل بدنه صعودی قبلی)
+    patterns['Bearish_Harami'] = bullish_1 & bearish & (open_ < close_1) & (close > open_1)
+    
+    # ستاره صبحگاهی (نزولی بلند، بدنه کوچک، صعودی با بسته شدن بالای نیمه کندل اول)
+    patterns['Morning_Star'] = (bearish_2 & (body_2 > avg_body) & (body_1 < 0.5 * avg_body) &
+                                bullish & (close > (open_2 + close_2) / 2))
+    
+    # ستاره عصرگاهی (صعودی بلند، بدنه کوچک، نزولی با بسته شدن زیر نیمه کندل اول)
+    patterns['Evening_Star'] = (bullish_2 & (body_2 > avg_body) & (body_1 < 0.5 * avg_body) &
+                                bearish & (close < (open_2 + close_2) / 2))
+    
+    # سه سرباز سفید (سه کندل صعودی با بسته شدن بالاتر و باز شدن داخل بدنه قبلی)
+    patterns['Three_White_Soldiers'] = (bullish_2 & bullish_1 & bullish & long_body &
+                                        (close_1 > close_2) & (close > close_1) &
+                                        (open_1 > open_2) & (open_1 < close_2) &
+                                        (open_ > open_1) & (open_ < close_1))
+    
+    # سه کلاغ سیاه (سه کندل نزولی با بسته شدن پایین‌تر و باز شدن داخل بدنه قبلی)
+    patterns['Three_Black_Crows'] = (bearish_2 & bearish_1 & bearish & long_body &
+                                     (close_1 < close_2) & (close < close_1) &
+                                     (open_1 < open_2) & (open_1 > close_2) &
+                                     (open_ < open_1) & (open_ > close_1))
+    
+    # کندل داخلی (سقف و کف داخل کندل قبلی)
+    patterns['Inside_Bar'] = (high < high_1) & (low > low_1)
+    
+    # کندل بیرونی (سقف و کف فراتر از کندل قبلی)
+    patterns['Outside_Bar'] = (high > high_1) & (low < low_1)
     
-    return data[['Doji', 'Hammer', 'Shooting_Star', 'Bullish_Engulfing', 'Bearish_Engulfing', 'Pinbar']]
+    return pd.DataFrame(patterns, index=data.index)
 
 def fibonacci_levels(start, end):
     """
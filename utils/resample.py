@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+ساخت کندل‌های تایم‌فریم بالاتر از داده‌های تایم‌فریم پایین‌تر (مثلاً M1)
+
+هر کندل داده‌ها یک کلید صحیح (شماره بازه) می‌گیرد و چون داده‌ها بر اساس زمان مرتب
+هستند مرز کندل‌ها همان جاهایی است که کلید تغییر می‌کند؛ بنابراین OHLCV همه کندل‌ها
+با یک گذر ufunc.reduceat و بدون گروه‌بندی pandas محاسبه می‌شود.
+
+ابتدای بازه‌ها را می‌توان با منطقه زمانی و ساعت شروع جلسه معاملاتی تنظیم کرد؛ مثلاً
+کندل روزانه فارکس که ساعت 17:00 نیویورک شروع می‌شود:
+    resample_ohlcv(data, 'D1', tz='America/New_York', session_start='17:00')
+
+load_timeframes همه تایم‌فریم‌ها را از یک بار خواندن فایل پایه می‌سازد و نتیجه را
+در کش دودویی (utils.data_cache) کنار کش خود فایل ذخیره می‌کند.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data_cache import load_cached_frame, save_cached_frame
+from utils.data_loader import load_csv_data, parse_file_name
+
+# طول تایم‌فریم‌ها (MN ماه تقویمی است و طول ثابت ندارد)
+TIMEFRAMES = {
+    'M1': pd.Timedelta(minutes=1),
+    'M5': pd.Timedelta(minutes=5),
+    'M15': pd.Timedelta(minutes=15),
+    'M30': pd.Timedelta(minutes=30),
+    'H1': pd.Timedelta(hours=1),
+    'H4': pd.Timedelta(hours=4),
+    'D1': pd.Timedelta(days=1),
+    'W1': pd.Timedelta(weeks=1),
+    'MN': None
+}
+
+# کندل هفتگی از دوشنبه شروع می‌شود (1970-01-01 پنجشنبه است)
+_WEEK_ORIGIN = np.int64(pd.Timedelta(days=4).value)
+
+def timeframe_delta(timeframe):
+    """
+    طول یک تایم‌فریم
+    
+    پارامترها:
+        timeframe (str): نام تایم‌فریم، مثلاً H1 (حروف کوچک یا بزرگ)
+    
+    خروجی:
+        Timedelta: طول کندل (None برای ماهانه)
+    """
+    name = str(timeframe).upper()
+    if name not in TIMEFRAMES:
+        raise ValueError(f"تایم‌فریم ناشناخته: {timeframe}")
+    return TIMEFRAMES[name]
+
+def _timeframe_order(timeframe):
+    """ترتیب تایم‌فریم‌ها از کوچک به بزرگ (تایم‌فریم نامشخص کوچک‌ترین)"""
+    names = list(TIMEFRAMES)
+    return names.index(timeframe) if timeframe in names else -1
+
+def _session_offset(session_start):
+    """ساعت شروع جلسه ('17:00'، '17:00:00' یا Timedelta) به صورت Timedelta"""
+    if not session_start:
+        return pd.Timedelta(0)
+    if isinstance(session_start, str) and session_start.count(':') == 1:
+        session_start += ':00'
+    return pd.Timedelta(session_start)
+
+def _local_offsets(dates, tz, data_tz):
+    """فاصله ساعت محلی منطقه tz از ساعت داده‌ها برای هر کندل (نانوثانیه)"""
+    if tz is None:
+        return np.zeros(len(dates), dtype=np.int64)
+    index = pd.DatetimeIndex(dates)
+    try:
+        # ساعت‌های تکراری پایان ساعت تابستانی از ترتیب داده‌ها تشخیص داده می‌شوند
+        index = index.tz_localize(data_tz, ambiguous='infer', nonexistent='shift_forward')
+    except ValueError:
+        index = index.tz_localize(data_tz, ambiguous=np.zeros(len(dates), dtype=bool), nonexistent='shift_forward')
+    index = index.tz_convert(tz)
+    local = index.tz_localize(None).to_numpy('datetime64[ns]').view(np.int64)
+    return local - dates.view(np.int64)
+
+def bar_keys(dates, timeframe, tz=None, data_tz='UTC', session_start=None):
+    """
+    شماره بازه تایم‌فریم هدف و زمان شروع آن برای هر کندل
+    
+    پارامترها:
+        dates (ndarray): زمان کندل‌ها (datetime64[ns]، مرتب)
+        timeframe (str): تایم‌فریم هدف
+        tz (str): منطقه زمانی تعیین مرز کندل‌ها (None: ساعت خود داده‌ها)
+        data_tz (str): منطقه زمانی ساعت داده‌ها
+        session_start (str): ساعت شروع جلسه، مثلاً '17:00' (مرز کندل‌ها به این ساعت منتقل می‌شود)
+    
+    خروجی:
+        tuple: (کلید صحیح هر کندل، ابتدای بازه هر کندل در ساعت داده‌ها به نانوثانیه)
+    """
+    delta = timeframe_delta(timeframe)
+    dates = np.asarray(dates, dtype='datetime64[ns]')
+    offsets = _local_offsets(dates, tz, data_tz)
+    session = np.int64(_session_offset(session_start).value)
+    # زمان محلی نسبت به شروع جلسه
+    shifted = dates.view(np.int64) + offsets - session
+    
+    if delta is None:
+        keys = shifted.view('datetime64[ns]').astype('datetime64[M]').view(np.int64)
+        starts = keys.astype('datetime64[M]').astype('datetime64[ns]').view(np.int64)
+    else:
+        step = np.int64(delta.value)
+        origin = _WEEK_ORIGIN if str(timeframe).upper() == 'W1' else np.int64(0)
+        keys = (shifted - origin) // step
+        starts = keys * step + origin
+    
+    # برگرداندن ابتدای بازه به ساعت داده‌ها
+    return keys, starts + session - offsets
+
+def resample_ohlcv(data, timeframe, tz=None, data_tz='UTC', session_start=None):
+    """
+    ساخت کندل‌های تایم‌فریم بالاتر
+    
+    Open اولین، High بیشترین، Low کمترین و Close آخرین مقدار هر بازه و Volume مجموع
+    حجم‌هاست (مقادیر گمشده در High، Low و Volume نادیده گرفته می‌شوند). زمان هر کندل
+    ابتدای بازه آن در ساعت داده‌هاست و بازه‌های بدون داده (تعطیلات) کندلی ندارند.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت مرتب بر اساس Date
+        timeframe (str): تایم‌فریم هدف، مثلاً H1
+        tz (str): منطقه زمانی تعیین مرز کندل‌ها (None: ساعت خود داده‌ها)
+        data_tz (str): منطقه زمانی ساعت داده‌ها
+        session_start (str): ساعت شروع جلسه، مثلاً '17:00'
+    
+    خروجی:
+        DataFrame: کندل‌های جدید با ستون‌های Date و OHLCV موجود
+    """
+    dates = data['Date'].to_numpy('datetime64[ns]')
+    if len(dates) == 0:
+        return pd.DataFrame(columns=list(data.columns))
+    
+    keys, starts = bar_keys(dates, timeframe, tz, data_tz, session_start)
+    if np.any(keys[1:] < keys[:-1]):
+        raise ValueError("داده‌ها بر اساس زمان مرتب نیستند")
+    
+    # اولین و آخرین کندل هر بازه
+    first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    last = np.r_[first[1:], len(keys)] - 1
+    
+    columns = {'Date': starts[first].view('datetime64[ns]')}
+    if 'Open' in data.columns:
+        columns['Open'] = data['Open'].to_numpy()[first]
+    if 'High' in data.columns:
+        columns['High'] = np.fmax.reduceat(data['High'].to_numpy(), first)
+    if 'Low' in data.columns:
+        columns['Low'] = np.fmin.reduceat(data['Low'].to_numpy(), first)
+    if 'Close' in data.columns:
+        columns['Close'] = data['Close'].to_numpy()[last]
+    if 'Volume' in data.columns:
+        volume = data['Volume'].to_numpy()
+        columns['Volume'] = np.add.reduceat(np.nan_to_num(volume), first)
+    return pd.DataFrame(columns, copy=False)
+
+def _variant(timeframe, tz, data_tz, session_start):
+    """نام جدول مشتق شده در کش (منطقه زمانی داده‌ها فقط همراه tz بر مرزها اثر دارد)"""
+    parts = [str(timeframe).upper()]
+    if tz is not None:
+        parts.extend([str(tz), str(data_tz)])
+    if session_start:
+        parts.append(str(session_start).replace(':', ''))
+    return '_'.join(parts)
+
+def load_timeframes(file_path, timeframes, float32=False, cache=True, tz=None, data_tz='UTC', session_start=None):
+    """
+    بارگذاری چند تایم‌فریم از یک فایل پایه (مثلاً M1)
+    
+    فایل پایه حداکثر یک بار خوانده می‌شود و فقط اگر تایم‌فریمی در کش نباشد؛ هر
+    تایم‌فریم ساخته شده در کش ذخیره می‌شود و تا تغییر فایل پایه دوباره استفاده می‌شود.
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV پایه
+        timeframes (iterable): تایم‌فریم‌های موردنظر، مثلاً ['M15', 'H1', 'D1']
+        float32 (bool): ذخیره ستون‌های قیمت به صورت float32
+        cache (bool): استفاده از کش دودویی
+        tz (str): منطقه زمانی تعیین مرز کندل‌ها
+        data_tz (str): منطقه زمانی ساعت داده‌ها
+        session_start (str): ساعت شروع جلسه، مثلاً '17:00'
+    
+    خروجی:
+        tuple: (dict {تایم‌فریم: DataFrame}، نماد، تایم‌فریم فایل پایه)
+    """
+    symbol, base_timeframe = parse_file_name(file_path)
+    base_timeframe = base_timeframe.upper()
+    base = None
+    frames = {}
+    for timeframe in timeframes:
+        timeframe = str(timeframe).upper()
+        timeframe_delta(timeframe)
+        if _timeframe_order(timeframe) < _timeframe_order(base_timeframe):
+            raise ValueError(f"تایم‌فریم {timeframe} از تایم‌فریم فایل پایه ({base_timeframe}) کوچک‌تر است")
+        variant = _variant(timeframe, tz, data_tz, session_start)
+        cached = load_cached_frame(file_path, float32, variant) if cache else None
+        if cached is not None:
+            frames[timeframe] = cached[0]
+            continue
+        
+        if base is None:
+            base = load_csv_data(file_path, float32=float32, cache=cache)[0]
+        frames[timeframe] = resample_ohlcv(base, timeframe, tz, data_tz, session_start)
+        if cache:
+            try:
+                save_cached_frame(file_path, frames[timeframe], float32, variant, symbol=symbol,
+                                  timeframe=timeframe, base_timeframe=base_timeframe)
+            except OSError as e:
+                print(f"هشدار: ذخیره کش ممکن نیست: {e}")
+    return frames, symbol, base_timeframe
@@ -5,52 +5,94 @@
 
 import pandas as pd
 import numpy as np
+from utils.indicators import calculate_atr, rolling_extremes
 
-def calculate_risk_reward(signals, data, risk_ratio=2):
+# روش‌های تعیین فاصله حد ضرر
+STOP_METHODS = ('atr', 'percent', 'swing')
+
+def calculate_risk_reward(signals, data, risk_ratio=2, stop='atr', atr_period=14, atr_multiplier=1.5,
+                          stop_percent=1.0, swing_lookback=20, swing_buffer=0.0):
     """
     محاسبه حد ضرر و حد سود برای سیگنال‌ها
     
+    هر سیگنال با جستجوی دودویی به آخرین کندل تا زمان آن نسبت داده می‌شود و حد ضرر
+    و حد سود همه سیگنال‌ها با عملیات آرایه‌ای محاسبه می‌شود. ATR از لایه اندیکاتورها
+    (calculate_atr با کش سراسری) گرفته می‌شود؛ بنابراین با ATR استراتژی‌ها مشترک است.
+    
+    فاصله حد ضرر:
+        'atr': atr_multiplier برابر ATR
+        'percent': stop_percent درصد قیمت ورود
+        'swing': تا کمترین Low (خرید) یا بیشترین High (فروش) در swing_lookback کندل
+                 اخیر به اضافه swing_buffer برابر ATR؛ اگر قیمت ورود آن سوی این سطح
+                 باشد حد ضرر و حد سود nan می‌شوند
+    حد سود در فاصله risk_ratio برابر فاصله حد ضرر در جهت مقابل قرار می‌گیرد.
+    
     پارامترها:
         signals (DataFrame): سیگنال‌های معاملاتی
         data (DataFrame): داده‌های قیمت
         risk_ratio (float): نسبت ریسک به ریوارد
+        stop (str): روش حد ضرر ('atr'، 'percent' یا 'swing')
+        atr_period (int): دوره ATR
+        atr_multiplier (float): ضریب ATR برای حد ضرر
+        stop_percent (float): فاصله حد ضرر به درصد قیمت (روش percent)
+        swing_lookback (int): تعداد کندل‌های بررسی کف و سقف (روش swing)
+        swing_buffer (float): فاصله اضافه پس از کف یا سقف به ضریبی از ATR (روش swing)
         
     خروجی:
         DataFrame: سیگنال‌ها با اضافه شدن حد ضرر و حد سود
     """
+    if stop not in STOP_METHODS:
+        raise ValueError(f"روش حد ضرر نامعتبر: {stop}")
     if signals.empty:
         return signals
     
-    # محاسبه میانگین دامنه حقیقی (ATR) برای تعیین حد ضرر
-    high_low = data['High'] - data['Low']
-    high_close = np.abs(data['High'] - data['Close'].shift())
-    low_close = np.abs(data['Low'] - data['Close'].shift())
-    
-    ranges = pd.concat([high_low, high_close, low_close], axis=1)
-    true_range = ranges.max(axis=1)
-    
-    atr = true_range.rolling(window=14).mean()
-    
-    # اضافه کردن ATR به سیگنال‌ها
-    signals_with_dates = pd.merge_asof(signals.sort_values('Date'), 
-                                      data[['Date', 'Close']].assign(ATR=atr),
-                                      on='Date')
-    
-    # تعیین حد ضرر و حد سود بر اساس ATR
-    signals_with_dates['StopLoss'] = signals_with_dates.apply(
-        lambda row: row['Price'] - 1.5 * row['ATR'] if row['Signal'] == 1 else row['Price'] + 1.5 * row['ATR'],
-        axis=1
-    )
+    result = signals.sort_values('Date', kind='stable').reset_index(drop=True)
+    
+    # آخرین کندل تا زمان هر سیگنال (مانند merge_asof)
+    market_dates = data['Date'].to_numpy('datetime64[ns]')
+    positions = np.searchsorted(market_dates, result['Date'].to_numpy('datetime64[ns]'), side='right') - 1
+    matched = positions >= 0
+    positions = np.where(matched, positions, 0)
+    
+    def at_signals(values):
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return np.full(len(result), np.nan)
+        return np.where(matched, values[positions], np.nan)
+    
+    # Close و ATR همیشه از داده‌های بازار گرفته می‌شوند؛ ستون هم‌نام سیگنال‌ها (مثلاً ATR
+    # استراتژی شکست زمانی) فقط برای سطرهای همان استراتژی مقدار دارد و جایگزین می‌شود
+    result['Close'] = at_signals(data['Close'].to_numpy())
+    result['ATR'] = at_signals(calculate_atr(data, period=atr_period).to_numpy())
+    
+    price = result['Price'].to_numpy(dtype=np.float64)
+    atr = result['ATR'].to_numpy(dtype=np.float64)
+    is_buy = result['Signal'].to_numpy() == 1
+    direction = np.where(is_buy, 1.0, -1.0)
+    
+    # فاصله حد ضرر و حد سود از قیمت ورود
+    if stop == 'atr':
+        stop_distance = atr_multiplier * atr
+        target_distance = (risk_ratio * atr_multiplier) * atr
+    else:
+        if stop == 'percent':
+            stop_distance = price * (stop_percent / 100)
+        else:
+            lowest = at_signals(rolling_extremes(data['Low'].to_numpy(), [swing_lookback], 'min')[swing_lookback])
+            highest = at_signals(rolling_extremes(data['High'].to_numpy(), [swing_lookback], 'max')[swing_lookback])
+            stop_distance = np.where(is_buy, price - lowest, highest - price)
+            if swing_buffer:
+                stop_distance = stop_distance + swing_buffer * atr
+            stop_distance = np.where(stop_distance > 0, stop_distance, np.nan)
+        target_distance = risk_ratio * stop_distance
     
-    signals_with_dates['TakeProfit'] = signals_with_dates.apply(
-        lambda row: row['Price'] + risk_ratio * 1.5 * row['ATR'] if row['Signal'] == 1 else row['Price'] - risk_ratio * 1.5 * row['ATR'],
-        axis=1
-    )
+    result['StopLoss'] = price - direction * stop_distance
+    result['TakeProfit'] = price + direction * target_distance
     
     # محاسبه نسبت ریسک به ریوارد
-    signals_with_dates['RiskReward'] = risk_ratio
+    result['RiskReward'] = risk_ratio
     
-    return signals_with_dates
+    return result
 
 def calculate_position_size(account_balance, risk_percentage, entry_price, stop_loss):
     """
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+اشتراک داده‌های قیمت بین پردازه‌ها از طریق حافظه مشترک
+
+ستون‌های عددی و تاریخ یک DataFrame یک بار در یک بلوک حافظه مشترک کپی می‌شوند و
+پردازه‌های کاری به جای دریافت نسخه pickle شده داده‌ها در هر وظیفه، فقط نام بلوک و
+چیدمان ستون‌ها را دریافت کرده و روی همان حافظه DataFrame می‌سازند.
+"""
+
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+# چیدمان یک ستون در بلوک حافظه مشترک
+SharedColumn = namedtuple('SharedColumn', ['name', 'dtype', 'offset', 'tz'])
+
+# مشخصات قابل pickle بلوک حافظه مشترک (برای ارسال به پردازه‌های کاری)
+SharedFrameSpec = namedtuple('SharedFrameSpec', ['shm_name', 'length', 'columns'])
+
+# بلوک‌ها و DataFrameهای متصل شده در پردازه کاری فعلی
+_attached = {}
+
+def _column_array(series):
+    """آرایه قابل ذخیره یک ستون و منطقه زمانی آن (None برای ستون‌های غیر قابل اشتراک)"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy('datetime64[ns]'), str(dtype.tz)
+    if dtype.kind in 'biufM':
+        return series.to_numpy(), None
+    return None, None
+
+class SharedFrame:
+    """
+    نگهداری ستون‌های عددی و تاریخ یک DataFrame در حافظه مشترک
+    
+    ستون‌های متنی (object) منتقل نمی‌شوند. پردازه سازنده باید پس از پایان کار
+    پردازه‌های کاری close() را صدا بزند (یا از with استفاده کند) تا حافظه آزاد شود.
+    
+    مثال:
+        with SharedFrame(data) as shared:
+            executor.submit(worker, shared.spec, ...)
+        # در پردازه کاری:
+        data = attach_shared_frame(spec)
+    """
+    
+    def __init__(self, data):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            data (DataFrame): داده‌های قیمت
+        """
+        arrays = []
+        columns = []
+        offset = 0
+        for name in data.columns:
+            values, tz = _column_array(data[name])
+            if values is None:
+                continue
+            values = np.ascontiguousarray(values)
+            # هم‌ترازی 8 بایتی برای دسترسی سریع
+            offset = (offset + 7) // 8 * 8
+            columns.append(SharedColumn(name, values.dtype.str, offset, tz))
+            arrays.append(values)
+            offset += values.nbytes
+        
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for column, values in zip(columns, arrays):
+            target = np.ndarray(values.shape, dtype=values.dtype, buffer=self._shm.buf, offset=column.offset)
+            target[:] = values
+            del target
+        
+        self.spec = SharedFrameSpec(self._shm.name, len(data), tuple(columns))
+    
+    @property
+    def nbytes(self):
+        """حجم بلوک حافظه مشترک (بایت)"""
+        return self._shm.size
+    
+    def close(self):
+        """آزاد کردن حافظه مشترک"""
+        if self._shm is not None:
+            entry = _attached.pop(self._shm.name, None)
+            if entry is not None:
+                entry[0].close()
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def frame_from_buffer(buffer, spec):
+    """
+    ساخت DataFrame روی یک بافر بدون کپی کردن ستون‌ها
+    
+    پارامترها:
+        buffer: بافر حافظه (مثلاً SharedMemory.buf)
+        spec (SharedFrameSpec): چیدمان ستون‌ها
+    
+    خروجی:
+        DataFrame: داده‌ها
+    """
+    columns = {}
+    for column in spec.columns:
+        values = np.ndarray(spec.length, dtype=np.dtype(column.dtype), buffer=buffer, offset=column.offset)
+        # حافظه بین پردازه‌ها مشترک است؛ نوشتن در یک پردازه داده‌های بقیه را خراب می‌کند
+        values.flags.writeable = False
+        if column.tz is not None:
+            values = pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(column.tz)
+        columns[column.name] = values
+    return pd.DataFrame(columns, copy=False)
+
+def read_only_view(data):
+    """
+    نمای فقط خواندنی از یک DataFrame بدون کپی کردن ستون‌ها
+    
+    ستون‌های عددی و تاریخ روی همان حافظه ورودی هستند اما قابل نوشتن نیستند؛ بنابراین
+    استراتژی‌ها بدون کپی داده‌ها اجرا می‌شوند و تغییر تصادفی مقادیر به جای خراب
+    کردن داده‌های اصلی خطا می‌دهد. افزودن ستون به نما روی ورودی اثری ندارد.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+    
+    خروجی:
+        DataFrame: نمای فقط خواندنی
+    """
+    columns = {}
+    for name in data.columns:
+        values = data[name].array if isinstance(data[name].dtype, pd.DatetimeTZDtype) else data[name].to_numpy()
+        if isinstance(values, np.ndarray):
+            values = values.view()
+            values.flags.writeable = False
+        columns[name] = values
+    return pd.DataFrame(columns, index=data.index, copy=False)
+
+def attach_shared_frame(spec):
+    """
+    اتصال به داده‌های مشترک در پردازه کاری
+    
+    اتصال و DataFrame ساخته شده در هر پردازه نگهداری می‌شود؛ بنابراین وظایف بعدی
+    روی همان بلوک هزینه‌ای ندارند. حافظه با پایان پردازه کاری آزاد می‌شود.
+    
+    پارامترها:
+        spec (SharedFrameSpec): مشخصات بلوک حافظه مشترک
+    
+    خروجی:
+        DataFrame: داده‌ها (ستون‌ها روی حافظه مشترک هستند)
+    """
+    if spec.shm_name not in _attached:
+        shm = shared_memory.SharedMemory(name=spec.shm_name)
+        _attached[spec.shm_name] = (shm, frame_from_buffer(shm.buf, spec))
+    return _attached[spec.shm_name][1]
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+جدول ستونی سیگنال‌ها برای نمایش صفحه‌ای نتایج
+
+داده‌ها به صورت آرایه‌های ستونی نگهداری می‌شوند و مرتب‌سازی و فیلتر فقط روی
+آرایه شماره سطرها انجام می‌شود؛ بنابراین نمایش فقط سطرهای قابل مشاهده را
+می‌سازد و مرور صدها هزار سیگنال بدون تأخیر است.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# الگوی فیلتر مقایسه‌ای برای ستون‌های عددی و تاریخ، مثلاً ">=1.25" یا "<2024-01-01"
+_COMPARISON = re.compile(r'^\s*(>=|<=|!=|==|=|>|<)\s*(.+?)\s*$')
+
+_OPERATORS = {
+    '>': np.greater,
+    '<': np.less,
+    '>=': np.greater_equal,
+    '<=': np.less_equal,
+    '=': np.equal,
+    '==': np.equal,
+    '!=': np.not_equal
+}
+
+class SignalTable:
+    """
+    جدول ستونی سیگنال‌ها با مرتب‌سازی و فیلتر سریع
+    
+    ترتیب مرتب‌سازی هر ستون یک بار محاسبه و نگهداری می‌شود؛ تغییر فیلتر یا جهت
+    مرتب‌سازی بعد از آن فقط یک گذر خطی روی شماره سطرهاست.
+    """
+    
+    def __init__(self, frame, columns=None):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            frame (DataFrame): سیگنال‌ها
+            columns (list): ستون‌های نگهداری شده (پیش‌فرض: همه ستون‌ها)
+        """
+        columns = list(frame.columns) if columns is None else list(columns)
+        self.columns = {name: frame[name].to_numpy() for name in columns}
+        self._size = len(frame)
+        self._sort_orders = {}
+        self._categories = {}
+        self._order = np.arange(self._size)
+        self._mask = None
+        self.sort_column = None
+        self.ascending = True
+        self._view = self._order
+    
+    def __len__(self):
+        """تعداد سطرهای قابل نمایش (پس از فیلتر)"""
+        return len(self._view)
+    
+    @property
+    def total(self):
+        """تعداد کل سطرها"""
+        return self._size
+    
+    def _category_codes(self, column):
+        """کدهای مرتب شده مقادیر یک ستون متنی و مقادیر یکتای آن (با نگهداری نتیجه)"""
+        if column not in self._categories:
+            self._categories[column] = pd.factorize(self.columns[column], sort=True)
+        return self._categories[column]
+    
+    def _sort_order(self, column):
+        """ترتیب صعودی پایدار سطرها بر اساس یک ستون (با نگهداری نتیجه)"""
+        if column not in self._sort_orders:
+            values = self.columns[column]
+            if values.dtype == object:
+                # مرتب‌سازی متن‌ها از روی کد مرتب شده آن‌ها (مقادیر گمشده در انتها)
+                codes, _ = self._category_codes(column)
+                values = np.where(codes < 0, np.iinfo(codes.dtype).max, codes)
+            self._sort_orders[column] = np.argsort(values, kind='stable')
+        return self._sort_orders[column]
+    
+    def _update_view(self):
+        order = self._order if self.ascending else self._order[::-1]
+        self._view = order if self._mask is None else order[self._mask[order]]
+    
+    def sort(self, column, ascending=True):
+        """
+        مرتب‌سازی بر اساس یک ستون
+        
+        پارامترها:
+            column (str): نام ستون (None برای ترتیب اولیه)
+            ascending (bool): صعودی یا نزولی
+        """
+        self.sort_column = column
+        self.ascending = ascending
+        self._order = np.arange(self._size) if column is None else self._sort_order(column)
+        self._update_view()
+    
+    def toggle_sort(self, column):
+        """مرتب‌سازی صعودی و در کلیک بعدی روی همان ستون نزولی"""
+        ascending = not (self.sort_column == column and self.ascending)
+        self.sort(column, ascending)
+    
+    def _column_mask(self, column, text):
+        values = self.columns[column]
+        if values.dtype == object:
+            # جستجوی متنی فقط روی مقادیر یکتا (بدون حساسیت به حروف بزرگ و کوچک)
+            codes, uniques = self._category_codes(column)
+            matched = pd.Series(uniques, dtype=object).astype(str).str.contains(text, case=False, regex=False)
+            matched = np.append(matched.to_numpy(dtype=bool), False)
+            return matched[codes]
+        
+        match = _COMPARISON.match(text)
+        try:
+            if values.dtype.kind == 'M':
+                if match is None:
+                    # تاریخ ناقص به معنای کل آن بازه است، مثلاً "2024-03" برای کل ماه مارس
+                    period = pd.Period(text.strip())
+                    start = period.start_time.to_datetime64()
+                    end = (period + 1).start_time.to_datetime64()
+                    return (values >= start) & (values < end)
+                operator, operand = match.groups()
+                return _OPERATORS[operator](values, pd.Timestamp(operand).to_datetime64())
+            if match is None:
+                return values == float(text)
+            operator, operand = match.groups()
+            return _OPERATORS[operator](values, float(operand))
+        except ValueError:
+            # عبارت برای این ستون معتبر نیست
+            return np.zeros(self._size, dtype=bool)
+    
+    def filter(self, column=None, text=None):
+        """
+        فیلتر سطرها
+        
+        ستون‌های متنی: سطرهایی که متن آن‌ها شامل text باشد.
+        ستون‌های عددی: مقایسه مانند ">1.5" یا "!=0"، یا یک عدد برای تساوی.
+        ستون‌های تاریخ: مقایسه مانند ">=2024-01-01" یا تاریخ ناقص مانند "2024-03".
+        column=None یعنی جستجو در همه ستون‌ها.
+        
+        پارامترها:
+            column (str): نام ستون
+            text (str): عبارت فیلتر (خالی یا None برای حذف فیلتر)
+        """
+        if not text:
+            self._mask = None
+        elif column is None:
+            mask = np.zeros(self._size, dtype=bool)
+            for name in self.columns:
+                mask |= self._column_mask(name, text)
+            self._mask = mask
+        else:
+            self._mask = self._column_mask(column, text)
+        self._update_view()
+    
+    def rows(self, start, stop, columns=None):
+        """
+        ساخت سطرهای بازه [start, stop) از نمای فعلی
+        
+        پارامترها:
+            start (int): شماره اولین سطر
+            stop (int): شماره سطر بعد از آخرین سطر
+            columns (list): ستون‌های خروجی (پیش‌فرض: همه)
+        
+        خروجی:
+            list: لیست tuple مقادیر سطرها
+        """
+        columns = list(self.columns) if columns is None else columns
+        index = self._view[max(start, 0):max(stop, 0)]
+        return list(zip(*(self.columns[name][index] for name in columns)))
+    
+    def to_frame(self):
+        """سطرهای نمای فعلی به صورت DataFrame"""
+        return pd.DataFrame({name: values[self._view] for name, values in self.columns.items()})
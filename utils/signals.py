@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+ماژول تولید ستونی سیگنال‌ها
+
+قوانین استراتژی‌ها به صورت ماسک‌های بولی روی کل آرایه بیان می‌شوند (کراس‌ها،
+عبور از سطوح و برقرار بودن یک شرط در k کندل اخیر) و جدول سیگنال در یک مرحله
+از روی ماسک‌ها جمع‌آوری می‌شود.
+"""
+
+import numpy as np
+import pandas as pd
+
+def _values(values):
+    """تبدیل Series، آرایه یا عدد به آرایه اعشاری"""
+    return np.asarray(values, dtype=np.float64)
+
+def _previous(values):
+    """مقدار کندل قبل (برای کندل اول nan)"""
+    previous = np.empty_like(values)
+    previous[:1] = np.nan
+    previous[1:] = values[:-1]
+    return previous
+
+def _pair(a, b):
+    """مقادیر فعلی و قبلی دو سری (b می‌تواند یک سطح ثابت باشد)"""
+    a = _values(a)
+    b = np.broadcast_to(_values(b), a.shape)
+    return a, b, _previous(a), _previous(b)
+
+def cross_above(a, b, equal='after'):
+    """
+    عبور سری a از پایین به بالای سری (یا سطح) b
+    
+    پارامترها:
+        a (Series | ndarray): سری اول
+        b (Series | ndarray | float): سری دوم یا سطح ثابت
+        equal (str): تساوی در کدام سمت کراس پذیرفته شود:
+            'after': a[i-1] < b[i-1] و a[i] >= b[i]
+            'before': a[i-1] <= b[i-1] و a[i] > b[i]
+    
+    خروجی:
+        ndarray: ماسک بولی (کندل اول همیشه False)
+    """
+    a, b, prev_a, prev_b = _pair(a, b)
+    if equal == 'after':
+        return (prev_a < prev_b) & (a >= b)
+    if equal == 'before':
+        return (prev_a <= prev_b) & (a > b)
+    raise ValueError(f"مقدار نامعتبر برای equal: {equal}")
+
+def cross_below(a, b, equal='after'):
+    """
+    عبور سری a از بالا به زیر سری (یا سطح) b
+    
+    پارامترها:
+        a (Series | ndarray): سری اول
+        b (Series | ndarray | float): سری دوم یا سطح ثابت
+        equal (str): تساوی در کدام سمت کراس پذیرفته شود:
+            'after': a[i-1] > b[i-1] و a[i] <= b[i]
+            'before': a[i-1] >= b[i-1] و a[i] < b[i]
+    
+    خروجی:
+        ndarray: ماسک بولی (کندل اول همیشه False)
+    """
+    a, b, prev_a, prev_b = _pair(a, b)
+    if equal == 'after':
+        return (prev_a > prev_b) & (a <= b)
+    if equal == 'before':
+        return (prev_a >= prev_b) & (a < b)
+    raise ValueError(f"مقدار نامعتبر برای equal: {equal}")
+
+def between(values, lower, upper):
+    """ماسک lower < values < upper (مقادیر گمشده False)"""
+    values = _values(values)
+    return (values > lower) & (values < upper)
+
+def rising(values, periods=1):
+    """ماسک values[i] > values[i-periods]"""
+    values = _values(values)
+    result = np.zeros(len(values), dtype=bool)
+    if periods < len(values):
+        result[periods:] = values[periods:] > values[:-periods]
+    return result
+
+def falling(values, periods=1):
+    """ماسک values[i] < values[i-periods]"""
+    values = _values(values)
+    result = np.zeros(len(values), dtype=bool)
+    if periods < len(values):
+        result[periods:] = values[periods:] < values[:-periods]
+    return result
+
+def all_true_over(mask, window, lag=0):
+    """
+    برقرار بودن شرط در همه `window` کندل اخیر
+    
+    result[i] برابر است با mask[i-lag-window+1 : i-lag+1].all() و برای کندل‌هایی
+    که پنجره کامل ندارند False است. مثلاً lag=1 یعنی k کندل قبل از کندل فعلی.
+    
+    پارامترها:
+        mask (Series | ndarray): ماسک بولی
+        window (int): تعداد کندل‌ها
+        lag (int): تعداد کندل‌های اخیری که در پنجره حساب نمی‌شوند
+    
+    خروجی:
+        ndarray: ماسک بولی
+    """
+    mask = np.asarray(mask, dtype=bool)
+    n = len(mask)
+    # تعداد کندل‌های نقض کننده شرط تا هر نقطه
+    failures = np.concatenate(([0], np.cumsum(~mask)))
+    result = np.zeros(n, dtype=bool)
+    first = window + lag - 1
+    if first < n:
+        end = np.arange(first, n) - lag + 1
+        result[first:] = failures[end] == failures[end - window]
+    return result
+
+def _take(values, index):
+    """انتخاب سطرهای index از Series (با حفظ نوع داده) یا آرایه"""
+    if isinstance(values, pd.Series):
+        return values.iloc[index].reset_index(drop=True)
+    return np.asarray(values)[index]
+
+def gather_signals(data, buy, sell, columns=None, start=0, end=None):
+    """
+    جمع‌آوری جدول سیگنال از ماسک‌های خرید و فروش در یک مرحله
+    
+    مانند زنجیره if/elif در حلقه‌های قبلی، در کندل‌هایی که هر دو شرط برقرارند
+    سیگنال خرید اولویت دارد.
+    
+    پارامترها:
+        data (DataFrame): داده‌های قیمت
+        buy (ndarray): ماسک خرید
+        sell (ndarray): ماسک فروش
+        columns (dict): ستون‌های اضافی {نام ستون: Series یا آرایه هم‌طول داده‌ها}
+        start (int): اولین کندل قابل بررسی
+        end (int): کندل پس از آخرین کندل قابل بررسی (None برای انتهای داده‌ها)
+    
+    خروجی:
+        DataFrame: ستون‌های Date، Price، Signal و ستون‌های اضافی
+    """
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool) & ~buy
+    active = buy | sell
+    active[:start] = False
+    if end is not None:
+        active[max(end, 0):] = False
+    
+    index = np.flatnonzero(active)
+    result = {
+        'Date': _take(data['Date'], index),
+        'Price': _take(data['Close'], index),
+        'Signal': np.where(buy[index], 1, -1)  # 1 برای خرید، -1 برای فروش
+    }
+    for name, values in (columns or {}).items():
+        result[name] = _take(values, index)
+    
+    return pd.DataFrame(result)
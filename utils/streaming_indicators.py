@@ -0,0 +1,541 @@
+# -*- coding: utf-8 -*-
+"""
+ماژول اندیکاتورهای جریانی (افزایشی)
+
+هر کلاس معادل حالت‌دار یکی از توابع ماژول indicators است: با هر کندل جدید
+(دیکشنری یا ردیف DataFrame با ستون‌های Open/High/Low/Close/Volume) با هزینه و
+حافظه ثابت به‌روزرسانی می‌شود و پس از دوره گرم شدن همان مقادیر نسخه دسته‌ای
+را تولید می‌کند. محاسبات عیناً از الگوریتم‌های داخلی pandas (ewm و rolling)
+پیروی می‌کنند تا خطای گرد کردن نیز یکسان باشد.
+"""
+
+import math
+from collections import deque, namedtuple
+
+import numpy as np
+
+NAN = float('nan')
+
+BollingerValue = namedtuple('BollingerValue', ['middle', 'upper', 'lower'])
+MACDValue = namedtuple('MACDValue', ['macd', 'signal', 'histogram'])
+StochasticValue = namedtuple('StochasticValue', ['k', 'd'])
+IchimokuValue = namedtuple('IchimokuValue', ['tenkan', 'kijun', 'senkou_a', 'senkou_b', 'chikou'])
+
+def _is_nan(value):
+    return value != value
+
+def _prep(value):
+    """مانند rolling در pandas، مقادیر بی‌نهایت به عنوان مقدار گمشده در نظر گرفته می‌شوند"""
+    return NAN if math.isinf(value) else value
+
+def _divide(numerator, denominator):
+    """تقسیم با رفتار NumPy در تقسیم بر صفر (inf یا nan به جای خطا)"""
+    if denominator == 0:
+        if numerator == 0 or _is_nan(numerator):
+            return NAN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+class _EWMState:
+    """
+    هسته میانگین نمایی با adjust=False
+
+    گام‌ها دقیقاً مانند پیاده‌سازی ewm در pandas انجام می‌شوند.
+    """
+
+    def __init__(self, alpha):
+        # pandas ابتدا alpha را به مرکز جرم تبدیل و سپس دوباره alpha را محاسبه می‌کند
+        com = 1.0 / alpha - 1.0
+        self.alpha = 1.0 / (1.0 + com)
+        self.reset()
+
+    @classmethod
+    def from_span(cls, span):
+        state = cls.__new__(cls)
+        com = (span - 1) / 2.0
+        state.alpha = 1.0 / (1.0 + com)
+        state.reset()
+        return state
+
+    def reset(self):
+        self.value = NAN
+        self._old_wt = 1.0
+
+    def update(self, x):
+        if not _is_nan(self.value):
+            self._old_wt *= 1.0 - self.alpha
+            if not _is_nan(x):
+                if self.value != x:
+                    self.value = (self._old_wt * self.value + self.alpha * x) / (self._old_wt + self.alpha)
+                self._old_wt = 1.0
+        elif not _is_nan(x):
+            self.value = x
+        return self.value
+
+class _RollingMeanState:
+    """هسته میانگین متحرک ساده با جمع کاهان (مطابق rolling().mean() در pandas)"""
+
+    def __init__(self, window):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self._values = deque()
+        self._nobs = 0
+        self._neg_ct = 0
+        self._sum = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_count = 0
+        self._prev = None
+
+    def _add(self, val):
+        if _is_nan(val):
+            return
+        self._nobs += 1
+        y = val - self._comp_add
+        t = self._sum + y
+        self._comp_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct += 1
+        if val == self._prev:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev = val
+
+    def _remove(self, val):
+        if _is_nan(val):
+            return
+        self._nobs -= 1
+        y = -val - self._comp_remove
+        t = self._sum + y
+        self._comp_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, val) < 0:
+            self._neg_ct -= 1
+
+    def update(self, val):
+        val = _prep(val)
+        if self.window == 1:
+            # برای پنجره یک‌تایی pandas هر کندل را جداگانه محاسبه می‌کند
+            return val
+        if self._prev is None:
+            self._prev = val
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(val)
+        self._add(val)
+
+        if self._nobs < self.window:
+            return NAN
+        result = self._sum / self._nobs
+        if self._same_count >= self._nobs:
+            result = self._prev
+        elif self._neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self._neg_ct == self._nobs and result > 0:
+            result = 0.0
+        return result
+
+class _RollingVarState:
+    """هسته واریانس متحرک (ولفورد با جمع کاهان، مطابق rolling().std() در pandas)"""
+
+    def __init__(self, window, ddof=1):
+        self.window = window
+        self.ddof = ddof
+        self.reset()
+
+    def reset(self):
+        self._values = deque()
+        self._nobs = 0.0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._comp_add = 0.0
+        self._comp_remove = 0.0
+        self._same_count = 0
+        self._prev = None
+
+    def _add(self, val):
+        if _is_nan(val):
+            return
+        self._nobs += 1
+        if val == self._prev:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev = val
+        prev_mean = self._mean - self._comp_add
+        y = val - self._comp_add
+        t = y - self._mean
+        self._comp_add = t + self._mean - y
+        self._mean = self._mean + t / self._nobs
+        self._ssqdm = self._ssqdm + (val - prev_mean) * (val - self._mean)
+
+    def _remove(self, val):
+        if _is_nan(val):
+            return
+        self._nobs -= 1
+        if self._nobs:
+            prev_mean = self._mean - self._comp_remove
+            y = val - self._comp_remove
+            t = y - self._mean
+            self._comp_remove = t + self._mean - y
+            self._mean = self._mean - t / self._nobs
+            self._ssqdm = self._ssqdm - (val - prev_mean) * (val - self._mean)
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+    def update(self, val):
+        val = _prep(val)
+        if self._prev is None:
+            self._prev = val
+        if len(self._values) == self.window:
+            self._remove(self._values.popleft())
+        self._values.append(val)
+        self._add(val)
+
+        if self._nobs < self.window or self._nobs <= self.ddof:
+            return NAN
+        if self._nobs == 1 or self._same_count >= self._nobs:
+            return 0.0
+        return self._ssqdm / (self._nobs - self.ddof)
+
+class _RollingExtremeState:
+    """بیشینه یا کمینه متحرک با صف یکنوا (هزینه سرشکن O(1) برای هر کندل)"""
+
+    def __init__(self, window, mode='max'):
+        self.window = window
+        self.mode = mode
+        self.reset()
+
+    def reset(self):
+        self._deque = deque()
+        self._count = 0
+        self._nan_positions = deque()
+
+    def update(self, val):
+        val = _prep(val)
+        index = self._count
+        self._count += 1
+
+        if _is_nan(val):
+            self._nan_positions.append(index)
+        else:
+            if self.mode == 'max':
+                while self._deque and self._deque[-1][1] <= val:
+                    self._deque.pop()
+            else:
+                while self._deque and self._deque[-1][1] >= val:
+                    self._deque.pop()
+            self._deque.append((index, val))
+
+        oldest = index - self.window + 1
+        while self._deque and self._deque[0][0] < oldest:
+            self._deque.popleft()
+        while self._nan_positions and self._nan_positions[0] < oldest:
+            self._nan_positions.popleft()
+
+        # مانند rolling در pandas، پنجره باید کامل و بدون مقدار گمشده باشد
+        if self._count < self.window or self._nan_positions or not self._deque:
+            return NAN
+        return self._deque[0][1]
+
+class StreamingIndicator:
+    """
+    کلاس پایه اندیکاتورهای جریانی
+
+    هر زیرکلاس متد update(bar) را پیاده‌سازی می‌کند که یک کندل را دریافت کرده و
+    مقدار جدید اندیکاتور را برمی‌گرداند (در دوره گرم شدن nan).
+    """
+
+    warmup = 1
+
+    def __init__(self):
+        self.count = 0
+        self.value = NAN
+
+    @property
+    def ready(self):
+        """آیا دوره گرم شدن اندیکاتور به پایان رسیده است"""
+        return self.count >= self.warmup
+
+    def update(self, bar):
+        raise NotImplementedError
+
+    def update_many(self, bars):
+        """
+        به‌روزرسانی با چند کندل پشت سر هم
+
+        پارامترها:
+            bars (DataFrame | iterable): کندل‌ها به ترتیب زمانی
+
+        خروجی:
+            list: مقادیر اندیکاتور پس از هر کندل
+        """
+        if hasattr(bars, 'to_dict'):
+            bars = bars.to_dict('records')
+        return [self.update(bar) for bar in bars]
+
+    def reset(self):
+        """بازگرداندن اندیکاتور به وضعیت اولیه"""
+        self.__init__(**self._params())
+
+    def _params(self):
+        return {}
+
+class StreamingEMA(StreamingIndicator):
+    """میانگین متحرک نمایی جریانی (معادل calculate_ema)"""
+
+    def __init__(self, period=20, column='Close'):
+        super().__init__()
+        self.period = period
+        self.column = column
+        self._ema = _EWMState.from_span(period)
+
+    def _params(self):
+        return {'period': self.period, 'column': self.column}
+
+    def update(self, bar):
+        self.count += 1
+        self.value = self._ema.update(float(bar[self.column]))
+        return self.value
+
+class StreamingSMA(StreamingIndicator):
+    """میانگین متحرک ساده جریانی (معادل calculate_sma)"""
+
+    def __init__(self, period=20, column='Close'):
+        super().__init__()
+        self.period = period
+        self.column = column
+        self.warmup = period
+        self._mean = _RollingMeanState(period)
+
+    def _params(self):
+        return {'period': self.period, 'column': self.column}
+
+    def update(self, bar):
+        self.count += 1
+        self.value = self._mean.update(float(bar[self.column]))
+        return self.value
+
+class StreamingRSI(StreamingIndicator):
+    """شاخص قدرت نسبی جریانی با هموارسازی وایلدر (معادل calculate_rsi)"""
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.period = period
+        self.warmup = period
+        self._prev_close = None
+        self._gains = []
+        self._losses = []
+        self._avg_gain = _EWMState(1.0 / period)
+        self._avg_loss = _EWMState(1.0 / period)
+
+    def _params(self):
+        return {'period': self.period}
+
+    def update(self, bar):
+        close = float(bar['Close'])
+        self.count += 1
+
+        if self._prev_close is None:
+            delta = NAN
+        else:
+            delta = close - self._prev_close
+        self._prev_close = close
+
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if self.count < self.period:
+            self._gains.append(gain)
+            self._losses.append(loss)
+            self.value = NAN
+            return self.value
+
+        if self.count == self.period:
+            # مقدار اولیه: میانگین ساده پنجره نخست (با همان جمع NumPy نسخه دسته‌ای)
+            self._gains.append(gain)
+            self._losses.append(loss)
+            gain_seed = np.array(self._gains).mean()
+            loss_seed = np.array(self._losses).mean()
+            self._gains = self._losses = None
+            avg_gain = self._avg_gain.update(float(gain_seed))
+            avg_loss = self._avg_loss.update(float(loss_seed))
+        else:
+            avg_gain = self._avg_gain.update(gain)
+            avg_loss = self._avg_loss.update(loss)
+
+        rs = _divide(avg_gain, avg_loss)
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+class StreamingBollingerBands(StreamingIndicator):
+    """باندهای بولینگر جریانی (معادل calculate_bollinger_bands)"""
+
+    def __init__(self, period=20, std_dev=2):
+        super().__init__()
+        self.period = period
+        self.std_dev = std_dev
+        self.warmup = period
+        self._mean = _RollingMeanState(period)
+        self._var = _RollingVarState(period)
+        self.value = BollingerValue(NAN, NAN, NAN)
+
+    def _params(self):
+        return {'period': self.period, 'std_dev': self.std_dev}
+
+    def update(self, bar):
+        close = float(bar['Close'])
+        self.count += 1
+        middle = self._mean.update(close)
+        var = self._var.update(close)
+        std = math.sqrt(var) if var >= 0 else (0.0 if not _is_nan(var) else NAN)
+        self.value = BollingerValue(middle, middle + (std * self.std_dev), middle - (std * self.std_dev))
+        return self.value
+
+class StreamingATR(StreamingIndicator):
+    """میانگین دامنه حقیقی جریانی (معادل calculate_atr)"""
+
+    def __init__(self, period=14, smoothing='sma'):
+        super().__init__()
+        if smoothing not in ('sma', 'wilder'):
+            raise ValueError(f"روش میانگین‌گیری نامعتبر: {smoothing}")
+        self.period = period
+        self.smoothing = smoothing
+        self.warmup = period
+        self._prev_close = NAN
+        self._mean = _RollingMeanState(period)
+        self._seed = []
+        self._valid = True
+        self._wilder = _EWMState(1.0 / period)
+
+    def _params(self):
+        return {'period': self.period, 'smoothing': self.smoothing}
+
+    def update(self, bar):
+        high = float(bar['High'])
+        low = float(bar['Low'])
+        close = float(bar['Close'])
+        self.count += 1
+
+        # fmax: مقادیر گمشده نادیده گرفته می‌شوند
+        ranges = [r for r in (high - low, abs(high - self._prev_close), abs(low - self._prev_close)) if not _is_nan(r)]
+        true_range = max(ranges) if ranges else NAN
+        self._prev_close = close
+
+        if self.smoothing == 'sma':
+            self.value = self._mean.update(true_range)
+        elif self.count < self.period:
+            self._seed.append(true_range)
+            self.value = NAN
+        elif self.count == self.period:
+            self._seed.append(true_range)
+            seed = float(np.array(self._seed).mean())
+            self._seed = None
+            # مانند wilder_smoothing، مقدار اولیه نامعتبر کل خروجی را نامعتبر می‌کند
+            self._valid = not _is_nan(seed)
+            self.value = self._wilder.update(seed) if self._valid else NAN
+        elif not self._valid:
+            self.value = NAN
+        else:
+            self.value = self._wilder.update(true_range)
+        return self.value
+
+class StreamingMACD(StreamingIndicator):
+    """MACD جریانی (معادل calculate_macd)"""
+
+    def __init__(self, fast_period=12, slow_period=26, signal_period=9):
+        super().__init__()
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self._fast = _EWMState.from_span(fast_period)
+        self._slow = _EWMState.from_span(slow_period)
+        self._signal = _EWMState.from_span(signal_period)
+        self.value = MACDValue(NAN, NAN, NAN)
+
+    def _params(self):
+        return {'fast_period': self.fast_period, 'slow_period': self.slow_period,
+                'signal_period': self.signal_period}
+
+    def update(self, bar):
+        close = float(bar['Close'])
+        self.count += 1
+        macd_line = self._fast.update(close) - self._slow.update(close)
+        signal_line = self._signal.update(macd_line)
+        self.value = MACDValue(macd_line, signal_line, macd_line - signal_line)
+        return self.value
+
+class StreamingStochastic(StreamingIndicator):
+    """اسیلاتور استوکاستیک جریانی (معادل calculate_stochastic)"""
+
+    def __init__(self, k_period=14, d_period=3):
+        super().__init__()
+        self.k_period = k_period
+        self.d_period = d_period
+        self.warmup = k_period + d_period - 1
+        self._highest = _RollingExtremeState(k_period, 'max')
+        self._lowest = _RollingExtremeState(k_period, 'min')
+        self._d = _RollingMeanState(d_period)
+        self.value = StochasticValue(NAN, NAN)
+
+    def _params(self):
+        return {'k_period': self.k_period, 'd_period': self.d_period}
+
+    def update(self, bar):
+        self.count += 1
+        highest_high = self._highest.update(float(bar['High']))
+        lowest_low = self._lowest.update(float(bar['Low']))
+        k_line = 100 * _divide(float(bar['Close']) - lowest_low, highest_high - lowest_low)
+        d_line = self._d.update(k_line)
+        self.value = StochasticValue(k_line, d_line)
+        return self.value
+
+class StreamingIchimoku(StreamingIndicator):
+    """
+    ابر ایچیموکو جریانی (معادل calculate_ichimoku)
+
+    سنکو اسپن‌ها با بافری به طول displacement جابجا می‌شوند. چیکو اسپن به قیمت‌های
+    آینده نیاز دارد؛ از این رو مقدار chikou خروجی، قیمت بسته شدن کندل فعلی است که
+    مقدار چیکوی کندلِ displacement کندل قبل‌تر را تکمیل می‌کند.
+    """
+
+    def __init__(self, tenkan_period=9, kijun_period=26, senkou_b_period=52, displacement=26):
+        super().__init__()
+        self.tenkan_period = tenkan_period
+        self.kijun_period = kijun_period
+        self.senkou_b_period = senkou_b_period
+        self.displacement = displacement
+        self.warmup = max(tenkan_period, kijun_period, senkou_b_period) + displacement
+        self._tenkan = (_RollingExtremeState(tenkan_period, 'max'), _RollingExtremeState(tenkan_period, 'min'))
+        self._kijun = (_RollingExtremeState(kijun_period, 'max'), _RollingExtremeState(kijun_period, 'min'))
+        self._senkou = (_RollingExtremeState(senkou_b_period, 'max'), _RollingExtremeState(senkou_b_period, 'min'))
+        self._span_a = deque(maxlen=displacement + 1)
+        self._span_b = deque(maxlen=displacement + 1)
+        self.value = IchimokuValue(NAN, NAN, NAN, NAN, NAN)
+
+    def _params(self):
+        return {'tenkan_period': self.tenkan_period, 'kijun_period': self.kijun_period,
+                'senkou_b_period': self.senkou_b_period, 'displacement': self.displacement}
+
+    def update(self, bar):
+        high = float(bar['High'])
+        low = float(bar['Low'])
+        self.count += 1
+
+        tenkan_sen = (self._tenkan[0].update(high) + self._tenkan[1].update(low)) / 2
+        kijun_sen = (self._kijun[0].update(high) + self._kijun[1].update(low)) / 2
+        senkou_b = (self._senkou[0].update(high) + self._senkou[1].update(low)) / 2
+
+        self._span_a.append((tenkan_sen + kijun_sen) / 2)
+        self._span_b.append(senkou_b)
+        full = len(self._span_a) == self.displacement + 1
+        senkou_span_a = self._span_a[0] if full else NAN
+        senkou_span_b = self._span_b[0] if full else NAN
+
+        self.value = IchimokuValue(tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, float(bar['Close']))
+        return self.value
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+بارگذاری افزایشی فایل‌های CSV در حال رشد (کندل‌های جدیدی که به انتهای فایل اضافه می‌شوند)
+
+موقعیت بایتی انتهای آخرین سطر کامل و زمان آخرین کندل نگه داشته می‌شود و در هر
+بررسی فقط سطرهای اضافه شده خوانده و تبدیل می‌شوند. ستون‌ها در آرایه‌هایی با ظرفیت
+اضافه نگهداری می‌شوند که با پر شدن دو برابر می‌شوند؛ بنابراین افزودن کندل‌ها به
+طور میانگین بدون کپی کل داده‌هاست.
+
+کندل‌های جدید هر بررسی مستقیماً به اجرای تکه‌ای (strategies.chunked) داده می‌شوند
+تا اندیکاتورها و سیگنال‌ها فقط برای کندل‌های جدید محاسبه شوند:
+    for bars, signals in run_chunked(follow_csv('csv/EURUSD_M1.csv', interval=60), strategies):
+        ...
+"""
+
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import convert_chunk, csv_read_options
+
+# حداکثر بایت‌های خوانده شده در هر مرحله (سطرهای بیشتر در چند مرحله تبدیل می‌شوند)
+BLOCK_BYTES = 64 << 20
+
+# ظرفیت اولیه آرایه‌های ستون‌ها
+INITIAL_CAPACITY = 1024
+
+class TailLoader:
+    """
+    بارگذاری افزایشی یک فایل CSV که کندل‌های جدید به انتهای آن اضافه می‌شود
+    
+    مثال:
+        loader = TailLoader('csv/EURUSD_M1.csv')
+        loader.poll()                 # همه کندل‌های موجود
+        ...
+        new_bars = loader.poll()      # فقط کندل‌های اضافه شده از بررسی قبلی
+        data = loader.data            # همه کندل‌ها (فقط خواندنی، بدون کپی)
+    """
+    
+    def __init__(self, file_path, float32=False):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            file_path (str): مسیر فایل CSV
+            float32 (bool): ذخیره ستون‌های قیمت به صورت float32
+        """
+        self.file_path = file_path
+        self.float32 = float32
+        # آخرین بررسی همه فایل را دوباره خوانده است
+        self.reloaded = False
+        self.reset()
+    
+    def reset(self):
+        """فراموش کردن داده‌های خوانده شده (بررسی بعدی کل فایل را می‌خواند)"""
+        self.offset = None
+        self.last_date = None
+        self.length = 0
+        self._columns = {}
+        self._header = self._mapping = self._options = None
+    
+    @property
+    def capacity(self):
+        """ظرفیت فعلی آرایه‌های ستون‌ها"""
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+    
+    @property
+    def data(self):
+        """همه کندل‌های خوانده شده به صورت DataFrame فقط خواندنی روی آرایه‌های داخلی (بدون کپی)"""
+        columns = {}
+        for name, values in self._columns.items():
+            view = values[:self.length]
+            view.flags.writeable = False
+            columns[name] = view
+        return pd.DataFrame(columns, index=pd.RangeIndex(self.length), copy=False)
+    
+    def _start(self):
+        """خواندن سطر عنوان و موقعیت شروع داده‌ها"""
+        self._header, self._mapping, self._options = csv_read_options(self.file_path, self.float32)
+        with open(self.file_path, 'rb') as f:
+            f.readline()
+            self.offset = f.tell()
+    
+    def _append(self, columns):
+        """افزودن ستون‌های کندل‌های جدید به آرایه‌ها با رشد دوبرابری ظرفیت"""
+        count = len(next(iter(columns.values())))
+        needed = self.length + count
+        if needed > self.capacity:
+            capacity = max(INITIAL_CAPACITY, self.capacity * 2, needed)
+            for name, values in columns.items():
+                grown = np.empty(capacity, dtype=values.dtype)
+                if name in self._columns:
+                    grown[:self.length] = self._columns[name][:self.length]
+                self._columns[name] = grown
+        for name, values in columns.items():
+            self._columns[name][self.length:needed] = values
+        self.length = needed
+    
+    def _parse(self, block):
+        """تبدیل بایت‌های سطرهای کامل به ستون‌ها و حذف کندل‌های تکراری"""
+        chunk = pd.read_csv(io.BytesIO(block), header=None, names=self._header, **self._options)
+        columns = convert_chunk(chunk.rename(columns=self._mapping))
+        if not columns or not len(next(iter(columns.values()))):
+            return None
+        
+        dates = columns.get('Date')
+        if dates is not None and len(dates):
+            if np.any(dates[1:] < dates[:-1]) or (self.last_date is not None and dates[0] < self.last_date):
+                raise ValueError(f"سطرهای اضافه شده به فایل {os.path.basename(self.file_path)} "
+                                 "بر اساس زمان مرتب نیستند")
+            if self.last_date is not None and dates[0] == self.last_date:
+                # سطر آخری که دوباره نوشته شده است
+                keep = dates > self.last_date
+                columns = {name: values[keep] for name, values in columns.items()}
+                dates = columns['Date']
+            if len(dates):
+                self.last_date = dates[-1]
+        return columns if len(next(iter(columns.values()))) else None
+    
+    def poll(self):
+        """
+        خواندن سطرهای اضافه شده از بررسی قبلی
+        
+        سطر ناقص انتهای فایل (در حال نوشتن) تا بررسی بعدی خوانده نمی‌شود. اگر فایل
+        کوتاه‌تر شده باشد (بازنویسی شده) همه داده‌ها دوباره خوانده می‌شوند و
+        reloaded برابر True می‌شود.
+        
+        خروجی:
+            DataFrame: کندل‌های جدید (خالی اگر کندلی اضافه نشده باشد)
+        """
+        self.reloaded = False
+        if self.offset is not None and os.path.getsize(self.file_path) < self.offset:
+            self.reset()
+            self.reloaded = True
+        if self.offset is None:
+            self._start()
+        
+        start = self.length
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            while True:
+                block = f.read(BLOCK_BYTES)
+                end = block.rfind(b'\n') + 1
+                if end == 0:
+                    break
+                # فقط سطرهای کامل؛ خواندن بعدی از ابتدای سطر ناقص ادامه می‌یابد
+                columns = self._parse(block[:end])
+                if columns is not None:
+                    self._append(columns)
+                self.offset += end
+                f.seek(self.offset)
+                if len(block) < BLOCK_BYTES:
+                    break
+        
+        data = self.data
+        return data.iloc[start:].reset_index(drop=True)
+
+def follow_csv(file_path, interval=60.0, float32=False, stop=None):
+    """
+    دنبال کردن یک فایل CSV در حال رشد
+    
+    ابتدا همه کندل‌های موجود و سپس در هر بررسی (هر interval ثانیه) کندل‌های جدید
+    تولید می‌شوند. بازنویسی فایل (کوتاه‌تر شدن آن) ادامه را ناممکن می‌کند و
+    ValueError ایجاد می‌شود.
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV
+        interval (float): فاصله بررسی‌ها (ثانیه)
+        float32 (bool): ذخیره ستون‌های قیمت به صورت float32
+        stop (threading.Event): توقف دنبال کردن
+    
+    خروجی:
+        generator: DataFrame کندل‌های جدید
+    """
+    loader = TailLoader(file_path, float32)
+    while True:
+        bars = loader.poll()
+        if loader.reloaded:
+            raise ValueError(f"فایل {os.path.basename(file_path)} بازنویسی شده است")
+        if len(bars):
+            yield bars
+        if stop is not None:
+            if stop.wait(interval):
+                return
+        else:
+            time.sleep(interval)
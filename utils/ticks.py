@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+ساخت کندل از داده‌های تیک (خروجی خام تیک‌های بروکر)
+
+فایل تیک به صورت تکه‌ای خوانده می‌شود و هر تکه با عملیات برداری به کندل تبدیل
+می‌شود؛ فقط کندل باز آخر (چند عدد) بین تکه‌ها نگه داشته می‌شود، بنابراین حافظه به
+اندازه فایل بستگی ندارد. سه نوع کندل پشتیبانی می‌شود:
+    time: کندل‌های زمانی (M1، M5، ...) مانند utils.resample
+    tick: هر size تیک یک کندل
+    volume: کندل جدید پس از رسیدن مجموع حجم به مضرب بعدی size
+
+کندل‌های ساخته شده همان ستون‌های load_csv_data (به علاوه تعداد تیک‌ها) را دارند و
+مستقیماً به استراتژی‌ها یا اجرای تکه‌ای (strategies.chunked) داده می‌شوند:
+    run_chunked(iter_tick_bars('csv/EURUSD_ticks.csv', 'time', 'M1'), strategies)
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import CHUNK_ROWS, match_columns, parse_file_name, parse_timestamps, read_header
+from utils.resample import bar_keys, timeframe_delta
+
+# نام‌های شناخته شده ستون‌های فایل تیک (متاتریدر: <DATE> <TIME> <BID> <ASK> <LAST> <VOLUME>)
+TICK_COLUMN_ALIASES = {
+    'Date': ('date', 'datetime', 'timestamp', 'gmttime', 'localtime'),
+    'Time': ('time',),
+    'Bid': ('bid', 'bidprice'),
+    'Ask': ('ask', 'askprice'),
+    'Last': ('last', 'price', 'lastprice'),
+    'Volume': ('volume', 'vol', 'lastvolume', 'size', 'qty', 'quantity')
+}
+
+# انواع کندل
+BAR_TYPES = ('time', 'tick', 'volume')
+
+# ستون‌های جدول کندل‌ها
+BAR_COLUMNS = {
+    'Date': 'datetime64[ns]',
+    'Open': np.float64,
+    'High': np.float64,
+    'Low': np.float64,
+    'Close': np.float64,
+    'Volume': np.float64,
+    'Ticks': np.int64
+}
+
+def iter_tick_chunks(file_path, chunk_rows=CHUNK_ROWS, price=None):
+    """
+    خواندن فایل تیک به صورت تکه‌های متوالی
+    
+    قیمت‌های خالی (مثلاً تیک‌هایی که فقط Ask آن‌ها تغییر کرده) با آخرین قیمت
+    قبلی، حتی از تکه قبلی، پر می‌شوند. فایل باید بر اساس زمان مرتب باشد.
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV تیک‌ها
+        chunk_rows (int): تعداد سطرهای هر تکه
+        price (str): قیمت کندل‌ها: bid، ask، mid یا last (پیش‌فرض: bid در صورت وجود، در غیر این صورت last)
+    
+    خروجی:
+        generator: DataFrame هر تکه با ستون‌های Date، Price و Volume
+    """
+    header, separator = read_header(file_path)
+    mapping = match_columns(header, TICK_COLUMN_ALIASES, ())
+    available = set(mapping.values())
+    if 'Date' not in available:
+        raise ValueError(f"ستون تاریخ در فایل {os.path.basename(file_path)} وجود ندارد")
+    
+    price = (price or ('bid' if 'Bid' in available else 'last')).lower()
+    needed = {'bid': ('Bid',), 'ask': ('Ask',), 'mid': ('Bid', 'Ask'), 'last': ('Last',)}.get(price)
+    if needed is None:
+        raise ValueError(f"نوع قیمت ناشناخته: {price}")
+    missing = [column for column in needed if column not in available]
+    if missing:
+        raise ValueError(f"ستون {', '.join(missing)} در فایل {os.path.basename(file_path)} وجود ندارد")
+    
+    keep = {'Date', 'Time', 'Volume'} | set(needed)
+    mapping = {column: target for column, target in mapping.items() if target in keep}
+    dtypes = {column: object if target in ('Date', 'Time') else np.float64 for column, target in mapping.items()}
+    chunks = pd.read_csv(file_path, sep=separator, usecols=list(mapping), dtype=dtypes,
+                         chunksize=chunk_rows, encoding='utf-8-sig')
+    
+    last_price = np.nan
+    last_date = None
+    for chunk in chunks:
+        chunk = chunk.rename(columns=mapping)
+        dates = parse_timestamps(chunk['Date'], chunk['Time'] if 'Time' in chunk.columns else None)
+        if len(dates) and (np.any(dates[1:] < dates[:-1]) or (last_date is not None and dates[0] < last_date)):
+            raise ValueError(f"داده‌های فایل {os.path.basename(file_path)} بر اساس زمان مرتب نیستند")
+        
+        if price == 'mid':
+            values = (chunk['Bid'].ffill() + chunk['Ask'].ffill()).to_numpy() / 2
+        else:
+            values = chunk[needed[0]].ffill().to_numpy()
+        if len(values) and np.isnan(values[0]):
+            # ادامه قیمت تکه قبلی
+            values = pd.Series(np.r_[last_price, values]).ffill().to_numpy()[1:]
+        
+        volume = chunk['Volume'].fillna(0).to_numpy() if 'Volume' in chunk.columns else np.zeros(len(values))
+        valid = ~np.isnan(values) & ~np.isnat(dates)
+        if len(values):
+            last_price = values[-1]
+            last_date = dates[-1]
+        yield pd.DataFrame({'Date': dates[valid], 'Price': values[valid], 'Volume': volume[valid]}, copy=False)
+
+class TickBarAggregator:
+    """
+    تبدیل جریانی تیک‌ها به کندل
+    
+    هر تکه تیک با یک گذر reduceat به کندل تبدیل می‌شود و فقط کندل آخر که هنوز
+    ممکن است تیک‌های بیشتری بگیرد نگه داشته و با ادامه آن در تکه بعدی ادغام می‌شود.
+    
+    مثال:
+        aggregator = TickBarAggregator('tick', 500)
+        for ticks in iter_tick_chunks(path):
+            bars = aggregator.update(ticks)
+        bars = aggregator.finish()
+    """
+    
+    def __init__(self, kind='time', size='M1', tz=None, data_tz='UTC', session_start=None):
+        """
+        مقداردهی اولیه
+        
+        پارامترها:
+            kind (str): نوع کندل: time، tick یا volume
+            size: تایم‌فریم (برای time)، تعداد تیک (برای tick) یا حجم هر کندل (برای volume)
+            tz (str): منطقه زمانی مرز کندل‌های زمانی
+            data_tz (str): منطقه زمانی ساعت تیک‌ها
+            session_start (str): ساعت شروع جلسه برای کندل‌های زمانی، مثلاً '17:00'
+        """
+        if kind not in BAR_TYPES:
+            raise ValueError(f"نوع کندل ناشناخته: {kind}")
+        if kind == 'time':
+            timeframe_delta(size)
+        elif not size or float(size) <= 0:
+            raise ValueError(f"اندازه کندل نامعتبر: {size}")
+        self.kind = kind
+        self.size = size if kind == 'time' else (int(size) if kind == 'tick' else float(size))
+        self.tz = tz
+        self.data_tz = data_tz
+        self.session_start = session_start
+        # کندل باز آخر: (کلید، {ستون: مقدار})
+        self._pending = None
+        self._ticks = 0
+        self._volume = 0.0
+        # آمار سرعت
+        self.seconds = 0.0
+    
+    @property
+    def ticks(self):
+        """تعداد تیک‌های پردازش شده"""
+        return self._ticks
+    
+    @property
+    def ticks_per_second(self):
+        """سرعت ساخت کندل (تیک در ثانیه، بدون زمان خواندن فایل)"""
+        return self._ticks / self.seconds if self.seconds else 0.0
+    
+    def _keys(self, dates, volume):
+        """کلید کندل هر تیک و زمان کندل‌ها"""
+        if self.kind == 'time':
+            return bar_keys(dates, self.size, self.tz, self.data_tz, self.session_start)
+        if self.kind == 'tick':
+            keys = (self._ticks + np.arange(len(dates), dtype=np.int64)) // self.size
+        else:
+            # مجموع حجم قبل از هر تیک؛ کندل با تیکی بسته می‌شود که مجموع را به مضرب بعدی size برساند
+            before = self._volume + np.cumsum(volume) - volume
+            keys = np.floor(before / self.size).astype(np.int64)
+        return keys, dates.view(np.int64)
+    
+    def update(self, ticks):
+        """
+        افزودن تیک‌های جدید
+        
+        پارامترها:
+            ticks (DataFrame): تیک‌ها با ستون‌های Date، Price و Volume (ادامه تیک‌های قبلی)
+        
+        خروجی:
+            DataFrame: کندل‌های کامل شده با ستون‌های Date، OHLCV و Ticks
+        """
+        start_time = time.perf_counter()
+        dates = ticks['Date'].to_numpy('datetime64[ns]')
+        if len(dates) == 0:
+            return self._frame()
+        prices = ticks['Price'].to_numpy(np.float64)
+        volume = ticks['Volume'].to_numpy(np.float64)
+        keys, starts = self._keys(dates, volume)
+        
+        first = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        last = np.r_[first[1:], len(keys)] - 1
+        bars = {
+            'Date': starts[first].view('datetime64[ns]'),
+            'Open': prices[first],
+            'High': np.maximum.reduceat(prices, first),
+            'Low': np.minimum.reduceat(prices, first),
+            'Close': prices[last],
+            'Volume': np.add.reduceat(volume, first),
+            'Ticks': np.diff(np.r_[first, len(keys)])
+        }
+        
+        emit_pending = False
+        if self._pending is not None:
+            pending_key, pending = self._pending
+            if keys[0] == pending_key:
+                # ادامه کندل باز تکه قبلی
+                bars['Date'][0] = pending['Date']
+                bars['Open'][0] = pending['Open']
+                bars['High'][0] = max(bars['High'][0], pending['High'])
+                bars['Low'][0] = min(bars['Low'][0], pending['Low'])
+                bars['Volume'][0] += pending['Volume']
+                bars['Ticks'][0] += pending['Ticks']
+            else:
+                emit_pending = True
+        
+        columns = {name: values[:-1] for name, values in bars.items()}
+        if emit_pending:
+            columns = {name: np.r_[pending[name], values] for name, values in columns.items()}
+        self._pending = (keys[-1], {name: values[-1] for name, values in bars.items()})
+        
+        self._ticks += len(dates)
+        self._volume += volume.sum()
+        result = self._frame(columns)
+        self.seconds += time.perf_counter() - start_time
+        return result
+    
+    def finish(self):
+        """کندل باز آخر در پایان داده‌ها"""
+        if self._pending is None:
+            return self._frame()
+        result = self._frame({name: np.r_[value] for name, value in self._pending[1].items()})
+        self._pending = None
+        return result
+    
+    @staticmethod
+    def _frame(columns=None):
+        """جدول کندل‌ها از آرایه‌های ستون‌ها (یا جدول خالی)"""
+        if columns is None:
+            columns = {name: np.array([], dtype=dtype) for name, dtype in BAR_COLUMNS.items()}
+        return pd.DataFrame(columns, copy=False)
+
+def iter_tick_bars(file_path, kind='time', size='M1', chunk_rows=CHUNK_ROWS, price=None, aggregator=None, **options):
+    """
+    خواندن تکه‌ای فایل تیک و تولید کندل‌های کامل شده پس از هر تکه
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV تیک‌ها
+        kind (str): نوع کندل: time، tick یا volume
+        size: تایم‌فریم، تعداد تیک یا حجم هر کندل
+        chunk_rows (int): تعداد تیک‌های هر تکه
+        price (str): قیمت کندل‌ها: bid، ask، mid یا last
+        aggregator (TickBarAggregator): نمونه آماده (برای دسترسی به آمار سرعت)
+        **options: tz، data_tz و session_start برای کندل‌های زمانی
+    
+    خروجی:
+        generator: DataFrame کندل‌های جدید
+    """
+    aggregator = aggregator or TickBarAggregator(kind, size, **options)
+    for ticks in iter_tick_chunks(file_path, chunk_rows, price):
+        bars = aggregator.update(ticks)
+        if len(bars):
+            yield bars
+    bars = aggregator.finish()
+    if len(bars):
+        yield bars
+
+def load_tick_bars(file_path, kind='time', size='M1', chunk_rows=CHUNK_ROWS, price=None, **options):
+    """
+    ساخت کندل از فایل تیک و گزارش سرعت
+    
+    پارامترها:
+        file_path (str): مسیر فایل CSV تیک‌ها
+        kind (str): نوع کندل: time، tick یا volume
+        size: تایم‌فریم، تعداد تیک یا حجم هر کندل
+        chunk_rows (int): تعداد تیک‌های هر تکه
+        price (str): قیمت کندل‌ها: bid، ask، mid یا last
+        **options: tz، data_tz و session_start برای کندل‌های زمانی
+    
+    خروجی:
+        tuple: (DataFrame کندل‌ها، نماد، نام کندل مثلاً M1 یا T500)
+    """
+    symbol, _ = parse_file_name(file_path)
+    aggregator = TickBarAggregator(kind, size, **options)
+    start_time = time.perf_counter()
+    parts = list(iter_tick_bars(file_path, kind, size, chunk_rows, price, aggregator))
+    bars = pd.concat(parts, ignore_index=True) if parts else TickBarAggregator._frame()
+    elapsed = time.perf_counter() - start_time
+    
+    label = bar_label(kind, size)
+    print(f"{aggregator.ticks} تیک {symbol} به {len(bars)} کندل {label} تبدیل شد.")
+    if elapsed:
+        print(f"سرعت: {aggregator.ticks / elapsed / 1e6:.2f} میلیون تیک در ثانیه "
+              f"(ساخت کندل: {aggregator.ticks_per_second / 1e6:.1f} میلیون تیک در ثانیه)")
+    return bars, symbol, label
+
+def bar_label(kind, size):
+    """نام کندل‌ها در گزارش‌ها، مثلاً M5، T500 (تیکی) یا V1000 (حجمی)"""
+    if kind == 'time':
+        return str(size).upper()
+    return f"{'T' if kind == 'tick' else 'V'}{size:g}"
+
+def parse_bar_spec(text):
+    """
+    تبدیل مشخصه کندل در خط فرمان به (نوع، اندازه)
+    
+    مثال‌ها: 'M5' → ('time', 'M5')، 'tick:500' → ('tick', 500)، 'volume:1000' → ('volume', 1000.0)
+    """
+    kind, _, size = str(text).partition(':')
+    if not size:
+        return 'time', kind.upper()
+    kind = kind.lower()
+    if kind not in BAR_TYPES:
+        raise ValueError(f"نوع کندل ناشناخته: {kind}")
+    if kind == 'time':
+        return kind, size.upper()
+    return kind, int(size) if kind == 'tick' else float(size)